@@ -0,0 +1,353 @@
+# benchmark.py
+# -*- coding: utf-8 -*-
+"""
+Throughput benchmarks for physics, drawing helpers, the UI, a full headless frame and
+presenting the scaled canvas.
+
+    python benchmark.py                          # Run, print, write cfg.BENCHMARK_OUTPUT_PATH
+    python benchmark.py --baseline base.json     # ... and compare (exit code 1 on regressions)
+    python benchmark.py --save-baseline          # Store this run as the baseline
+
+Every result is a rate (higher is better). Drawing runs offscreen with the SDL dummy
+video driver unless SDL_VIDEODRIVER is already set.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import numpy as np
+import pygame
+import config as cfg
+import utils
+from physics import PhysicsEngine
+from scaling import ScaledDisplay
+from simulation import Simulation
+from swarm import ProjectileSwarm
+from trail import TrailBuffer, TrailLayer
+from ui import UIManager
+
+BENCHMARK_SCENE = "Eğik Atış"
+
+
+def measure(func, setup=None, items_per_call=1, min_time_sec=None, repeats=None):
+    """
+    Calls func() back to back for at least min_time_sec, `repeats` times, and keeps the best rate.
+
+    Args:
+        func (callable): Work to time; called with the return value of setup() if given.
+        setup (callable): Untimed preparation, run once before each repeat.
+        items_per_call (int): Items one func() call processes (rows, frames, ...).
+        min_time_sec (float): Timed duration of each repeat (default: cfg.BENCHMARK_MIN_TIME_SEC).
+        repeats (int): Number of repeats (default: cfg.BENCHMARK_REPEATS).
+
+    Returns:
+        float: Items per second of the fastest repeat.
+    """
+    min_time_sec = cfg.BENCHMARK_MIN_TIME_SEC if min_time_sec is None else min_time_sec
+    repeats = cfg.BENCHMARK_REPEATS if repeats is None else repeats
+    best_rate = 0.0
+    for _ in range(repeats):
+        args = (setup(),) if setup else ()
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time_sec:
+            func(*args)
+            calls += 1
+            elapsed = time.perf_counter() - start
+        best_rate = max(best_rate, calls * items_per_call / elapsed)
+    return best_rate
+
+
+# --- Physics ---
+
+def _physics_inputs(rows):
+    """Reproducible start / target / time rows inside the window."""
+    rng = np.random.default_rng(0)
+    initial_pos_px = rng.uniform((0, cfg.FORMULA_AREA_HEIGHT), (cfg.WIDTH, cfg.HEIGHT), (rows, 2))
+    target_center_px = rng.uniform((0, cfg.FORMULA_AREA_HEIGHT), (cfg.WIDTH, cfg.HEIGHT), (rows, 2))
+    time_to_target_sec = rng.uniform(0.5, 5.0, rows)
+    return initial_pos_px, target_center_px, time_to_target_sec
+
+def bench_physics(rows):
+    """PhysicsEngine scalar calls vs. one batch call over the same rows (results per second)."""
+    engine = PhysicsEngine()
+    initial_pos_px, target_center_px, time_to_target_sec = _physics_inputs(rows)
+    scalar_rows = list(zip(initial_pos_px.tolist(), target_center_px.tolist(), time_to_target_sec.tolist()))
+    v0_px_s = np.column_stack(engine.calculate_required_velocities_batch(initial_pos_px, target_center_px, time_to_target_sec))
+    scalar_kinematic_rows = list(zip(initial_pos_px.tolist(), v0_px_s.tolist(), time_to_target_sec.tolist()))
+
+    def velocities_scalar():
+        for start, target, flight_time in scalar_rows:
+            engine.calculate_required_velocities(start, target, flight_time)
+
+    def velocities_batch():
+        engine.calculate_required_velocities_batch(initial_pos_px, target_center_px, time_to_target_sec)
+
+    def kinematic_scalar():
+        for start, (v0x, v0y), t_sec in scalar_kinematic_rows:
+            engine.calculate_kinematic_update(start, v0x, v0y, t_sec)
+
+    def kinematic_batch():
+        engine.calculate_kinematic_batch(initial_pos_px, v0_px_s, time_to_target_sec)
+
+    return {
+        "physics.required_velocities.scalar": (measure(velocities_scalar, items_per_call=rows), "calls/s"),
+        "physics.required_velocities.batch": (measure(velocities_batch, items_per_call=rows), "rows/s"),
+        "physics.kinematic.scalar": (measure(kinematic_scalar, items_per_call=rows), "calls/s"),
+        "physics.kinematic.batch": (measure(kinematic_batch, items_per_call=rows), "rows/s"),
+    }
+
+
+# --- Drawing Helpers ---
+
+def bench_drawing():
+    """utils.draw_text (cached and uncached renders) and utils.draw_arrow, renders per second."""
+    surface = pygame.Surface((cfg.WIDTH, cfg.HEIGHT))
+    text_font = utils.get_font(cfg.FONT_SIZE_FORMULA)
+    text = "Vx = 12.34 m/s   Vy = -5.67 m/s"
+    arrows = [((cfg.WIDTH / 2, cfg.HEIGHT / 2), (cfg.WIDTH / 2 + 80 * np.cos(a), cfg.HEIGHT / 2 + 80 * np.sin(a)))
+              for a in np.linspace(0, 2 * np.pi, 64, endpoint=False).tolist()]
+
+    def text_cached():
+        utils.draw_text(text, text_font, cfg.WHITE, surface, 10, 10)
+
+    def text_uncached():
+        utils.clear_text_cache()
+        utils.draw_text(text, text_font, cfg.WHITE, surface, 10, 10)
+
+    def arrow():
+        for start, end in arrows:
+            utils.draw_arrow(surface, cfg.RED, start, end, cfg.VECTOR_ARROW_SIZE)
+
+    def arrows_batched():
+        utils.draw_arrows(surface, cfg.RED, field_starts, field_ends, cfg.VECTOR_ARROW_SIZE)
+
+    # Vector field: one velocity-component arrow per projectile of a swarm-sized batch
+    rng = np.random.default_rng(0)
+    field_starts = rng.uniform((0, 0), (cfg.WIDTH, cfg.HEIGHT), (cfg.BENCHMARK_SWARM_SIZE, 2))
+    field_ends = field_starts + np.column_stack((rng.uniform(-60, 60, cfg.BENCHMARK_SWARM_SIZE), np.zeros(cfg.BENCHMARK_SWARM_SIZE)))
+
+    results = {
+        "render.draw_text.cached": (measure(text_cached), "renders/s"),
+        "render.draw_text.uncached": (measure(text_uncached), "renders/s"),
+        "render.draw_arrow": (measure(arrow, items_per_call=len(arrows)), "renders/s"),
+        "render.draw_arrows": (measure(arrows_batched, items_per_call=cfg.BENCHMARK_SWARM_SIZE), "renders/s"),
+    }
+    utils.clear_text_cache()
+    return results
+
+
+# --- UI and Full Frame ---
+
+def _launched_simulation(trail_capacity=None):
+    """A Simulation in flight (cfg.BENCHMARK_FLIGHT_TIME_SEC), with a trail buffer of trail_capacity points."""
+    simulation = Simulation(BENCHMARK_SCENE)
+    if trail_capacity is not None:
+        simulation.projectile_trail = TrailBuffer(trail_capacity)
+        simulation.clear_trail()
+    simulation.launch(cfg.BENCHMARK_FLIGHT_TIME_SEC)
+    simulation.advance(cfg.BENCHMARK_FLIGHT_TIME_SEC / 2) # Mid-flight: vectors, live formulas, trail
+    return simulation
+
+def _fill_trail(simulation):
+    """Fills the trail buffer to capacity with points along the launch's own path."""
+    trail = simulation.projectile_trail
+    times_sec = np.linspace(0.0, simulation.flight_end_sec, trail.capacity)
+    trail.clear()
+    trail.extend(simulation.trajectory_table.sample(times_sec)[0])
+
+def bench_ui():
+    """UIManager.draw_all frames per second on an offscreen surface (mid-flight state)."""
+    surface = pygame.Surface((cfg.WIDTH, cfg.HEIGHT))
+    simulation = _launched_simulation()
+    ui_manager = UIManager(surface, simulation.scene)
+    ui_manager.initialize_sliders(simulation.projectile, simulation.target)
+    game_state = simulation.get_game_state()
+
+    def draw_all():
+        ui_manager.draw_all(game_state)
+
+    return {"ui.draw_all": (measure(draw_all), "frames/s")}
+
+def bench_main_loop(trail_lengths):
+    """
+    Headless frames per second of the simulation branch of main.py's loop (update, draw_all,
+    trail, target, projectile) with the trail buffer holding each of trail_lengths points.
+    """
+    results = {}
+    frames = cfg.BENCHMARK_LOOP_FRAMES
+    frame_dt_sec = 1.0 / cfg.PROFILER_TARGET_FPS
+    for trail_length in trail_lengths:
+        def setup():
+            surface = pygame.Surface((cfg.WIDTH, cfg.HEIGHT))
+            simulation = _launched_simulation(trail_length)
+            _fill_trail(simulation)
+            ui_manager = UIManager(surface, simulation.scene)
+            ui_manager.initialize_sliders(simulation.projectile, simulation.target)
+            trail_layer = TrailLayer(simulation.projectile_trail, surface.get_size())
+            trail_layer.draw(surface) # Stamp the prefilled points before timing
+            return surface, simulation, ui_manager, trail_layer
+
+        def run_frames(state):
+            surface, simulation, ui_manager, trail_layer = state
+            for _ in range(frames):
+                simulation.advance(frame_dt_sec)
+                if not simulation.simulation_running: # Keep flying: back to mid-flight with a full trail
+                    simulation.seek(simulation.flight_end_sec / 2)
+                    _fill_trail(simulation)
+                ui_manager.draw_all(simulation.get_game_state())
+                trail_layer.draw(surface)
+                simulation.target.draw(surface)
+                simulation.projectile.draw(surface)
+
+        results[f"main_loop.trail_{trail_length}"] = (measure(run_frames, setup, items_per_call=frames), "frames/s")
+    return results
+
+
+def bench_swarm(size):
+    """ProjectileSwarm update + batched draw of `size` projectiles in flight, frames per second."""
+    surface = pygame.Surface((cfg.WIDTH, cfg.HEIGHT))
+    frame_dt_sec = 1.0 / cfg.PROFILER_TARGET_FPS
+
+    def setup():
+        swarm = ProjectileSwarm(size)
+        initial_pos_px, target_center_px, _ = _physics_inputs(size)
+        flight_times_sec = np.linspace(1.0, 3.0, size)
+        swarm.spawn_volley(initial_pos_px, target_center_px, flight_times_sec)
+        return swarm
+
+    def frame(swarm):
+        # Loop over the first second, before any projectile reaches its target inside the window
+        swarm.update((swarm.time_sec + frame_dt_sec) % 1.0)
+        swarm.draw(surface)
+
+    return {f"swarm.update_draw_{size}": (measure(frame, setup), "frames/s")}
+
+
+def bench_present(output_sizes):
+    """
+    ScaledDisplay.present of a mid-flight UI frame at each output size, frames per second:
+    full frames (cached scaled static layer + the frame's rects) and dirty-rect frames.
+    """
+    results = {}
+    for width, height in output_sizes:
+        display = ScaledDisplay((cfg.WIDTH, cfg.HEIGHT), (width, height), resizable=False, smooth=cfg.SCALE_SMOOTH)
+        simulation = _launched_simulation()
+        ui_manager = UIManager(display.canvas, simulation.scene)
+        ui_manager.initialize_sliders(simulation.projectile, simulation.target)
+        ui_manager.draw_all(simulation.get_game_state())
+        frame_rects = ui_manager.dirty_rects + [simulation.projectile.draw(display.canvas)]
+
+        def full():
+            display.present(frame_rects, background=ui_manager.static_layer)
+
+        def dirty():
+            display.present(frame_rects)
+
+        full() # Scale the static layer once for this size (cached), as the first frame after a resize does
+        results[f"present.full_{width}x{height}"] = (measure(full), "frames/s")
+        results[f"present.dirty_{width}x{height}"] = (measure(dirty), "frames/s")
+    return results
+
+
+# --- Results and Baseline ---
+
+def run_benchmarks(quick=False):
+    """
+    Runs every benchmark.
+
+    Args:
+        quick (bool): Short timings and small sizes (smoke test; numbers are noisy).
+
+    Returns:
+        dict: {"meta": {...}, "results": {name: {"value": rate, "unit": unit}}}
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    saved = (cfg.BENCHMARK_MIN_TIME_SEC, cfg.BENCHMARK_REPEATS)
+    if quick:
+        cfg.BENCHMARK_MIN_TIME_SEC, cfg.BENCHMARK_REPEATS = 0.05, 1
+    try:
+        results = {}
+        results.update(bench_physics(cfg.BENCHMARK_PHYSICS_ROWS))
+        results.update(bench_drawing())
+        results.update(bench_ui())
+        results.update(bench_main_loop(cfg.BENCHMARK_TRAIL_LENGTHS))
+        results.update(bench_swarm(cfg.BENCHMARK_SWARM_SIZE))
+        results.update(bench_present(cfg.BENCHMARK_OUTPUT_SIZES))
+    finally:
+        cfg.BENCHMARK_MIN_TIME_SEC, cfg.BENCHMARK_REPEATS = saved
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+    }
+    return {"meta": meta, "results": {name: {"value": rate, "unit": unit} for name, (rate, unit) in results.items()}}
+
+def compare(report, baseline, tolerance=None):
+    """
+    Compares a report against a baseline report.
+
+    Args:
+        tolerance (float): Allowed relative slowdown (default: cfg.BENCHMARK_REGRESSION_TOLERANCE).
+
+    Returns:
+        list: (name, baseline_rate, rate, relative_change) for every benchmark present in both,
+              relative_change = rate / baseline_rate - 1 (negative: slower).
+        list: Names of the benchmarks slower than the baseline by more than tolerance.
+    """
+    tolerance = cfg.BENCHMARK_REGRESSION_TOLERANCE if tolerance is None else tolerance
+    rows = []
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if not base or base["value"] <= 0:
+            continue
+        change = result["value"] / base["value"] - 1.0
+        rows.append((name, base["value"], result["value"], change))
+        if change < -tolerance:
+            regressions.append(name)
+    return rows, regressions
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(data, json_file, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Atış Simülasyonu benchmarks")
+    parser.add_argument("--output", default=cfg.BENCHMARK_OUTPUT_PATH, help="JSON file for this run's results")
+    parser.add_argument("--baseline", default=cfg.BENCHMARK_BASELINE_PATH, help="Baseline JSON to compare against (skipped if missing)")
+    parser.add_argument("--save-baseline", action="store_true", help="Also store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=cfg.BENCHMARK_REGRESSION_TOLERANCE, help="Allowed relative slowdown")
+    parser.add_argument("--quick", action="store_true", help="Short, noisy run (smoke test)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(quick=args.quick)
+    for name, result in report["results"].items():
+        print(f"{name:<36} {result['value']:>14,.1f} {result['unit']}")
+    _write_json(args.output, report)
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            rows, regressions = compare(report, json.load(baseline_file), args.tolerance)
+        print(f"\nAgainst baseline {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for name, base_rate, rate, change in rows:
+            flag = "  REGRESSION" if name in regressions else ""
+            print(f"{name:<36} {base_rate:>14,.1f} -> {rate:>14,.1f} ({change:+.1%}){flag}")
+    if args.save_baseline:
+        _write_json(args.baseline, report)
+        print(f"\nBaseline saved to {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
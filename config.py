@@ -170,6 +170,100 @@ SCENES = {
 ACTIVE_SCENE = "Dikey Atış" # Default to the new horizontal throw
 
 
+# --- Window and Scaling ---
+# İç çözünürlük WIDTH x HEIGHT'tir (SCALE_FACTOR ile seçilir); her şey bu mantıksal tuvale çizilip pencere boyutuna ölçeklenir
+WINDOW_SIZE = None # Pencere boyutu (genişlik, yükseklik); None: iç çözünürlükle aynı (ölçekleme yok)
+FULLSCREEN = False # Tam ekran başla (masaüstü çözünürlüğü); F11 tam ekran / pencere arasında geçiş yapar
+WINDOW_RESIZABLE = True # Pencere boyutu fareyle değiştirilebilir
+SCALE_SMOOTH = True # True: yumuşak (bilinear) ölçekleme, False: en yakın komşu (daha hızlı, keskin pikseller)
+SCALE_KEEP_ASPECT = True # En-boy oranını koru, kalan alanı kenar bantlarıyla doldur
+SCALE_LETTERBOX_COLOR = BLACK # Kenar bantlarının rengi
+
+
+# --- UI Hit Testing (hittest.py) ---
+HIT_GRID_CELL_SIZE = 64 # Tıklama testinde kullanılan ızgara hücresinin kenarı (piksel); her tıklamada yalnızca farenin altındaki hücredeki dikdörtgenlere bakılır
+
+# --- Text Rendering ---
+TEXT_CACHE_MAX_ENTRIES = 512 # Önbellekte tutulacak en fazla yazı yüzeyi (LRU)
+TEXT_CACHE_VOLATILE_MAX_ENTRIES = 64 # Her karede değişen sayısal göstergeler (süre, konum, hız) için ayrı küçük önbellek; sabit etiketleri önbellekten atmazlar
+
+
+# --- Rendering ---
+IDLE_EVENT_WAIT_ENABLED = True # Hareket yokken (seçim ekranı, fırlatma öncesi, duraklatma) olay bekleyerek uyu
+IDLE_EVENT_WAIT_TIMEOUT_MS = 500 # Boşta en fazla bu kadar bekle, sonra bir kare çiz
+DIRTY_RECT_RENDERING = False # True: sadece değişen bölgeleri ekrana aktar, boşta kalan karelerde hiç çizim yapma
+
+
+# --- Simulation Clock ---
+PHYSICS_TIMESTEP_SEC = 1.0 / 120.0 # Sabit fizik adımı (efektif simülasyon zamanı, saniye)
+MAX_FRAME_TIME_SEC = 0.25 # Tek karede işlenecek en uzun saat süresi (takılmalarda adım yığılmasını önler)
+TRAJECTORY_SAMPLE_DT_SEC = 1.0 / 120.0 # Fırlatmada önceden hesaplanan yörünge tablosunun örnek aralığı
+SCRUB_FRAME_SEC = 1.0 / 60.0 # Kare kare ileri/geri sarmada bir adımın efektif süresi (Sol/Sağ ok tuşları)
+
+
+# --- Air Drag (drag.DragPhysicsEngine) ---
+DRAG_ENABLED = False # True: simülasyon hava direncini hesaba katar (Simulation varsayılan olarak drag.DragPhysicsEngine kullanır)
+DRAG_MODEL = "quadratic" # "linear" (F = -b·v) veya "quadratic" (F = -½·ρ·Cd·A·|v|·v)
+PROJECTILE_MASS_KG = 0.45 # Mermi kütlesi (kg)
+PROJECTILE_CROSS_SECTION_M2 = 0.038 # Kesit alanı (m², ~22 cm çaplı top)
+DRAG_COEFFICIENT = 0.47 # Sürükleme katsayısı Cd (küre)
+AIR_DENSITY_KG_M3 = 1.225 # Hava yoğunluğu (deniz seviyesi)
+LINEAR_DRAG_COEFF_KG_S = 0.05 # Doğrusal model için b katsayısı (kg/s)
+DRAG_INTEGRATOR = "rk4" # "semi_implicit_euler" (hızlı), "rk4" (dengeli) veya "rk45" (uyarlamalı, hassas)
+DRAG_TIMESTEP_SEC = 1.0 / 120.0 # Sabit adımlı integratörlerin adımı (rk45 için başlangıç adımı)
+DRAG_RK45_RTOL = 1e-6 # rk45 bağıl hata toleransı
+DRAG_RK45_ATOL = 1e-3 # rk45 mutlak hata toleransı (piksel, piksel/s)
+DRAG_SOLVER_STEPS = 48 # Hedef çözücüsünün bir atışı için RK4 adım sayısı
+DRAG_SOLVER_TOLERANCE_PX = 0.05 # Hedef merkezine kabul edilen en büyük uzaklık (piksel)
+DRAG_SOLVER_MAX_ITERATIONS = 8 # En fazla Newton iterasyonu
+DRAG_SOLVER_CACHE_MAX_ENTRIES = 4096 # Önbellekte tutulacak en fazla çözüm (LRU)
+DRAG_SOLVER_SCALAR_MAX_ROWS = 8 # Bu kadar veya daha az hedef tek tek (numpy'sız) çözülür
+
+
+# --- Data Export (export.py) ---
+EXPORT_BUFFER_ROWS = 4096 # Dosyaya yazmadan önce bellekte tutulan satır sayısı (bellek kullanımı sabit kalır)
+
+
+# --- Input Recording (replay.py) ---
+INPUT_RECORD_PATH = None # Örn. "oturum.atsrec": arayüz girdileri bu dosyaya kaydedilir, replay.replay() ile aynen oynatılır
+
+
+# --- Profiling (profiler.py) ---
+PROFILER_ENABLED = False # Bölüm süreleri (olaylar, fizik, arayüz, iz, ekrana aktarma) ölçülsün mü?
+PROFILER_OVERLAY = False # Ölçümler ekranda gösterilsin mi? (F3 ile açılıp kapanır, açılınca ölçüm de başlar)
+PROFILER_TRACE_PATH = None # Örn. "profil.json": her bölüm Chrome trace (chrome://tracing, Perfetto) olarak yazılır
+PROFILER_WINDOW_FRAMES = 240 # p50/p99 hesaplanan son kare sayısı
+PROFILER_OVERLAY_REFRESH_FRAMES = 15 # Ekrandaki değerler kaç karede bir yenilensin (okunabilirlik için)
+PROFILER_TARGET_FPS = 60 # Karşılaştırma için hedef FPS (clock.tick(60))
+PROFILER_OVERLAY_PADDING_PX = 6 # Ölçüm kutusunun iç boşluğu
+PROFILER_OVERLAY_POS = (PADDING_PX, FORMULA_AREA_HEIGHT + PADDING_PX) # Ölçüm kutusunun sol üst köşesi
+PROFILER_OVERLAY_BG_COLOR = (0, 0, 0, 170) # Yarı saydam arka plan (RGBA)
+PROFILER_OVERLAY_TEXT_COLOR = WHITE
+
+
+# --- Benchmarks (benchmark.py) ---
+BENCHMARK_MIN_TIME_SEC = 0.5 # Her ölçümün en kısa süresi (saniye)
+BENCHMARK_REPEATS = 3 # Ölçüm tekrar sayısı (en iyi sonuç alınır)
+BENCHMARK_PHYSICS_ROWS = 1000 # Fizik ölçümlerinde tek tek / toplu hesaplanan satır sayısı
+BENCHMARK_FLIGHT_TIME_SEC = 2.0 # Arayüz ve ana döngü ölçümlerinde atış süresi
+BENCHMARK_LOOP_FRAMES = 60 # Ana döngü ölçümünde bir çağrıdaki kare sayısı
+BENCHMARK_TRAIL_LENGTHS = (200, 10_000, 100_000) # Ana döngünün ölçüldüğü iz uzunlukları (nokta)
+BENCHMARK_SWARM_SIZE = 5000 # Sürü ölçümündeki mermi sayısı
+BENCHMARK_OUTPUT_SIZES = ((1280, 720), (3840, 2160)) # Ölçekli ekrana aktarmanın ölçüldüğü pencere boyutları
+BENCHMARK_OUTPUT_PATH = "benchmark_results.json" # Son ölçümün sonuçları
+BENCHMARK_BASELINE_PATH = "benchmark_baseline.json" # Karşılaştırılan referans sonuçlar
+BENCHMARK_REGRESSION_TOLERANCE = 0.15 # Referansa göre izin verilen yavaşlama oranı (%15)
+
+
+# --- Projectile Swarm (swarm.py) ---
+SWARM_CAPACITY = 0 # Aynı anda uçabilecek en fazla sürü mermisi (0: sürü kapalı). Açıkken V tuşu hedefe yaylım atışı yapar
+SWARM_VOLLEY_SIZE = 500 # Bir yaylım atışındaki mermi sayısı
+SWARM_VOLLEY_TIME_RANGE_SEC = (1.0, 3.0) # Yaylımdaki mermilerin uçuş süreleri bu aralığa yayılır
+SWARM_PROJECTILE_RADIUS_PX = max(2, CIRCLE_RADIUS_PX // 4) # Sürü mermisi yarıçapı
+SWARM_PROJECTILE_COLOR = (255, 165, 0) # Turuncu (tek mermiden ayırt etmek için)
+SWARM_VECTORS_ENABLED = True # Vektör gösterimi açıkken her sürü mermisinin de okları çizilsin mi?
+
+
 # --- Projectile Trail ---
 TRAIL_ENABLED = True # Rota çizimi aktif mi?
 TRAIL_POINT_INTERVAL_SEC = 0.05 # Saniye cinsinden noktalar arasındaki süre (simülasyon zamanı)
@@ -0,0 +1,621 @@
+# drag.py
+# -*- coding: utf-8 -*-
+import math
+from collections import OrderedDict
+import numpy as np
+import config as cfg
+from physics import PhysicsEngine
+
+# Dormand-Prince 5(4) coefficients (used by the adaptive "rk45" integrator)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = _DP_A[6] + (0.0,) # 5th order weights (same as the last stage row: FSAL)
+_DP_B4 = (5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+_DP_E = tuple(b5 - b4 for b5, b4 in zip(_DP_B5, _DP_B4)) # Error estimate weights
+
+
+class _Workspace:
+    """Scratch arrays for integrating a batch of N states, allocated once and reused every step."""
+
+    def __init__(self, n):
+        self.n = n
+        self.stages = [np.empty((n, 4)) for _ in range(7)] # Stage derivatives (RK4 uses 4, RK45 all 7)
+        self.tmp = np.empty((n, 4)) # Intermediate state
+        self.err = np.empty((n, 4)) # RK45 error estimate
+        self.scale = np.empty((n, 4)) # RK45 error tolerance per component
+        self.speed = np.empty((n, 1)) # |v| for quadratic drag
+        self.start = np.empty((n, 4)) # State at the start of an RK45 step (for rejected steps)
+        self.term = np.empty((n, 4)) # coeff * stage product before accumulating
+
+    def rows(self, n):
+        """Workspace over the first n rows of this one (views, nothing is allocated for the arrays)."""
+        if n == self.n:
+            return self
+        view = object.__new__(_Workspace)
+        view.n = n
+        view.stages = [stage[:n] for stage in self.stages]
+        for name in ("tmp", "err", "scale", "speed", "start", "term"):
+            setattr(view, name, getattr(self, name)[:n])
+        return view
+
+
+class DragPhysicsEngine(PhysicsEngine):
+    """
+    Projectile motion with air drag, integrated numerically.
+
+    The state of a batch of N projectiles is one (N, 4) float64 array of
+    [x, y, vx, vy] rows in pixels and pixels/sec (Pygame coords, y down).
+    Integrators update that array in place; all scratch space is preallocated per
+    batch size, so stepping does not allocate.
+
+    Drag models (acceleration, v in px/s):
+        "linear":    a = -(b / m) * v
+        "quadratic": a = -(0.5 * rho * Cd * A / m) * |v| * v   (converted to pixel units)
+    """
+
+    has_closed_form = False
+    DRAG_MODELS = ("linear", "quadratic")
+    INTEGRATORS = ("semi_implicit_euler", "rk4", "rk45")
+
+    def __init__(self, drag_model=None, mass_kg=None, cross_section_m2=None, drag_coefficient=None,
+                 linear_drag_coeff_kg_s=None, air_density_kg_m3=None, integrator=None):
+        super().__init__()
+        self.drag_model = drag_model if drag_model is not None else cfg.DRAG_MODEL
+        self.mass_kg = mass_kg if mass_kg is not None else cfg.PROJECTILE_MASS_KG
+        self.cross_section_m2 = cross_section_m2 if cross_section_m2 is not None else cfg.PROJECTILE_CROSS_SECTION_M2
+        self.drag_coefficient = drag_coefficient if drag_coefficient is not None else cfg.DRAG_COEFFICIENT
+        self.linear_drag_coeff_kg_s = linear_drag_coeff_kg_s if linear_drag_coeff_kg_s is not None else cfg.LINEAR_DRAG_COEFF_KG_S
+        self.air_density_kg_m3 = air_density_kg_m3 if air_density_kg_m3 is not None else cfg.AIR_DENSITY_KG_M3
+        self.integrator = integrator if integrator is not None else cfg.DRAG_INTEGRATOR
+        if self.drag_model not in self.DRAG_MODELS:
+            raise ValueError(f"Unknown drag model '{self.drag_model}' (expected one of {self.DRAG_MODELS})")
+        if self.integrator not in self.INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{self.integrator}' (expected one of {self.INTEGRATORS})")
+        if self.mass_kg <= 0:
+            raise ValueError("Projectile mass must be positive")
+        self._workspace = None # Largest workspace so far
+        self._workspace_view = None # Its rows for the last batch size asked for
+        self._solution_cache = OrderedDict() # Solver cache key -> (v0x_px_s, v0y_px_s), least recently used first
+        self._last_drag_correction = (0.0, 0.0) # Solution minus drag-free answer of the last scalar solve
+        self._last_jacobian = None # d(end position)/d(v0) of the last scalar solve, as (a, b, c, d)
+
+    @property
+    def drag_constant(self):
+        """
+        Drag acceleration per unit of velocity term, in pixel units:
+        1/s for the linear model, 1/px for the quadratic model.
+        """
+        if self.drag_model == "linear":
+            return self.linear_drag_coeff_kg_s / self.mass_kg
+        k_per_m = 0.5 * self.air_density_kg_m3 * self.drag_coefficient * self.cross_section_m2 / self.mass_kg
+        return k_per_m / cfg.PIXELS_PER_METER
+
+    def _get_workspace(self, n):
+        """
+        Scratch arrays for a batch of n states: [:n] views of one workspace kept at the largest
+        n seen, so alternating batch sizes (solver batches, single launches) do not reallocate.
+        """
+        view = self._workspace_view
+        if view is not None and view.n == n:
+            return view
+        if self._workspace is None or self._workspace.n < n:
+            self._workspace = _Workspace(n)
+        self._workspace_view = view = self._workspace.rows(n)
+        return view
+
+    # --- State ---
+
+    @staticmethod
+    def make_state(initial_pos_px, v0_px_s):
+        """
+        Builds an (N, 4) state array from starting positions and velocities.
+
+        Args:
+            initial_pos_px (array_like): Starting [x, y] positions in pixels, shape (2,) or (N, 2).
+            v0_px_s (array_like): Initial [vx, vy] velocities in pixels/sec, shape (2,) or (N, 2).
+
+        Returns:
+            np.ndarray: (N, 4) float64 array of [x, y, vx, vy] rows.
+        """
+        pos = np.atleast_2d(np.asarray(initial_pos_px, dtype=np.float64))
+        vel = np.atleast_2d(np.asarray(v0_px_s, dtype=np.float64))
+        pos, vel = np.broadcast_arrays(pos, vel)
+        return np.concatenate((pos, vel), axis=1)
+
+    def _derivative_into(self, state, out, ws, drag_k):
+        """Writes d(state)/dt into out: [vx, vy, ax, ay]."""
+        vel = state[:, 2:]
+        out[:, :2] = vel
+        if self.drag_model == "quadratic":
+            np.hypot(vel[:, 0:1], vel[:, 1:2], out=ws.speed)
+            ws.speed *= -drag_k
+            np.multiply(vel, ws.speed, out=out[:, 2:])
+        else:
+            np.multiply(vel, -drag_k, out=out[:, 2:])
+        out[:, 3] += self.gravity_px_s2
+
+    # --- Fixed-step Integrators ---
+
+    def _step_semi_implicit_euler(self, state, dt, ws, drag_k):
+        """v += a(v) * dt, then x += v_new * dt (symplectic Euler)."""
+        accel = ws.stages[0]
+        self._derivative_into(state, accel, ws, drag_k)
+        accel *= dt
+        state[:, 2:] += accel[:, 2:]
+        np.multiply(state[:, 2:], dt, out=ws.tmp[:, :2])
+        state[:, :2] += ws.tmp[:, :2]
+
+    def _step_rk4(self, state, dt, ws, drag_k):
+        """Classic 4th order Runge-Kutta step."""
+        k1, k2, k3, k4 = ws.stages[:4]
+        tmp = ws.tmp
+        self._derivative_into(state, k1, ws, drag_k)
+        np.multiply(k1, 0.5 * dt, out=tmp)
+        tmp += state
+        self._derivative_into(tmp, k2, ws, drag_k)
+        np.multiply(k2, 0.5 * dt, out=tmp)
+        tmp += state
+        self._derivative_into(tmp, k3, ws, drag_k)
+        np.multiply(k3, dt, out=tmp)
+        tmp += state
+        self._derivative_into(tmp, k4, ws, drag_k)
+        # state += dt/6 * (k1 + 2*k2 + 2*k3 + k4)
+        k2 += k3
+        k2 *= 2.0
+        k1 += k4
+        k1 += k2
+        k1 *= dt / 6.0
+        state += k1
+
+    def _dormand_prince_stages(self, state, dt, ws, drag_k, first_stage_ready=False):
+        """Fills ws.stages with the 7 Dormand-Prince stage derivatives for a step of dt from state."""
+        stages, tmp = ws.stages, ws.tmp
+        if not first_stage_ready:
+            self._derivative_into(state, stages[0], ws, drag_k)
+        for i in range(1, 7):
+            tmp[...] = state
+            for a_ij, k_j in zip(_DP_A[i], stages):
+                if a_ij:
+                    np.multiply(k_j, a_ij * dt, out=ws.term)
+                    tmp += ws.term
+            self._derivative_into(tmp, stages[i], ws, drag_k)
+        # tmp now holds the 5th order solution (stage 7 is evaluated at it: FSAL)
+
+    def _step_rk45_fixed(self, state, dt, ws, drag_k):
+        """One Dormand-Prince 5th order step without step size control."""
+        self._dormand_prince_stages(state, dt, ws, drag_k)
+        state[...] = ws.tmp
+
+    def step(self, state, dt_sec, integrator=None):
+        """
+        Advances the state array by dt_sec in place with a single step.
+
+        Args:
+            state (np.ndarray): (N, 4) [x, y, vx, vy] array from make_state (modified in place).
+            dt_sec (float): Step size in seconds.
+            integrator (str): Overrides self.integrator for this call. "rk45" takes one
+                              uncontrolled 5th order step here; integrate() adapts the step size.
+        """
+        integrator = integrator or self.integrator
+        ws = self._get_workspace(len(state))
+        drag_k = self.drag_constant
+        if integrator == "semi_implicit_euler":
+            self._step_semi_implicit_euler(state, dt_sec, ws, drag_k)
+        elif integrator == "rk4":
+            self._step_rk4(state, dt_sec, ws, drag_k)
+        elif integrator == "rk45":
+            self._step_rk45_fixed(state, dt_sec, ws, drag_k)
+        else:
+            raise ValueError(f"Unknown integrator '{integrator}' (expected one of {self.INTEGRATORS})")
+
+    # --- Integration Over a Duration ---
+
+    def integrate(self, state, duration_sec, dt_sec=None, integrator=None, drag_enabled=True):
+        """
+        Advances the state array by duration_sec in place.
+
+        Fixed-step integrators take ceil(duration / dt) equal steps so the end time is hit
+        exactly. "rk45" adapts one shared step size for the whole batch to keep the
+        worst row within cfg.DRAG_RK45_RTOL / cfg.DRAG_RK45_ATOL.
+
+        Args:
+            state (np.ndarray): (N, 4) [x, y, vx, vy] array from make_state (modified in place).
+            duration_sec (float): Simulation time to advance.
+            dt_sec (float): Fixed step size (initial step size for "rk45"). Default: cfg.DRAG_TIMESTEP_SEC.
+            integrator (str): Overrides self.integrator for this call.
+            drag_enabled (bool): False integrates plain gravity (used for error reporting).
+
+        Returns:
+            int: Number of accepted steps.
+        """
+        integrator = integrator or self.integrator
+        if integrator not in self.INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{integrator}' (expected one of {self.INTEGRATORS})")
+        dt_sec = dt_sec if dt_sec is not None else cfg.DRAG_TIMESTEP_SEC
+        if duration_sec <= 0 or len(state) == 0:
+            return 0
+        ws = self._get_workspace(len(state))
+        drag_k = self.drag_constant if drag_enabled else 0.0
+
+        if integrator == "rk45":
+            return self._integrate_rk45(state, (duration_sec,), dt_sec, ws, drag_k)
+        return self._integrate_fixed(state, (duration_sec,), dt_sec, integrator, ws, drag_k)
+
+    def _integrate_fixed(self, state, stop_times_sec, dt_sec, integrator, ws, drag_k, samples=None):
+        """
+        Fixed-step integration from t = 0 through the ascending stop times. Each stretch between
+        two stops takes ceil(length / dt) equal steps so every stop is hit exactly; samples[i]
+        (if given) receives the state of the single launch at stop i.
+        """
+        step_fn = self._step_rk4 if integrator == "rk4" else self._step_semi_implicit_euler
+        t_prev = 0.0
+        num_steps_total = 0
+        for i, t_stop in enumerate(stop_times_sec):
+            stretch = t_stop - t_prev
+            if stretch > 0:
+                num_steps = max(1, math.ceil(stretch / dt_sec - 1e-9))
+                step_dt = stretch / num_steps
+                for _ in range(num_steps):
+                    step_fn(state, step_dt, ws, drag_k)
+                num_steps_total += num_steps
+                t_prev = t_stop
+            if samples is not None:
+                samples[i] = state[0]
+        return num_steps_total
+
+    def _integrate_rk45(self, state, stop_times_sec, dt_sec, ws, drag_k, samples=None):
+        """
+        Adaptive Dormand-Prince integration with a shared step size for the batch, from t = 0
+        through the ascending stop times. Steps are shortened to land on each stop; the step
+        size the controller chose carries over to the next stretch. samples[i] (if given)
+        receives the state of the single launch at stop i.
+        """
+        rtol, atol = cfg.DRAG_RK45_RTOL, cfg.DRAG_RK45_ATOL
+        stages, err, scale = ws.stages, ws.err, ws.scale
+        t = 0.0
+        dt = dt_sec
+        accepted = 0
+        first_stage_ready = False
+        for i, t_stop in enumerate(stop_times_sec):
+            while t < t_stop:
+                step_dt = min(dt, t_stop - t)
+                ws.start[...] = state
+                self._dormand_prince_stages(state, step_dt, ws, drag_k, first_stage_ready)
+
+                # Error estimate: dt * sum(e_i * k_i), normalized per component
+                err.fill(0.0)
+                for e_i, k_i in zip(_DP_E, stages):
+                    if e_i:
+                        np.multiply(k_i, e_i * step_dt, out=ws.term)
+                        err += ws.term
+                np.abs(ws.start, out=scale)
+                np.abs(ws.tmp, out=ws.term)
+                np.maximum(scale, ws.term, out=scale)
+                scale *= rtol
+                scale += atol
+                err /= scale
+                err *= err
+                error_norm = math.sqrt(float(err.max()))
+
+                # Standard step size controller (safety 0.9, growth limited to [0.2, 5])
+                factor = 5.0 if error_norm == 0 else min(5.0, max(0.2, 0.9 * error_norm ** -0.2))
+                if error_norm <= 1.0:
+                    landed = step_dt == t_stop - t
+                    t = t_stop if landed else t + step_dt
+                    state[...] = ws.tmp
+                    stages[0][...] = stages[6] # FSAL: last stage is the next step's first
+                    accepted += 1
+                    # A step shortened to land on the stop says nothing against the longer one
+                    dt = max(dt, step_dt * factor) if landed and step_dt < dt else step_dt * factor
+                else:
+                    dt = step_dt * factor
+                first_stage_ready = True # Accepted: FSAL stage; rejected: state unchanged, its derivative still in stages[0]
+            if samples is not None:
+                samples[i] = state[0]
+        return accepted
+
+    def calculate_drag_batch(self, initial_pos_px, v0_px_s, t_elapsed_effective, dt_sec=None, integrator=None):
+        """
+        Drag counterpart of calculate_kinematic_batch for one shared elapsed time.
+
+        Args:
+            initial_pos_px (array_like): Starting [x, y] positions in pixels, shape (2,) or (N, 2).
+            v0_px_s (array_like): Initial [vx, vy] velocities in pixels/sec, shape (2,) or (N, 2).
+            t_elapsed_effective (float): Effective elapsed simulation time in seconds.
+            dt_sec (float): Step size (see integrate()).
+            integrator (str): Overrides self.integrator for this call.
+
+        Returns:
+            tuple: (pos_px, v_px_s) float64 arrays of shape (N, 2).
+        """
+        state = self.make_state(initial_pos_px, v0_px_s)
+        self.integrate(state, t_elapsed_effective, dt_sec, integrator)
+        return state[:, :2].copy(), state[:, 2:].copy()
+
+    def sample_trajectory(self, initial_pos_px, v0_px_s, times_sec, dt_sec=None, integrator=None):
+        """
+        Drag counterpart of PhysicsEngine.sample_trajectory: integrates one launch once, from
+        t = 0 through the given ascending times, and records the state at each of them (steps
+        are fitted to land on the sample times).
+
+        Returns:
+            tuple: (pos_px, v_px_s) float64 arrays of shape (M, 2).
+        """
+        integrator = integrator or self.integrator
+        if integrator not in self.INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{integrator}' (expected one of {self.INTEGRATORS})")
+        dt_sec = dt_sec if dt_sec is not None else cfg.DRAG_TIMESTEP_SEC
+        stop_times_sec = np.asarray(times_sec, dtype=np.float64).tolist()
+        state = self.make_state(initial_pos_px, v0_px_s)
+        samples = np.empty((len(stop_times_sec), 4))
+        ws = self._get_workspace(len(state))
+        if integrator == "rk45":
+            self._integrate_rk45(state, stop_times_sec, dt_sec, ws, self.drag_constant, samples)
+        else:
+            self._integrate_fixed(state, stop_times_sec, dt_sec, integrator, ws, self.drag_constant, samples)
+        return samples[:, :2], samples[:, 2:]
+
+    def integration_error(self, initial_pos_px, v0_px_s, duration_sec, dt_sec=None, integrator=None):
+        """
+        Measures an integrator's error against the analytic (drag-free) solution.
+
+        Integrates the given launches with drag switched off and compares the end state
+        with PhysicsEngine.calculate_kinematic_batch.
+
+        Returns:
+            dict: 'max_pos_error_px', 'max_vel_error_px_s' (worst row) and 'steps' taken.
+        """
+        state = self.make_state(initial_pos_px, v0_px_s)
+        exact_pos_px, exact_v_px_s = self.calculate_kinematic_batch(state[:, :2], state[:, 2:], duration_sec)
+        steps = self.integrate(state, duration_sec, dt_sec, integrator, drag_enabled=False)
+        return {
+            'max_pos_error_px': float(np.max(np.hypot(*(state[:, :2] - exact_pos_px).T))),
+            'max_vel_error_px_s': float(np.max(np.hypot(*(state[:, 2:] - exact_v_px_s).T))),
+            'steps': steps,
+        }
+
+    # --- Inverse Solver (launch velocities that hit a target under drag) ---
+
+    def _shoot(self, initial_pos_px, v0_px_s, time_to_target_sec, num_steps):
+        """End positions (N, 2) after time_to_target_sec (per row), using num_steps RK4 steps per row."""
+        state = self.make_state(initial_pos_px, v0_px_s)
+        ws = self._get_workspace(len(state))
+        drag_k = self.drag_constant
+        step_dt = (time_to_target_sec / num_steps)[:, np.newaxis] # Per-row step size, same step count
+        for _ in range(num_steps):
+            self._step_rk4(state, step_dt, ws, drag_k)
+        return state[:, :2]
+
+    def _solver_cache_key(self, initial_pos_px, target_center_px, time_to_target_sec):
+        # Rounded so that float noise from slider math still hits the cache
+        return (round(float(initial_pos_px[0]), 6), round(float(initial_pos_px[1]), 6),
+                round(float(target_center_px[0]), 6), round(float(target_center_px[1]), 6),
+                round(float(time_to_target_sec), 9),
+                self.drag_model, self.drag_constant, self.gravity_px_s2)
+
+    def clear_solver_cache(self):
+        """Forgets all cached solutions of solve_required_velocities(_batch)."""
+        self._solution_cache.clear()
+
+    def _newton_solve(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        Newton shooting iteration for rows with t > 0, warm-started from the drag-free answer.
+        The Jacobian is taken by finite differences: each iteration shoots the base guess and
+        the two perturbed guesses of every unconverged row in one batch.
+        """
+        n = len(initial_pos_px)
+        v0x, v0y = self.calculate_required_velocities_batch(initial_pos_px, target_center_px, time_to_target_sec)
+        v0_px_s = np.stack((v0x, v0y), axis=1)
+        converged = np.zeros(n, dtype=bool)
+        tol_px = cfg.DRAG_SOLVER_TOLERANCE_PX
+        num_steps = cfg.DRAG_SOLVER_STEPS
+        active = np.arange(n)
+
+        for iteration in range(cfg.DRAG_SOLVER_MAX_ITERATIONS + 1):
+            start, target, t = initial_pos_px[active], target_center_px[active], time_to_target_sec[active]
+            v = v0_px_s[active]
+            h = 1e-6 * (np.abs(v).max(axis=1) + 1.0) # Finite difference step per row (px/s)
+            m = len(active)
+            guesses = np.concatenate((v, v + np.stack((h, np.zeros(m)), axis=1), v + np.stack((np.zeros(m), h), axis=1)))
+            end = self._shoot(np.concatenate((start, start, start)), guesses, np.concatenate((t, t, t)), num_steps)
+            end_base = end[:m]
+            residual = end_base - target
+
+            done = np.hypot(residual[:, 0], residual[:, 1]) <= tol_px
+            converged[active[done]] = True
+            if iteration == cfg.DRAG_SOLVER_MAX_ITERATIONS or done.all():
+                break
+
+            # 2x2 Jacobian d(end)/d(v0) per row, then v -= J^-1 * residual
+            j_a, j_c = ((end[m:2 * m] - end_base) / h[:, np.newaxis]).T # Column for v0x
+            j_b, j_d = ((end[2 * m:] - end_base) / h[:, np.newaxis]).T # Column for v0y
+            det = j_a * j_d - j_b * j_c
+            solvable = ~done & (np.abs(det) > 1e-12)
+            r_x, r_y = residual.T
+            dv = np.stack(((j_d * r_x - j_b * r_y), (-j_c * r_x + j_a * r_y)), axis=1) / np.where(solvable, det, 1.0)[:, np.newaxis]
+            v0_px_s[active[solvable]] -= dv[solvable]
+            active = active[solvable]
+            if not len(active):
+                break
+        return v0_px_s, converged
+
+    def _shoot_scalar(self, x, y, vx, vy, time_to_target_sec, num_steps, drag_k):
+        """Plain-float version of _shoot for one row (no NumPy call overhead, ~70 us for 48 steps)."""
+        g = self.gravity_px_s2
+        quadratic = self.drag_model == "quadratic"
+        h = time_to_target_sec / num_steps
+        half_h, h6 = 0.5 * h, h / 6.0
+
+        def accel(ux, uy):
+            factor = drag_k * math.hypot(ux, uy) if quadratic else drag_k
+            return -factor * ux, -factor * uy + g
+
+        for _ in range(num_steps):
+            a1x, a1y = accel(vx, vy)
+            v2x, v2y = vx + half_h * a1x, vy + half_h * a1y
+            a2x, a2y = accel(v2x, v2y)
+            v3x, v3y = vx + half_h * a2x, vy + half_h * a2y
+            a3x, a3y = accel(v3x, v3y)
+            v4x, v4y = vx + h * a3x, vy + h * a3y
+            a4x, a4y = accel(v4x, v4y)
+            x += h6 * (vx + 2 * v2x + 2 * v3x + v4x)
+            y += h6 * (vy + 2 * v2y + 2 * v3y + v4y)
+            vx += h6 * (a1x + 2 * a2x + 2 * a3x + a4x)
+            vy += h6 * (a1y + 2 * a2y + 2 * a3y + a4y)
+        return x, y
+
+    def _newton_solve_scalar(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        _newton_solve for a single row in plain floats. The first guess is the drag-free
+        answer plus the drag correction of the previous scalar solve, and the first Newton
+        step reuses that solve's Jacobian: while a slider is dragged, consecutive
+        configurations are close and a re-solve typically takes two shots.
+        """
+        x0, y0 = float(initial_pos_px[0]), float(initial_pos_px[1])
+        tx, ty = float(target_center_px[0]), float(target_center_px[1])
+        t = float(time_to_target_sec)
+        drag_k = self.drag_constant
+        num_steps = cfg.DRAG_SOLVER_STEPS
+        tol_px = cfg.DRAG_SOLVER_TOLERANCE_PX
+
+        free_vx, free_vy = self.calculate_required_velocities([x0, y0], [tx, ty], t)
+        vx, vy = free_vx + self._last_drag_correction[0], free_vy + self._last_drag_correction[1]
+        end_x, end_y = self._shoot_scalar(x0, y0, vx, vy, t, num_steps, drag_k)
+        if math.hypot(end_x - tx, end_y - ty) > tol_px and self._last_drag_correction != (0.0, 0.0):
+            # Carried-over correction made things worse than starting from scratch: drop it
+            start_x, start_y = self._shoot_scalar(x0, y0, free_vx, free_vy, t, num_steps, drag_k)
+            if math.hypot(start_x - tx, start_y - ty) < math.hypot(end_x - tx, end_y - ty):
+                vx, vy, end_x, end_y = free_vx, free_vy, start_x, start_y
+
+        converged = False
+        jacobian = self._last_jacobian
+        for iteration in range(cfg.DRAG_SOLVER_MAX_ITERATIONS + 1):
+            r_x, r_y = end_x - tx, end_y - ty
+            if math.hypot(r_x, r_y) <= tol_px:
+                converged = True
+                break
+            if iteration == cfg.DRAG_SOLVER_MAX_ITERATIONS:
+                break
+            if iteration == 0 and jacobian is not None:
+                j_a, j_b, j_c, j_d = jacobian # Nearby configuration: its Jacobian is good enough for one step
+            else:
+                h = 1e-6 * (max(abs(vx), abs(vy)) + 1.0)
+                ex_x, ex_y = self._shoot_scalar(x0, y0, vx + h, vy, t, num_steps, drag_k)
+                ey_x, ey_y = self._shoot_scalar(x0, y0, vx, vy + h, t, num_steps, drag_k)
+                j_a, j_c = (ex_x - end_x) / h, (ex_y - end_y) / h
+                j_b, j_d = (ey_x - end_x) / h, (ey_y - end_y) / h
+            det = j_a * j_d - j_b * j_c
+            if abs(det) < 1e-12:
+                break
+            jacobian = (j_a, j_b, j_c, j_d)
+            vx -= (j_d * r_x - j_b * r_y) / det
+            vy -= (-j_c * r_x + j_a * r_y) / det
+            end_x, end_y = self._shoot_scalar(x0, y0, vx, vy, t, num_steps, drag_k)
+
+        if converged:
+            self._last_drag_correction = (vx - free_vx, vy - free_vy)
+            self._last_jacobian = jacobian
+        return (vx, vy), converged
+
+    def solve_required_velocities_batch(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        Drag counterpart of calculate_required_velocities_batch: finds, for every row, the
+        launch velocity whose trajectory reaches the target center after the given time.
+
+        Converged solutions are cached per (start, target, time), so re-solving an unchanged
+        configuration (e.g. a redraw while a slider is held still) costs a dict lookup.
+        Up to cfg.DRAG_SOLVER_SCALAR_MAX_ROWS uncached rows are solved one by one in plain
+        floats, warm-started from the previous solve; larger batches are solved together.
+
+        Args:
+            initial_pos_px (array_like): Starting [x, y] positions in pixels, shape (2,) or (N, 2).
+            target_center_px (array_like): Target centers [x, y] in pixels, shape (2,) or (N, 2).
+            time_to_target_sec (array_like): Flight times in seconds, scalar or shape (N,).
+
+        Returns:
+            tuple: (v0x_px_s, v0y_px_s, converged) arrays of shape (N,). Rows with a non-positive
+                   time get (0, 0); rows that did not reach cfg.DRAG_SOLVER_TOLERANCE_PX within
+                   cfg.DRAG_SOLVER_MAX_ITERATIONS hold the last Newton iterate and converged=False.
+        """
+        start = np.atleast_2d(np.asarray(initial_pos_px, dtype=np.float64))
+        target = np.atleast_2d(np.asarray(target_center_px, dtype=np.float64))
+        t = np.atleast_1d(np.asarray(time_to_target_sec, dtype=np.float64))
+        n = max(len(start), len(target), len(t))
+        start, target = np.broadcast_to(start, (n, 2)), np.broadcast_to(target, (n, 2))
+        t = np.broadcast_to(t, (n,))
+
+        v0_px_s = np.zeros((n, 2))
+        converged = np.zeros(n, dtype=bool)
+        keys = [self._solver_cache_key(start[i], target[i], t[i]) for i in range(n)]
+        to_solve = []
+        for i, key in enumerate(keys):
+            if t[i] <= 0:
+                converged[i] = True # (0, 0), like the drag-free solver
+                continue
+            cached = self._solution_cache.get(key)
+            if cached is None:
+                to_solve.append(i)
+            else:
+                self._solution_cache.move_to_end(key)
+                v0_px_s[i] = cached
+                converged[i] = True
+
+        if to_solve:
+            rows = np.array(to_solve)
+            if len(rows) <= cfg.DRAG_SOLVER_SCALAR_MAX_ROWS:
+                # A few rows (interactive use): plain floats beat NumPy's per-call overhead
+                results = [self._newton_solve_scalar(start[i], target[i], t[i]) for i in to_solve]
+                solved_v = np.array([v for v, _ in results])
+                solved_ok = np.array([ok for _, ok in results])
+            else:
+                solved_v, solved_ok = self._newton_solve(start[rows], target[rows], t[rows])
+            v0_px_s[rows] = solved_v
+            converged[rows] = solved_ok
+            for i, v, ok in zip(to_solve, solved_v, solved_ok):
+                if ok:
+                    self._solution_cache[keys[i]] = (float(v[0]), float(v[1]))
+            while len(self._solution_cache) > cfg.DRAG_SOLVER_CACHE_MAX_ENTRIES:
+                self._solution_cache.popitem(last=False) # Evict least recently used
+
+        return v0_px_s[:, 0], v0_px_s[:, 1], converged
+
+    def solve_required_velocities(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        Scalar form of solve_required_velocities_batch (same arguments and return as
+        calculate_required_velocities, plus the converged flag).
+
+        Returns:
+            tuple: (v0x_px_s, v0y_px_s, converged)
+        """
+        v0x, v0y, converged = self.solve_required_velocities_batch(initial_pos_px, target_center_px, time_to_target_sec)
+        return float(v0x[0]), float(v0y[0]), bool(converged[0])
+
+    def solve_launch_velocities(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        PhysicsEngine hook used to aim launches: solve_required_velocities.
+
+        Raises:
+            ValueError: If the solver does not converge (message shown to the user).
+        """
+        v0x_px_s, v0y_px_s, converged = self.solve_required_velocities(initial_pos_px, target_center_px, time_to_target_sec)
+        if not converged:
+            raise ValueError("Hava direnciyle bu sürede hedefe ulaşan atış bulunamadı!")
+        return v0x_px_s, v0y_px_s
+
+    def solve_launch_velocities_batch(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        PhysicsEngine hook for batches of launches: solve_required_velocities_batch without the
+        converged flags (rows that did not converge keep the last Newton iterate).
+
+        Returns:
+            tuple: (v0x_px_s, v0y_px_s) arrays of shape (N,).
+        """
+        v0x_px_s, v0y_px_s, _ = self.solve_required_velocities_batch(initial_pos_px, target_center_px, time_to_target_sec)
+        return v0x_px_s, v0y_px_s
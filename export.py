@@ -0,0 +1,207 @@
+# export.py
+# -*- coding: utf-8 -*-
+import os
+import glob
+import json
+import shutil
+import zipfile
+import numpy as np
+import config as cfg
+import utils
+
+COLUMNS = ("t_s", "x_m", "y_m", "vx_mps", "vy_mps")
+
+
+def to_si(t_sec, pos_px, v_px_s):
+    """
+    Converts samples from pixels (Pygame coords) to SI rows [t, x, y, vx, vy].
+
+    x is measured from the left edge and y upwards from the bottom of the window;
+    vy is positive upwards (as shown in the UI).
+
+    Args:
+        t_sec (array_like): Times in seconds, shape (n,).
+        pos_px (array_like): [x, y] positions in pixels, shape (n, 2).
+        v_px_s (array_like): [vx, vy] velocities in pixels/sec, shape (n, 2).
+
+    Returns:
+        np.ndarray: (n, 5) float64 array in COLUMNS order.
+    """
+    pos_px = np.asarray(pos_px, dtype=np.float64).reshape(-1, 2)
+    v_px_s = np.asarray(v_px_s, dtype=np.float64).reshape(-1, 2)
+    rows = np.empty((len(pos_px), 5))
+    rows[:, 0] = t_sec
+    rows[:, 1] = utils.px_to_m(pos_px[:, 0])
+    rows[:, 2] = utils.px_to_m(cfg.HEIGHT - pos_px[:, 1])
+    rows[:, 3] = utils.px_s_to_mps(v_px_s[:, 0])
+    rows[:, 4] = utils.px_s_to_mps(-v_px_s[:, 1])
+    return rows
+
+
+class TrajectoryExporter:
+    """
+    Streams trajectory samples to a file through a fixed-size buffer.
+
+    Samples are converted to SI units and collected in a preallocated (buffer_rows, 5)
+    array; every time it fills up it is handed to _write_block() and reused, so memory use
+    does not grow with the length of the run. Subclasses implement the file format.
+    Use as a context manager, or call close() to flush the last rows.
+    """
+
+    def __init__(self, path, buffer_rows=None):
+        self.path = path
+        self.buffer_rows = max(1, int(buffer_rows if buffer_rows is not None else cfg.EXPORT_BUFFER_ROWS))
+        self._buffer = np.empty((self.buffer_rows, len(COLUMNS)))
+        self._buffered = 0
+        self.rows_written = 0 # Rows handed to the file so far (excluding the buffer)
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, t_sec, pos_px, v_px_s):
+        """Adds one sample (time, [x, y] px, [vx, vy] px/s)."""
+        row = self._buffer[self._buffered]
+        row[0] = t_sec
+        row[1] = utils.px_to_m(pos_px[0])
+        row[2] = utils.px_to_m(cfg.HEIGHT - pos_px[1])
+        row[3] = utils.px_s_to_mps(v_px_s[0])
+        row[4] = utils.px_s_to_mps(-v_px_s[1])
+        self._buffered += 1
+        if self._buffered == self.buffer_rows:
+            self.flush()
+
+    def write_batch(self, t_sec, pos_px, v_px_s):
+        """Adds many samples at once (arrays as in to_si), e.g. a whole TrajectoryTable."""
+        self.write_rows(to_si(t_sec, pos_px, v_px_s))
+
+    def write_rows(self, rows):
+        """Adds already converted (n, 5) SI rows."""
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(COLUMNS))
+        start = 0
+        while start < len(rows):
+            count = min(len(rows) - start, self.buffer_rows - self._buffered)
+            self._buffer[self._buffered:self._buffered + count] = rows[start:start + count]
+            self._buffered += count
+            start += count
+            if self._buffered == self.buffer_rows:
+                self.flush()
+
+    def flush(self):
+        """Writes the buffered rows out."""
+        if self._buffered:
+            self._write_block(self._buffer[:self._buffered])
+            self.rows_written += self._buffered
+            self._buffered = 0
+
+    def close(self):
+        """Flushes and finalizes the file (safe to call twice)."""
+        if self.closed:
+            return
+        self.flush()
+        self._finish()
+        self.closed = True
+
+    def _write_block(self, block):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+
+class CsvExporter(TrajectoryExporter):
+    """Comma separated text with a header line."""
+
+    def __init__(self, path, buffer_rows=None):
+        super().__init__(path, buffer_rows)
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._file.write(",".join(COLUMNS) + "\n")
+
+    def _write_block(self, block):
+        np.savetxt(self._file, block, delimiter=",", fmt="%.9g")
+
+    def _finish(self):
+        self._file.close()
+
+
+class NpzExporter(TrajectoryExporter):
+    """
+    NumPy .npz archive with one 1-D array per column (np.load(path)["x_m"]).
+
+    Blocks are appended to one raw temporary file per column; close() writes the .npy
+    headers (the length is only known then) and streams the columns into the archive.
+    """
+
+    def __init__(self, path, buffer_rows=None):
+        super().__init__(path, buffer_rows)
+        self._column_paths = [f"{path}.{name}.tmp" for name in COLUMNS]
+        self._column_files = [open(column_path, "wb") for column_path in self._column_paths]
+
+    def _write_block(self, block):
+        for i, column_file in enumerate(self._column_files):
+            column_file.write(np.ascontiguousarray(block[:, i], dtype="<f8").tobytes())
+
+    def _finish(self):
+        for column_file in self._column_files:
+            column_file.close()
+        tmp_path = self.path + ".tmp"
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, column_path in zip(COLUMNS, self._column_paths):
+                with archive.open(name + ".npy", "w", force_zip64=True) as member, open(column_path, "rb") as column_file:
+                    header = {'descr': '<f8', 'fortran_order': False, 'shape': (self.rows_written,)}
+                    np.lib.format.write_array_header_2_0(member, header)
+                    shutil.copyfileobj(column_file, member)
+        os.replace(tmp_path, self.path)
+        for column_path in self._column_paths:
+            os.remove(column_path)
+
+
+class ColumnarExporter(TrajectoryExporter):
+    """
+    Chunked columnar directory for long or batch runs: every full buffer becomes one
+    row group file (part_000000.npz, ... with one array per column), and schema.json
+    records the columns, units and row counts. Read back one row group at a time with
+    iter_columnar().
+    """
+
+    SCHEMA_FILE = "schema.json"
+    UNITS = {"t_s": "s", "x_m": "m", "y_m": "m", "vx_mps": "m/s", "vy_mps": "m/s"}
+
+    def __init__(self, path, buffer_rows=None):
+        super().__init__(path, buffer_rows)
+        os.makedirs(path, exist_ok=True)
+        for old_part in glob.glob(os.path.join(path, "part_*.npz")):
+            os.remove(old_part) # Don't mix with the row groups of an earlier export
+        self._part_rows = []
+
+    def _write_block(self, block):
+        part_path = os.path.join(self.path, f"part_{len(self._part_rows):06d}.npz")
+        np.savez(part_path, **{name: block[:, i] for i, name in enumerate(COLUMNS)})
+        self._part_rows.append(len(block))
+
+    def _finish(self):
+        schema = {"columns": list(COLUMNS), "units": self.UNITS, "rows": self.rows_written, "row_groups": self._part_rows}
+        with open(os.path.join(self.path, self.SCHEMA_FILE), "w", encoding="utf-8") as schema_file:
+            json.dump(schema, schema_file, indent=2)
+
+
+def iter_columnar(path):
+    """Yields the row groups of a ColumnarExporter directory as dicts of 1-D column arrays."""
+    with open(os.path.join(path, ColumnarExporter.SCHEMA_FILE), encoding="utf-8") as schema_file:
+        schema = json.load(schema_file)
+    for i in range(len(schema["row_groups"])):
+        with np.load(os.path.join(path, f"part_{i:06d}.npz")) as part:
+            yield {name: part[name] for name in schema["columns"]}
+
+
+def open_exporter(path, buffer_rows=None):
+    """Picks the exporter from the path: .csv -> CSV, .npz -> NPZ, anything else -> columnar directory."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return CsvExporter(path, buffer_rows)
+    if extension == ".npz":
+        return NpzExporter(path, buffer_rows)
+    return ColumnarExporter(path, buffer_rows)
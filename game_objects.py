@@ -29,12 +29,13 @@ class Projectile:
         self.current_pos_px = list(new_pos_px)
 
     def draw(self, surface):
-        """Draws the projectile on the given surface."""
+        """Draws the projectile on the given surface. Returns the drawn rect (None if off-screen)."""
         center_x_int = int(self.current_pos_px[0])
         center_y_int = int(self.current_pos_px[1])
         # Basic bounds check before drawing
         if 0 <= center_x_int <= cfg.WIDTH and 0 <= center_y_int <= cfg.HEIGHT:
-            pygame.draw.circle(surface, self.color, (center_x_int, center_y_int), self.radius)
+            return pygame.draw.circle(surface, self.color, (center_x_int, center_y_int), self.radius)
+        return None
 
 
 class Target:
@@ -62,7 +63,7 @@ class Target:
         return [self.pos_px[0] + self.width / 2, self.pos_px[1] + self.height / 2]
 
     def draw(self, surface):
-        """Draws the target box on the given surface."""
+        """Draws the target box on the given surface. Returns the drawn rect."""
         # Update rect position just in case it was changed directly (though set_position is preferred)
         self.rect.topleft = (int(self.pos_px[0]), int(self.pos_px[1]))
-        pygame.draw.rect(surface, self.color, self.rect)
\ No newline at end of file
+        return pygame.draw.rect(surface, self.color, self.rect)
\ No newline at end of file
@@ -0,0 +1,53 @@
+# hittest.py
+# -*- coding: utf-8 -*-
+import pygame
+import config as cfg
+
+
+class HitGrid:
+    """
+    Uniform grid over a fixed set of rects for point hit tests.
+
+    Each rect is listed in every cell it overlaps, so hit() tests only the few rects of the
+    cell under the point instead of scanning all of them. The grid is built once per layout
+    (rebuild()); nothing is recomputed per event. Rects are tested in the order they were
+    given, so earlier rects win where they overlap.
+    """
+
+    def __init__(self, cell_size=None):
+        """
+        Args:
+            cell_size (int): Grid cell edge in pixels (default: cfg.HIT_GRID_CELL_SIZE).
+        """
+        self.cell_size = max(1, int(cell_size or cfg.HIT_GRID_CELL_SIZE))
+        self.rects = {} # Key -> rect, in priority order
+        self._cells = {} # (column, row) -> [(key, rect), ...] in priority order
+
+    def rebuild(self, items):
+        """
+        Replaces the indexed rects.
+
+        Args:
+            items (iterable): (key, rect) pairs in priority order. Empty rects are skipped.
+        """
+        self.rects = {}
+        self._cells = {}
+        cell_size = self.cell_size
+        for key, rect in items:
+            rect = pygame.Rect(rect)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            self.rects[key] = rect
+            for row in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+                for column in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+                    self._cells.setdefault((column, row), []).append((key, rect))
+
+    def hit(self, pos):
+        """Key of the first rect containing pos, or None (also for pos None)."""
+        if pos is None:
+            return None
+        x, y = pos
+        for key, rect in self._cells.get((x // self.cell_size, y // self.cell_size), ()):
+            if rect.collidepoint(x, y):
+                return key
+        return None
@@ -0,0 +1,45 @@
+# horizontal_throw.py
+# -*- coding: utf-8 -*-
+import math
+import config as cfg
+from scenes import Scene
+
+
+class HorizontalThrowScene(Scene):
+    """Horizontal throw ("Yatay Atış"): launched level; the flight time follows from the drop height to the target center."""
+    uses_time_input = False
+    enter_action = "launch"
+    input_label = "Hesaplanan Süre:"
+    input_label_color = cfg.GRAY # Gray out as it's calculated
+    time_label = "Hesap. t"
+    shows_peak = False # Tepe noktası başlangıç noktasıdır, bilgi göstermeyeceğiz
+
+    def solve_launch(self, physics_engine, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        Ignores time_to_target_sec: the time comes from the drop height, V0x from the horizontal distance.
+
+        Drag-free engines give both in closed form. With drag the fall is slower, so the time is
+        searched (secant method, from the drag-free time) until the engine's solver aims level.
+        """
+        delta_y_physics_px = target_center_px[1] - initial_pos_px[1]
+        if delta_y_physics_px <= 0:
+            raise ValueError("Yatay atış mümkün değil! (Hedef merkezi başlangıcın altında olmalı)")
+        gravity_px_s2 = physics_engine.gravity_px_s2
+        time_to_target_sec = math.sqrt(2 * delta_y_physics_px / gravity_px_s2) if gravity_px_s2 > 0 else 0
+        if time_to_target_sec <= 1e-6:
+            return time_to_target_sec, 0, 0.0
+        if physics_engine.has_closed_form:
+            delta_x_px = target_center_px[0] - initial_pos_px[0]
+            return time_to_target_sec, delta_x_px / time_to_target_sec, 0.0
+
+        # f(t) = V0y the engine needs to arrive at time t; level launch where f(t) = 0
+        t_prev, t = time_to_target_sec, time_to_target_sec * 1.1
+        v0y_prev = physics_engine.solve_launch_velocities(initial_pos_px, target_center_px, t_prev)[1]
+        for _ in range(cfg.DRAG_SOLVER_MAX_ITERATIONS):
+            v0x_px_s, v0y_px_s = physics_engine.solve_launch_velocities(initial_pos_px, target_center_px, t)
+            if abs(v0y_px_s) * t <= cfg.DRAG_SOLVER_TOLERANCE_PX: # Launching exactly level moves the end point by less than this
+                return t, v0x_px_s, 0.0
+            if v0y_px_s == v0y_prev:
+                break
+            t_prev, t, v0y_prev = t, max(t - v0y_px_s * (t - t_prev) / (v0y_px_s - v0y_prev), 0.5 * t), v0y_px_s
+        raise ValueError("Hava direnciyle yatay atış çözülemedi!")
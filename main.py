@@ -2,33 +2,44 @@
 # -*- coding: utf-8 -*- # Türkçe karakterler için
 import pygame
 import sys
-import math
 import pygame.font # Font kullanımı için eklendi
 # Import configurations
 import config as cfg
 # Import utility functions
 import utils
-# Import game object classes
-from game_objects import Projectile, Target
-# Import physics engine
-from physics import PhysicsEngine
+# Import headless scene logic
+from simulation import Simulation
+# Import scene registry (scene plugins, loaded on first selection)
+import scenes
+# Import cached trail renderer
+from trail import TrailLayer
 # Import UI manager
 from ui import UIManager
+# Import input recording (cfg.INPUT_RECORD_PATH)
+from replay import InputRecorder
+# Import frame profiler (per-section timers, overlay, JSON trace)
+from profiler import frame_profiler
+# Import scaled window (logical canvas at the internal resolution, scaled to the window)
+from scaling import ScaledDisplay
 
 # --- Game States ---
 SELECTION = 0
 SIMULATION = 1
 
 # --- Pygame Setup (Global) ---
-pygame.init()
-screen = pygame.display.set_mode((cfg.WIDTH, cfg.HEIGHT))
+# Only the subsystems we use: pygame.init() would also start audio, joystick, etc.
+pygame.display.init()
+pygame.font.init()
+display = ScaledDisplay((cfg.WIDTH, cfg.HEIGHT), cfg.WINDOW_SIZE, fullscreen=cfg.FULLSCREEN,
+                        resizable=cfg.WINDOW_RESIZABLE, smooth=cfg.SCALE_SMOOTH)
+screen = display.canvas # Everything is drawn here, in logical (cfg.WIDTH x cfg.HEIGHT) coordinates
 pygame.display.set_caption("Atış Simülasyonu - Sahne Seçin") # Initial caption
 clock = pygame.time.Clock()
 # Define fonts needed globally or in functions
 try:
-    font_medium = pygame.font.Font(None, cfg.FONT_SIZE_MEDIUM)
-    font_small = pygame.font.Font(None, cfg.FONT_SIZE_SMALL)
-    font_large = pygame.font.Font(None, cfg.FONT_SIZE_LARGE) # For selection title
+    font_medium = utils.get_font(cfg.FONT_SIZE_MEDIUM) # Shared with UIManager (utils font registry)
+    font_small = utils.get_font(cfg.FONT_SIZE_SMALL)
+    font_large = utils.get_font(cfg.FONT_SIZE_LARGE) # For selection title
 except Exception as e:
     print(f"Error loading fonts: {e}")
     pygame.quit()
@@ -36,41 +47,22 @@ except Exception as e:
 
 
 # --- Global Simulation Variables (Initialized when scene is selected) ---
-active_scene_name = None
-active_scene_config = None
-projectile = None
-target = None
-physics_engine = None
+simulation = None # Headless scene logic (simulation.Simulation)
 ui_manager = None
-
-# Game state variables (initialized/reset in reset_simulation)
-launch_v0x_px_s = 0.0
-launch_v0y_px_s = 0.0
-current_vx_px_s = 0.0
-current_vy_px_s = 0.0
-simulation_running = False
-simulation_paused = False
-simulation_start_time_sec = 0.0
-time_paused_offset_sec = 0.0
-simulation_speed_multiplier = 1.0
-time_to_target_sec = 2.0 # Default, will be overwritten
-launch_v0x_mps_display = 0.0
-launch_v0y_mps_display = 0.0
-current_t_elapsed_sec = 0.0
-pause_start_time_sec = 0.0 # Track when pause began
-projectile_trail = [] # Mermi iz noktalarını saklamak için liste
-time_last_trail_point_sec = 0.0 # Son iz noktasının eklendiği zaman (efektif simülasyon zamanı)
-# --- Peak Info Variables ---
-peak_time_sec = 0.0          # Tepe noktasına ulaşma süresi
-peak_position_px = None    # Tepe noktasının [x, y] konumu (piksel)
-show_peak_info = False     # Tepe noktası bilgisini gösterme bayrağı
+trail_layer = None # Cached trail drawing for the active simulation
+# Dirty-rect rendering state (cfg.DIRTY_RECT_RENDERING)
+previous_frame_rects = [] # Areas drawn last frame; presented again so their old content is erased
+full_redraw_needed = True # Present the whole window on the next frame
+input_recorder = InputRecorder(cfg.INPUT_RECORD_PATH) if cfg.INPUT_RECORD_PATH else None # Replayable input log
+if cfg.PROFILER_TRACE_PATH:
+    frame_profiler.start_trace(cfg.PROFILER_TRACE_PATH)
 
 # --- Helper Functions ---
 
 def draw_button(surface, text, rect, button_color, text_color, font, border_radius=cfg.BUTTON_BORDER_RADIUS):
     """Draws a button with text."""
     pygame.draw.rect(surface, button_color, rect, border_radius=border_radius)
-    text_surf = font.render(text, True, text_color)
+    text_surf = utils.render_text_cached(font, text, text_color)
     text_rect = text_surf.get_rect(center=rect.center)
     surface.blit(text_surf, text_rect)
 
@@ -80,7 +72,8 @@ def draw_selection_screen(surface):
     button_rects = {}
     button_width = cfg.BUTTON_WIDTH * 1.5 # Make buttons wider for scene names
     button_height = cfg.BUTTON_HEIGHT * 1.2
-    start_y = cfg.HEIGHT // 2 - (len(cfg.SCENES) * (button_height + cfg.SPACING_PX)) // 2
+    scene_names = scenes.scene_names()
+    start_y = cfg.HEIGHT // 2 - (len(scene_names) * (button_height + cfg.SPACING_PX)) // 2
     button_x = (cfg.WIDTH - button_width) // 2
 
     # Draw Title
@@ -90,178 +83,126 @@ def draw_selection_screen(surface):
 
     # Draw Buttons
     current_y = start_y
-    for scene_name in cfg.SCENES.keys():
+    for scene_name in scene_names:
         rect = pygame.Rect(button_x, current_y, button_width, button_height)
         draw_button(surface, scene_name, rect, cfg.BLUE, cfg.WHITE, font_medium)
         button_rects[scene_name] = rect
         current_y += button_height + cfg.SPACING_PX
 
-    pygame.display.flip()
+    display.present()
     return button_rects
 
 def initialize_simulation(scene_name):
     """Initializes all components for the selected simulation scene."""
-    global active_scene_name, active_scene_config, projectile, target
-    global physics_engine, ui_manager, time_to_target_sec
-    global projectile_trail, time_last_trail_point_sec # Trail variables reset here too
-    global peak_time_sec, peak_position_px, show_peak_info # Peak info variables reset here too
+    global simulation, ui_manager, trail_layer, full_redraw_needed
 
-    active_scene_name = scene_name
     try:
-        active_scene_config = cfg.SCENES[active_scene_name]
+        simulation = Simulation(scene_name)
     except KeyError:
-        print(f"Error: Scene '{scene_name}' not found in config.py. Returning to selection.")
+        print(f"Error: Scene '{scene_name}' is not registered or not found in config.py. Returning to selection.")
         return False # Indicate failure
+    if input_recorder:
+        input_recorder.scene(simulation.clock_sec, scene_name)
 
     # --- Initialize Simulation Components ---
-    pygame.display.set_caption(active_scene_config.get("title", "Atış Simülasyonu"))
-    projectile = Projectile(initial_pos_px=list(active_scene_config["initial_projectile_pos"])) # Use list copy
-    target = Target(initial_pos_px=list(active_scene_config["initial_target_pos"])) # Use list copy
-    physics_engine = PhysicsEngine()
-    ui_manager = UIManager(screen, active_scene_config) # Pass scene config to UI
-
-    # --- Specific Initialization for Dikey Atış ---
-    if active_scene_name == "Dikey Atış":
-        # Set target's position to match the projectile's initial position
-        target.set_position(list(projectile.initial_pos_px)) # Use list copy
-        # Adjust target position visually to its center (as it's not drawn)
-        target.set_position([projectile.initial_pos_px[0] - target.width / 2,
-                             projectile.initial_pos_px[1] - target.height / 2])
-
-
-    ui_manager.initialize_sliders(projectile, target) # Initialize sliders based on scene config
-
-    # --- Reset State Variables ---
-    # Set default time from config BEFORE resetting, so reset uses the correct value
-    time_to_target_sec = float(active_scene_config.get("default_time_str", "2.0"))
-    reset_simulation() # Reset all simulation variables and UI state
-
-    # Clear trail and peak info for the new scene explicitly (reset_simulation also does this)
-    projectile_trail.clear()
-    time_last_trail_point_sec = 0.0
-    peak_time_sec = 0.0
-    peak_position_px = None
-    show_peak_info = False
+    pygame.display.set_caption(simulation.scene_config.get("title", "Atış Simülasyonu"))
+    ui_manager = UIManager(screen, simulation.scene) # Pass scene to UI
+    trail_layer = TrailLayer(simulation.projectile_trail, screen.get_size())
+    full_redraw_needed = True
 
+    reset_simulation() # Reset all simulation variables and UI state
     return True # Indicate success
 
 # --- Simulation Helper Functions (Need access to global simulation variables) ---
 
-def update_positions_from_sliders():
-    """Updates initial projectile and target positions based on active sliders."""
-    # Ensure components are initialized
-    if not ui_manager or not projectile or not target or not active_scene_config:
-        return
-
-    sliders = ui_manager.sliders
-    sliders_enabled = active_scene_config.get("sliders_enabled", []) # Get enabled sliders for scene
-
-    drawable_height = cfg.DRAWABLE_HEIGHT
-    y_offset = cfg.DRAWABLE_Y_OFFSET
-
-    # Calculate current positions BEFORE calculating ranges
-    current_proj_x = projectile.initial_pos_px[0]
-    current_proj_y = projectile.initial_pos_px[1]
-    current_target_x = target.pos_px[0]
-    current_target_y = target.pos_px[1]
-
-    # Calculate Ranges
-    circle_range_x = cfg.WIDTH - 2 * projectile.radius
-    circle_range_y = drawable_height - 2 * projectile.radius
-    box_range_x = cfg.WIDTH - target.width
-    box_range_y = drawable_height - target.height
-
-    # Update Positions based on ENABLED sliders
-    new_proj_x = current_proj_x
-    new_proj_y = current_proj_y
-    new_target_x = current_target_x
-    new_target_y = current_target_y
-
-    if "circle_x" in sliders_enabled and "circle_x" in sliders:
-        # Check range to avoid division by zero if width is too small
-        new_proj_x = projectile.radius + sliders.get("circle_x", 0.5) * circle_range_x if circle_range_x > 0 else projectile.radius
-    if "circle_y" in sliders_enabled and "circle_y" in sliders:
-        # Check range to avoid division by zero
-        new_proj_y = y_offset + projectile.radius + sliders.get("circle_y", 0.5) * circle_range_y if circle_range_y > 0 else y_offset + projectile.radius
-    if "box_x" in sliders_enabled and "box_x" in sliders:
-        new_target_x = sliders.get("box_x", 0.5) * box_range_x if box_range_x > 0 else 0
-    if "box_y" in sliders_enabled and "box_y" in sliders:
-        new_target_y = y_offset + sliders.get("box_y", 0.5) * box_range_y if box_range_y > 0 else y_offset # Box Y maps like circle Y
-
-
-    # Apply updates
-    projectile.set_initial_position([new_proj_x, new_proj_y])
-
-    # --- Special handling for Dikey Atış target position ---
-    if active_scene_name == "Dikey Atış":
-        # Target always mirrors projectile's initial position (centered)
-        target.set_position([new_proj_x - target.width / 2, new_proj_y - target.height / 2])
-    else:
-        target.set_position([new_target_x, new_target_y])
-
-
-    # If sim not running, ensure current projectile pos is reset
-    if not simulation_running:
-        projectile.reset_to_initial()
+def reset_ui_vector_toggles():
+    """Resets vector display toggles in UI Manager to defaults."""
+    ui_manager.show_vectors = True
+    ui_manager.show_velocity_vector = False
+    ui_manager.show_acceleration_vector = False
 
 def reset_simulation():
     """Resets the simulation state and UI elements for the current scene."""
-    global simulation_running, launch_v0x_px_s, launch_v0y_px_s, current_vx_px_s, current_vy_px_s
-    global launch_v0x_mps_display, launch_v0y_mps_display, current_t_elapsed_sec
-    global simulation_paused, time_paused_offset_sec, time_to_target_sec
-    global projectile_trail, time_last_trail_point_sec
-    global peak_time_sec, peak_position_px, show_peak_info # <--- TEPE NOKTASI DEĞİŞKENLERİNİ EKLE
-
     # Ensure components are initialized
-    if not ui_manager or not projectile or not target or not active_scene_config:
+    if not ui_manager or not simulation:
         print("Warning: reset_simulation called before initialization.")
         return
 
-    # Reset simulation state
-    simulation_running = False
-    simulation_paused = False
-    time_paused_offset_sec = 0.0
-    launch_v0x_px_s = 0.0
-    launch_v0y_px_s = 0.0
-    current_vx_px_s = 0.0
-    current_vy_px_s = 0.0
-    launch_v0x_mps_display = 0.0
-    launch_v0y_mps_display = 0.0
-    current_t_elapsed_sec = 0.0
+    simulation.reset() # Launch state, trail and peak info
 
     # Reset UI input/state using the active scene's default time
-    default_time_str = active_scene_config.get("default_time_str", "2.0")
+    default_time_str = simulation.scene_config.get("default_time_str", "2.0")
     ui_manager.time_to_target_str = default_time_str
     ui_manager.input_error = False
     ui_manager.error_message = None # Clear error message on reset
     try:
-        time_to_target_sec = float(default_time_str) # Reset validated time
+        float(default_time_str)
     except ValueError:
-        time_to_target_sec = 2.0 # Fallback default
         ui_manager.time_to_target_str = "2.0"
 
-
-    # Reset vector display toggles in UI Manager to defaults
-    ui_manager.show_vectors = True
-    ui_manager.show_velocity_vector = False
-    ui_manager.show_acceleration_vector = False
+    reset_ui_vector_toggles()
 
     # Reset object positions based on sliders (or initial scene config if sliders absent)
-    # Need to re-initialize sliders if they weren't before calling reset
-    if ui_manager: # Only if ui_manager exists
-        ui_manager.initialize_sliders(projectile, target)
-    update_positions_from_sliders() # This will set initial positions based on sliders/defaults
-    if projectile: # Only if projectile exists
-        projectile.reset_to_initial() # Ensure projectile is at its *initial* pos
-
-    # Clear the projectile trail
-    projectile_trail.clear() # <--- İZİ TEMİZLE
-    time_last_trail_point_sec = 0.0 # <--- ZAMANLAYICIYI SIFIRLA
-
-    # Reset peak info
-    peak_time_sec = 0.0         # <--- TEPE SÜRESİNİ SIFIRLA
-    peak_position_px = None   # <--- TEPE KONUMUNU SIFIRLA
-    show_peak_info = False    # <--- GÖSTERME BAYRAĞINI SIFIRLA
+    ui_manager.initialize_sliders(simulation.projectile, simulation.target)
+    simulation.update_positions_from_sliders(ui_manager.sliders)
+    simulation.projectile.reset_to_initial() # Ensure projectile is at its *initial* pos
+    if input_recorder:
+        input_recorder.reset(simulation.clock_sec, ui_manager.sliders)
+
+def record_action(action, **payload):
+    """Logs a UI action applied to the simulation (when input recording is enabled)."""
+    if input_recorder:
+        input_recorder.action(simulation.clock_sec, action, **payload)
+
+def return_to_selection():
+    """Releases the simulation components and switches back to the scene selection screen."""
+    global game_state, selection_buttons, simulation, ui_manager, trail_layer
+    game_state = SELECTION
+    selection_buttons = {} # Force redraw of selection screen
+    pygame.display.set_caption("Atış Simülasyonu - Sahne Seçin")
+    simulation = None # İz ve tepe bilgisi simülasyonla birlikte gider
+    ui_manager = None
+    trail_layer = None
+
+def is_idle():
+    """True when nothing on screen can change without user input (no flight in progress, no slider drag)."""
+    if game_state == SELECTION:
+        return bool(selection_buttons) # Idle once the selection screen has been drawn
+    if not simulation or not ui_manager or full_redraw_needed:
+        return False
+    flight_in_progress = (simulation.simulation_running or simulation.swarm_active) and not simulation.simulation_paused
+    return not flight_in_progress and ui_manager.dragging_slider is None
+
+def get_frame_events():
+    """
+    Returns this frame's events. While idle, sleeps in pygame.event.wait until an event
+    arrives (or the timeout passes) instead of polling 60 times a second.
+    """
+    if cfg.IDLE_EVENT_WAIT_ENABLED and is_idle():
+        event = pygame.event.wait(cfg.IDLE_EVENT_WAIT_TIMEOUT_MS)
+        if event.type == pygame.NOEVENT:
+            return [] # Timed out, run one (quiet) frame
+        return prepare_events([event] + pygame.event.get())
+    return prepare_events(pygame.event.get())
+
+def prepare_events(events):
+    """
+    Applies window resizes and the fullscreen key (F11), which need a full redraw, and maps
+    mouse positions of the other events from the window to the logical canvas.
+    """
+    global full_redraw_needed, selection_buttons
+    prepared = []
+    for event in events:
+        if event.type == pygame.VIDEORESIZE:
+            display.resize()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+            display.toggle_fullscreen()
+        else:
+            prepared.append(display.map_event(event))
+            continue
+        full_redraw_needed = True
+        selection_buttons = {} # Redraw the selection screen too
+    return prepared
 
 # --- Main Loop ---
 running = True
@@ -269,7 +210,10 @@ game_state = SELECTION # Start in selection mode
 selection_buttons = {} # To store button rects
 
 while running:
-    current_time_sec_abs = pygame.time.get_ticks() / 1000.0
+    frame_profiler.begin_frame()
+    with frame_profiler.section("input_wait"):
+        frame_events = get_frame_events()
+    current_time_sec_abs = pygame.time.get_ticks() / 1000.0 # After waiting, so a launch starts from "now"
 
     # --- State Machine ---
     if game_state == SELECTION:
@@ -277,7 +221,7 @@ while running:
         if not selection_buttons: # Draw only once unless needed again
              selection_buttons = draw_selection_screen(screen)
 
-        for event in pygame.event.get():
+        for event in frame_events:
             if event.type == pygame.QUIT:
                 running = False; break
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -300,384 +244,194 @@ while running:
         # --- Simulation Logic ---
 
         # Ensure components are loaded (safety check)
-        if not ui_manager or not projectile or not target or not physics_engine or not active_scene_config:
+        if not ui_manager or not simulation or not trail_layer:
              print("Error: Simulation components not initialized. Returning to selection.")
-             game_state = SELECTION
-             selection_buttons = {}
-             pygame.display.set_caption("Atış Simülasyonu - Sahne Seçin")
-             projectile_trail.clear() # Clear trail when returning to menu due to error
-             time_last_trail_point_sec = 0.0
-             peak_time_sec = 0.0         # Clear peak info on error return
-             peak_position_px = None
-             show_peak_info = False
+             return_to_selection()
              continue # Skip rest of the loop iteration
 
+        simulation.set_clock(current_time_sec_abs)
+
         # --- Event Handling (Simulation) ---
         action_from_ui = None
         back_to_menu_requested = False # Flag for returning to menu
+        had_events = False # Any input this frame (otherwise an idle frame may be skipped)
 
-        for event in pygame.event.get():
+        events_start = frame_profiler.start()
+        for event in frame_events:
+            had_events = True
             if event.type == pygame.QUIT:
                 running = False; break
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                full_redraw_needed = True # Window contents were lost
 
             # Check for ESC key press to go back
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     back_to_menu_requested = True
                     break # Exit event loop immediately
+                if event.key == pygame.K_F3: # Profiler overlay
+                    frame_profiler.set_overlay(not frame_profiler.overlay_visible)
+                    full_redraw_needed = True
+                # Timeline keys (not while typing into the time box): step frame by frame, reverse playback
+                if not ui_manager.input_active:
+                    if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                        frames = -1 if event.key == pygame.K_LEFT else 1
+                        record_action("step_frame", frames=frames)
+                        simulation.step_frame(frames)
+                    elif event.key == pygame.K_r:
+                        record_action("toggle_reverse")
+                        simulation.toggle_reverse()
+                    elif event.key == pygame.K_v and simulation.swarm is not None: # Swarm volley at the target
+                        record_action("volley")
+                        ui_manager.error_message = simulation.launch_volley()
 
             # Let UI Manager handle its events (buttons, sliders, input)
-            action_from_ui = ui_manager.handle_event(event, simulation_running, simulation_paused)
+            action_from_ui = ui_manager.handle_event(event, simulation.simulation_running, simulation.simulation_paused)
 
             # Check if the UI manager itself triggered the back action
             if action_from_ui == "back_to_menu":
                 back_to_menu_requested = True
                 break # Exit event loop immediately
 
-            # If UI handled an event, we might not need to process further in this loop
-            # (Depends on the specific action)
-            if action_from_ui and action_from_ui != "update_slider": # Allow slider updates to fall through
-                 pass # Continue processing other events or simulation logic
-
         if not running: break
 
         # Handle request to return to menu (from ESC or Back button)
         if back_to_menu_requested:
-            game_state = SELECTION
-            selection_buttons = {} # Force redraw of selection screen
-            pygame.display.set_caption("Atış Simülasyonu - Sahne Seçin")
-            # Reset simulation variables to None to release resources (optional but good practice)
-            projectile = None
-            target = None
-            physics_engine = None
-            ui_manager = None
-            active_scene_name = None
-            active_scene_config = None
-            projectile_trail.clear() # <--- MENÜYE DÖNERKEN İZİ TEMİZLE
-            time_last_trail_point_sec = 0.0 # <--- ZAMANLAYICIYI SIFIRLA
-            # Reset peak info when returning to menu
-            peak_time_sec = 0.0         # <--- TEPE SÜRESİNİ SIFIRLA
-            peak_position_px = None   # <--- TEPE KONUMUNU SIFIRLA
-            show_peak_info = False    # <--- GÖSTERME BAYRAĞINI SIFIRLA
+            return_to_selection()
             continue # Skip the rest of the simulation logic for this frame
 
         # --- Process Actions from UI (Simulation) ---
         if action_from_ui == "launch":
-            projectile_trail.clear() # <--- FIRLATMADAN ÖNCE ESKİ İZİ TEMİZLE
-            time_last_trail_point_sec = 0.0 # <--- ZAMANLAYICIYI SIFIRLA
-            show_peak_info = False # Yeni fırlatmada tepe bilgisi gösterilmez
-            peak_time_sec = 0.0    # Reset peak values before calculation
-            peak_position_px = None
             ui_manager.error_message = None # Clear previous errors
+            simulation.update_positions_from_sliders(ui_manager.sliders) # Ensure start pos is current
+
+            if not simulation.scene.uses_time_input:
+                # Süre sahne tarafından hesaplanır (ör. yatay atış), kullanıcı girişi kullanılmaz
+                record_action("launch", sliders=ui_manager.sliders)
+                launch_error = simulation.launch()
+                ui_manager.input_error = launch_error is not None
+                ui_manager.error_message = launch_error
+                if launch_error is None:
+                    ui_manager.time_to_target_str = f"{simulation.time_to_target_sec:.2f}"
+            else:
+                launch_time_sec = ui_manager.validate_time_input() # None (invalid input) only clears trail
+                record_action("launch", sliders=ui_manager.sliders, time_sec=launch_time_sec)
+                simulation.launch(launch_time_sec)
 
-            # --- Vertical Launch ("Dikey Atış") Specific Logic ---
-            if active_scene_name == "Dikey Atış":
-                valid_time = ui_manager.validate_time_input()
-                if valid_time is not None:
-                    time_to_target_sec = valid_time # This is total round-trip time
-                    simulation_running = False # Ensure reset
-                    simulation_paused = False
-                    time_paused_offset_sec = 0.0
-                    current_t_elapsed_sec = 0.0
-                    update_positions_from_sliders() # Ensure start pos is current
-                    projectile.reset_to_initial()
-                    ui_manager.show_vectors = True
-                    ui_manager.show_velocity_vector = False
-                    ui_manager.show_acceleration_vector = False
-
-                    # Calculate V0y needed to return in time_to_target_sec
-                    t_peak = time_to_target_sec / 2.0
-                    gravity_px_s2 = physics_engine.gravity_px_s2
-                    v0y_physics_px_s = gravity_px_s2 * t_peak
-                    launch_v0y_px_s = -v0y_physics_px_s
-                    launch_v0x_px_s = 0.0 # No horizontal velocity
-
-                    launch_v0x_mps_display = 0.0
-                    launch_v0y_mps_display = utils.px_s_to_mps(-launch_v0y_px_s)
-
-                    simulation_running = True
-                    simulation_start_time_sec = current_time_sec_abs
-                    current_vx_px_s = launch_v0x_px_s
-                    current_vy_px_s = launch_v0y_px_s
-
-                    # --- Calculate and Store Peak Info (Dikey Atış) ---
-                    if physics_engine.gravity_px_s2 > 0:
-                        v0y_physics = -launch_v0y_px_s # Physics coords (up positive)
-                        if v0y_physics > 1e-6: # Only if launched upwards (check against small threshold)
-                            peak_time_sec = v0y_physics / physics_engine.gravity_px_s2
-                            peak_position_px, _ = physics_engine.calculate_kinematic_update(
-                                projectile.initial_pos_px, launch_v0x_px_s, launch_v0y_px_s, peak_time_sec
-                            )
-                        else: # Launched downwards or V0y=0
-                            peak_time_sec = 0.0
-                            peak_position_px = list(projectile.initial_pos_px)
-                    # --- End Peak Info Calculation ---
-
-
-            # --- Horizontal Launch ("Yatay Atış") Specific Logic ---
-            elif active_scene_name == "Yatay Atış":
-                update_positions_from_sliders() # Ensure positions are based on current slider values
-                initial_y_proj = projectile.initial_pos_px[1]
-                target_y_for_calc = target.center_pos_px[1]
-
-                if initial_y_proj >= target_y_for_calc:
-                    ui_manager.input_error = True
-                    ui_manager.error_message = "Yatay atış mümkün değil! (Hedef merkezi başlangıcın altında olmalı)"
-                    time_to_target_sec = 0
-                else:
-                    ui_manager.input_error = False
-                    ui_manager.error_message = None
-                    delta_y_physics_px = target_y_for_calc - initial_y_proj
-                    gravity_px_s2 = physics_engine.gravity_px_s2
-
-                    if gravity_px_s2 > 0 and delta_y_physics_px > 0:
-                        try:
-                            time_to_target_sec = math.sqrt(2 * delta_y_physics_px / gravity_px_s2)
-                        except ValueError:
-                            time_to_target_sec = 0
-                    else:
-                        time_to_target_sec = 0
-
-                    ui_manager.time_to_target_str = f"{time_to_target_sec:.2f}"
-
-                    delta_x_px = target.center_pos_px[0] - projectile.initial_pos_px[0]
-                    if time_to_target_sec > 1e-6:
-                        launch_v0x_px_s = delta_x_px / time_to_target_sec
-                    else:
-                        launch_v0x_px_s = 0
-
-                    launch_v0y_px_s = 0.0
-                    launch_v0x_mps_display = utils.px_s_to_mps(launch_v0x_px_s)
-                    launch_v0y_mps_display = 0.0
-
-                    if time_to_target_sec > 1e-6:
-                        simulation_running = False
-                        simulation_paused = False
-                        time_paused_offset_sec = 0.0
-                        current_t_elapsed_sec = 0.0
-                        projectile.reset_to_initial()
-                        ui_manager.show_vectors = True
-                        ui_manager.show_velocity_vector = False
-                        ui_manager.show_acceleration_vector = False
-                        simulation_running = True
-                        simulation_start_time_sec = current_time_sec_abs
-                        current_vx_px_s = launch_v0x_px_s
-                        current_vy_px_s = launch_v0y_px_s
-                    else:
-                        simulation_running = False
-                        simulation_paused = False
-                        current_t_elapsed_sec = 0.0
-                        current_vx_px_s = launch_v0x_px_s
-                        current_vy_px_s = launch_v0y_px_s
-
-                # Yatay atışta tepe noktası başlangıç noktasıdır, bilgi göstermeyeceğiz
-                peak_time_sec = 0.0
-                peak_position_px = list(projectile.initial_pos_px) if projectile else None
-                show_peak_info = False # Yatay atışta gösterme
-
-
-            # --- Default Launch Logic (Other Scenes like Eğik Atış) ---
-            else: # Eğik Atış ve diğerleri
-                valid_time = ui_manager.validate_time_input()
-                if valid_time is not None:
-                    time_to_target_sec = valid_time
-                    simulation_running = False # Ensure reset
-                    simulation_paused = False
-                    time_paused_offset_sec = 0.0
-                    current_t_elapsed_sec = 0.0
-                    update_positions_from_sliders()
-                    projectile.reset_to_initial()
-                    ui_manager.show_vectors = True # Reset vector views
-                    ui_manager.show_velocity_vector = False
-                    ui_manager.show_acceleration_vector = False
-
-                    launch_v0x_px_s, launch_v0y_px_s = physics_engine.calculate_required_velocities(
-                        projectile.initial_pos_px, target.center_pos_px, time_to_target_sec
-                    )
-                    launch_v0x_mps_display = utils.px_s_to_mps(launch_v0x_px_s)
-                    launch_v0y_mps_display = utils.px_s_to_mps(-launch_v0y_px_s) # Y is inverted for display
-
-                    simulation_running = True
-                    simulation_start_time_sec = current_time_sec_abs
-                    current_vx_px_s = launch_v0x_px_s
-                    current_vy_px_s = launch_v0y_px_s
-
-                    # --- Calculate and Store Peak Info (Eğik Atış) ---
-                    if physics_engine.gravity_px_s2 > 0:
-                        v0y_physics = -launch_v0y_px_s # Physics coords (up positive)
-                        if v0y_physics > 1e-6: # Only if launched upwards effectively (check threshold)
-                            peak_time_sec = v0y_physics / physics_engine.gravity_px_s2
-                            peak_position_px, _ = physics_engine.calculate_kinematic_update(
-                                projectile.initial_pos_px, launch_v0x_px_s, launch_v0y_px_s, peak_time_sec
-                            )
-                        else: # Launched downwards or horizontally (V0y <= 0)
-                             peak_time_sec = 0.0
-                             peak_position_px = list(projectile.initial_pos_px)
-                    # --- End Peak Info Calculation ---
-
+            if simulation.simulation_running:
+                reset_ui_vector_toggles() # Reset vector views for the new launch
 
         elif action_from_ui == "reset":
             reset_simulation() # Resets state and positions for the *current* scene
         elif action_from_ui == "pause_toggle":
-            simulation_paused = not simulation_paused
-            if simulation_paused:
-                 pause_start_time_sec = current_time_sec_abs
-            else: # Resuming
-                time_paused_duration = current_time_sec_abs - pause_start_time_sec
-                time_paused_offset_sec += time_paused_duration
+            record_action(action_from_ui)
+            simulation.toggle_pause()
         elif action_from_ui == "speed_down":
-            simulation_speed_multiplier = max(0.1, round(simulation_speed_multiplier - 0.1, 1))
+            record_action(action_from_ui)
+            simulation.speed_down()
         elif action_from_ui == "speed_up":
-            simulation_speed_multiplier = min(5.0, round(simulation_speed_multiplier + 0.1, 1))
+            record_action(action_from_ui)
+            simulation.speed_up()
         elif action_from_ui == "update_slider":
-             if not simulation_running:
-                 update_positions_from_sliders()
+             record_action(action_from_ui, sliders=ui_manager.sliders)
+             if not simulation.simulation_running:
+                 simulation.update_positions_from_sliders(ui_manager.sliders)
         elif action_from_ui == "validate_time":
-            if active_scene_name != "Yatay Atış" and active_scene_name != "Dikey Atış":
+            if simulation.scene.uses_time_input:
                 valid_time = ui_manager.validate_time_input()
-                if valid_time is not None: time_to_target_sec = valid_time
-
-        # --- Simulation Update (Physics Calculation) ---
-        effective_t_for_physics = 0.0 # Initialize effective time
-        if simulation_running or current_t_elapsed_sec > 0:
-            if simulation_paused:
-                effective_t_for_physics = current_t_elapsed_sec * simulation_speed_multiplier
-            elif not simulation_running and current_t_elapsed_sec > 0 :
-                effective_t_for_physics = current_t_elapsed_sec * simulation_speed_multiplier
-            else: # Running and not paused
-                 t_elapsed_actual = (current_time_sec_abs - simulation_start_time_sec) - time_paused_offset_sec
-                 effective_t_for_physics = t_elapsed_actual * simulation_speed_multiplier
-                 current_t_elapsed_sec = t_elapsed_actual
-
-            _, current_v_px_s = physics_engine.calculate_kinematic_update(
-                 projectile.initial_pos_px, launch_v0x_px_s, launch_v0y_px_s, effective_t_for_physics)
-            current_vx_px_s, current_vy_px_s = current_v_px_s
-        else: # Before first launch or after reset
-             current_vx_px_s, current_vy_px_s = 0.0, 0.0
-
-
-        # --- Update Projectile Position ---
-        if simulation_running and not simulation_paused:
-            t_elapsed_effective = effective_t_for_physics # Use already calculated effective time
-
-            if time_to_target_sec > 0 and t_elapsed_effective >= time_to_target_sec:
-                # Target Time Reached
-                t_final_effective = time_to_target_sec
-                current_t_elapsed_sec = time_to_target_sec / simulation_speed_multiplier if simulation_speed_multiplier > 0 else 0
-
-                if active_scene_name == "Dikey Atış":
-                    new_projectile_pos, _ = physics_engine.calculate_kinematic_update(
-                        projectile.initial_pos_px, launch_v0x_px_s, launch_v0y_px_s, t_final_effective)
-                    new_projectile_pos = [new_projectile_pos[0], projectile.initial_pos_px[1]]
-                else:
-                     new_projectile_pos, _ = physics_engine.calculate_kinematic_update(
-                         projectile.initial_pos_px, launch_v0x_px_s, launch_v0y_px_s, t_final_effective)
-
-                projectile.update_position(list(new_projectile_pos))
-                simulation_running = False # Stop the simulation state
-
-                # --- Set flag to show peak info AFTER simulation ends (if applicable scene) ---
-                if active_scene_name == "Eğik Atış" or active_scene_name == "Dikey Atış":
-                    if cfg.PEAK_DOT_ENABLED and peak_position_px is not None: # Check if enabled and calculated
-                        show_peak_info = True # Sadece sim bittiğinde göster
-
-                # --- Add final point to trail if enabled ---
-                if cfg.TRAIL_ENABLED and projectile:
-                    if not projectile_trail or (projectile_trail and projectile_trail[-1] != projectile.current_pos_px):
-                        projectile_trail.append(list(projectile.current_pos_px))
-                        if len(projectile_trail) > cfg.MAX_TRAIL_POINTS:
-                            projectile_trail.pop(0)
-
-            else:
-                # Simulation In Progress
-                new_projectile_pos, _ = physics_engine.calculate_kinematic_update(
-                    projectile.initial_pos_px, launch_v0x_px_s, launch_v0y_px_s, t_elapsed_effective)
-                projectile.update_position(new_projectile_pos)
-
-                # --- Add point to trail if enabled and interval passed ---
-                if cfg.TRAIL_ENABLED and projectile:
-                    if t_elapsed_effective >= time_last_trail_point_sec + cfg.TRAIL_POINT_INTERVAL_SEC:
-                        projectile_trail.append(list(projectile.current_pos_px))
-                        time_last_trail_point_sec = t_elapsed_effective
-                        if len(projectile_trail) > cfg.MAX_TRAIL_POINTS:
-                            projectile_trail.pop(0)
-
-
-        # --- Prepare Game State for UI ---
-        display_t_elapsed = 0.0
-        if time_to_target_sec > 0 and simulation_speed_multiplier > 0:
-             display_t_elapsed = min(current_t_elapsed_sec, time_to_target_sec / simulation_speed_multiplier)
-        elif current_t_elapsed_sec > 0:
-             display_t_elapsed = current_t_elapsed_sec
-
-
-        game_state_for_ui = {
-            'projectile': projectile, 'target': target,
-            'simulation_running': simulation_running, 'simulation_paused': simulation_paused,
-            'simulation_speed_multiplier': simulation_speed_multiplier,
-            'time_to_target_sec': time_to_target_sec,
-            'current_t_elapsed_sec': display_t_elapsed,
-            'launch_v0x_px_s': launch_v0x_px_s, 'launch_v0y_px_s': launch_v0y_px_s,
-            'launch_v0x_mps_display': launch_v0x_mps_display, 'launch_v0y_mps_display': launch_v0y_mps_display,
-            'current_vx_px_s': current_vx_px_s, 'current_vy_px_s': current_vy_px_s,
-            'scene_title': active_scene_config.get("title", ""),
-            'active_scene_name': active_scene_name
-        }
+                if valid_time is not None:
+                    record_action(action_from_ui, time_sec=valid_time)
+                    simulation.set_time_to_target(valid_time)
+        frame_profiler.stop("events", events_start) # Event loop and the actions it triggered
+
+        # --- Simulation Update (Physics, Trail, End of Flight) ---
+        simulation_active = simulation.simulation_running or simulation.swarm_active # Also true on the frame the flight finishes
+        if input_recorder:
+            input_recorder.frame(simulation.clock_sec)
+        with frame_profiler.section("physics"):
+            simulation.update()
+
+        # Dirty-rect mode: nothing moved and no input -> the window already shows this frame
+        if cfg.DIRTY_RECT_RENDERING and not (had_events or simulation_active or full_redraw_needed):
+            with frame_profiler.section("tick"):
+                clock.tick(60)
+            continue
 
         # --- Drawing (Simulation) ---
-        ui_manager.draw_all(game_state_for_ui) # Draw UI elements (including background, buttons, text)
+        with frame_profiler.section("ui.draw_all"):
+            ui_manager.draw_all(simulation.get_game_state()) # Draw UI elements (including background, buttons, text)
+        frame_rects = list(ui_manager.dirty_rects)
+
+        projectile = simulation.projectile
 
         # --- Draw Projectile Trail ---
         if cfg.TRAIL_ENABLED:
-            for point_pos in projectile_trail:
-                try:
-                    pygame.draw.circle(screen, cfg.TRAIL_POINT_COLOR, (int(point_pos[0]), int(point_pos[1])), cfg.TRAIL_POINT_RADIUS)
-                except (IndexError, ValueError, TypeError):
-                    pass
+            with frame_profiler.section("trail"):
+                frame_rects.append(trail_layer.draw(screen)) # New points are stamped once, then the layer is blitted
 
 
         # --- Draw Peak Height Info (if enabled, finished, and applicable scene) ---
-        if show_peak_info and peak_position_px and projectile: # Check flag and if data exists
+        peak_position_px = simulation.peak_position_px
+        if simulation.show_peak_info and peak_position_px: # Check flag and if data exists
             try:
                 # Draw the dot at peak position
                 peak_x_draw = int(peak_position_px[0])
                 peak_y_draw = int(peak_position_px[1])
-                pygame.draw.circle(screen, cfg.PEAK_DOT_COLOR, (peak_x_draw, peak_y_draw), cfg.PEAK_DOT_RADIUS)
+                frame_rects.append(pygame.draw.circle(screen, cfg.PEAK_DOT_COLOR, (peak_x_draw, peak_y_draw), cfg.PEAK_DOT_RADIUS))
 
                 # Calculate peak height relative to start in meters
                 peak_height_rel_px = projectile.initial_pos_px[1] - peak_position_px[1] # Pygame Y (down positive)
                 peak_height_rel_m = utils.px_to_m(peak_height_rel_px)
 
                 # Prepare text
-                peak_text = f"Maks Y: {peak_height_rel_m:.2f}m ({peak_time_sec:.2f}s)"
+                peak_text = f"Maks Y: {peak_height_rel_m:.2f}m ({simulation.peak_time_sec:.2f}s)"
 
                 # Draw text near the dot
                 text_x = peak_x_draw + cfg.PEAK_TEXT_OFFSET_X
                 text_y = peak_y_draw + cfg.PEAK_TEXT_OFFSET_Y
                 # Ensure font_small is loaded before using it here
                 if font_small:
-                    utils.draw_text(peak_text, font_small, cfg.PEAK_TEXT_COLOR, screen, text_x, text_y)
+                    frame_rects.append(utils.draw_text(peak_text, font_small, cfg.PEAK_TEXT_COLOR, screen, text_x, text_y, volatile=True))
                 else:
                     print("Error: font_small not loaded, cannot draw peak text.")
 
 
             except (TypeError, IndexError, AttributeError, ValueError) as e: # Added ValueError
                 print(f"Error drawing peak info: {e}") # Hata ayıklama için
-                show_peak_info = False # Hata olursa tekrar çizmeye çalışma
+                simulation.show_peak_info = False # Hata olursa tekrar çizmeye çalışma
 
 
-        # Draw target only if it's NOT the "Dikey Atış" scene
-        if active_scene_name != "Dikey Atış":
-            target.draw(screen)                   # Draw target
+        # Draw target only if the scene shows it (not in "Dikey Atış")
+        if simulation.scene.draws_target:
+            frame_rects.append(simulation.target.draw(screen)) # Draw target
 
-        if projectile: # Ensure projectile exists before drawing
-            projectile.draw(screen)               # Draw projectile (on top of trail and peak dot)
+        frame_rects.append(projectile.draw(screen)) # Draw projectile (on top of trail and peak dot)
+        if simulation.swarm is not None:
+            with frame_profiler.section("swarm"):
+                frame_rects.append(simulation.swarm.draw(screen)) # All swarm projectiles in one blits call
 
-        pygame.display.flip()
+        frame_rects.append(frame_profiler.draw_overlay(screen, font_small)) # Topmost; None while hidden
+
+        # --- Present ---
+        frame_rects = [rect for rect in frame_rects if rect] # Drop "nothing drawn" results
+        with frame_profiler.section("present"):
+            if cfg.DIRTY_RECT_RENDERING and not full_redraw_needed and not ui_manager.static_layer_rebuilt:
+                display.present(frame_rects + previous_frame_rects) # Old areas too, to erase what moved away
+            else:
+                # Full frame: the static layer's scaled copy is cached, only what is drawn over it is scaled
+                drawn_rects = frame_rects + [trail_layer.bounds] if cfg.TRAIL_ENABLED and trail_layer.bounds else frame_rects
+                display.present(drawn_rects, background=ui_manager.static_layer)
+        previous_frame_rects = frame_rects
+        full_redraw_needed = False
 
     # --- Common ---
-    clock.tick(60)
+    with frame_profiler.section("tick"):
+        clock.tick(60)
+    frame_profiler.end_frame()
 
 # --- Cleanup ---
+if input_recorder:
+    input_recorder.close()
+frame_profiler.stop_trace()
 pygame.quit()
 sys.exit()
\ No newline at end of file
@@ -1,10 +1,13 @@
 # physics.py
 import config as cfg
 import math
+import numpy as np
 
 class PhysicsEngine:
     """Handles projectile motion calculations."""
 
+    has_closed_form = True # Motion, events and launch velocities are exact formulas (False: integrated numerically)
+
     def __init__(self):
         self.gravity_px_s2 = cfg.GRAVITY_PX_PER_SEC2
 
@@ -47,6 +50,24 @@ class PhysicsEngine:
 
         return v0x_px_s, v0y_px_s
 
+    def solve_launch_velocities(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        Launch velocities that make this engine's trajectory reach the target center in the
+        given time. Launches aim through this hook, so engines with other motion (air drag)
+        override it; here it is the drag-free calculate_required_velocities.
+
+        Returns:
+            tuple: (v0x_px_s, v0y_px_s) in pixels/sec (Pygame coords).
+
+        Raises:
+            ValueError: If no launch reaches the target (message shown to the user).
+        """
+        return self.calculate_required_velocities(initial_pos_px, target_center_px, time_to_target_sec)
+
+    def solve_launch_velocities_batch(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """Vectorized solve_launch_velocities (arguments and return as in calculate_required_velocities_batch)."""
+        return self.calculate_required_velocities_batch(initial_pos_px, target_center_px, time_to_target_sec)
+
     def calculate_kinematic_update(self, initial_pos_px, v0x_px_s, v0y_px_s, t_elapsed_effective):
         """
         Calculates the projectile's position and velocity at a given effective time.
@@ -71,4 +92,197 @@ class PhysicsEngine:
         vx = v0x_px_s
         vy = v0y_px_s + self.gravity_px_s2 * t_elapsed_effective
 
-        return [pos_x, pos_y], [vx, vy]
\ No newline at end of file
+        return [pos_x, pos_y], [vx, vy]
+
+    def calculate_kinematic_batch(self, initial_pos_px, v0_px_s, t_elapsed_effective):
+        """
+        Vectorized version of calculate_kinematic_update for many launches and/or times at once.
+
+        Inputs are broadcast against each other with NumPy rules, so a single launch can be
+        evaluated over a whole time grid, or many launches at one (or per-launch) time.
+
+        Args:
+            initial_pos_px (array_like): Starting [x, y] positions in pixels, shape (..., 2).
+            v0_px_s (array_like): Initial [vx, vy] velocities in pixels/sec (Pygame coords), shape (..., 2).
+            t_elapsed_effective (array_like): Effective elapsed simulation times in seconds, shape (...).
+
+        Returns:
+            tuple: (pos_px, v_px_s) float64 arrays of shape (..., 2) holding the
+                   [x, y] positions and [vx, vy] velocities in pixels and pixels/sec.
+        """
+        initial_pos_px = np.asarray(initial_pos_px, dtype=np.float64)
+        v0_px_s = np.asarray(v0_px_s, dtype=np.float64)
+        t = np.asarray(t_elapsed_effective, dtype=np.float64)[..., np.newaxis] # (..., 1) to broadcast over [x, y]
+
+        # Gravity only acts on the y component (positive = down in Pygame coords)
+        accel_px_s2 = np.array([0.0, self.gravity_px_s2])
+
+        pos_px = initial_pos_px + v0_px_s * t + 0.5 * accel_px_s2 * t**2
+        v_px_s = v0_px_s + accel_px_s2 * t
+        return pos_px, np.broadcast_to(v_px_s, pos_px.shape).copy()
+
+    def sample_trajectory(self, initial_pos_px, v0_px_s, times_sec):
+        """
+        Positions and velocities of one launch at the given (ascending) times.
+
+        Args:
+            initial_pos_px (list): Projectile's starting [x, y] in pixels.
+            v0_px_s (list): Initial [vx, vy] velocity in pixels/sec (Pygame coords).
+            times_sec (array_like): Effective simulation times, shape (M,).
+
+        Returns:
+            tuple: (pos_px, v_px_s) float64 arrays of shape (M, 2).
+        """
+        return self.calculate_kinematic_batch(initial_pos_px, v0_px_s, times_sec)
+
+    def calculate_required_velocities_batch(self, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        Vectorized version of calculate_required_velocities (inputs broadcast with NumPy rules).
+
+        Args:
+            initial_pos_px (array_like): Starting [x, y] positions in pixels, shape (..., 2).
+            target_center_px (array_like): Target centers [x, y] in pixels, shape (..., 2).
+            time_to_target_sec (array_like): Desired flight times in seconds, shape (...).
+
+        Returns:
+            tuple: (v0x_px_s, v0y_px_s) float64 arrays (Pygame coords). Cells with a
+                   non-positive time get (0, 0), like the scalar version.
+        """
+        initial_pos_px = np.asarray(initial_pos_px, dtype=np.float64)
+        target_center_px = np.asarray(target_center_px, dtype=np.float64)
+        t = np.asarray(time_to_target_sec, dtype=np.float64)
+
+        delta_x_px = target_center_px[..., 0] - initial_pos_px[..., 0]
+        delta_y_physics_px = initial_pos_px[..., 1] - target_center_px[..., 1] # Up positive
+        valid = t > 0
+        safe_t = np.where(valid, t, 1.0) # Avoid division by zero, masked out below
+
+        v0x_px_s = np.where(valid, delta_x_px / safe_t, 0.0)
+        v0y_physics_px_s = (delta_y_physics_px + 0.5 * self.gravity_px_s2 * safe_t**2) / safe_t
+        v0y_px_s = np.where(valid, -v0y_physics_px_s, 0.0) # Convert to Pygame coords (down positive)
+        return v0x_px_s, v0y_px_s
+
+    # --- Closed-form Event Solver ---
+
+    @staticmethod
+    def _solve_quadratic(a, b, c):
+        """Returns the real roots of a*t^2 + b*t + c = 0 in ascending order (handles a == 0)."""
+        if abs(a) < 1e-12:
+            if abs(b) < 1e-12:
+                return []
+            return [-c / b]
+        discriminant = b * b - 4 * a * c
+        if discriminant < 0:
+            return []
+        sqrt_d = math.sqrt(discriminant)
+        return sorted([(-b - sqrt_d) / (2 * a), (-b + sqrt_d) / (2 * a)])
+
+    def _times_at_y(self, initial_y_px, v0y_px_s, y_px):
+        """Times (ascending, may be negative) at which the projectile is at height y_px."""
+        return self._solve_quadratic(0.5 * self.gravity_px_s2, v0y_px_s, initial_y_px - y_px)
+
+    def _intervals_inside_y(self, initial_y_px, v0y_px_s, top_px, bottom_px):
+        """Time intervals during which top_px <= y(t) <= bottom_px (gravity >= 0, y grows downward)."""
+        below_bottom = self._times_at_y(initial_y_px, v0y_px_s, bottom_px)
+        above_top = self._times_at_y(initial_y_px, v0y_px_s, top_px)
+        if self.gravity_px_s2 > 0:
+            if len(below_bottom) < 2:
+                return [] # Never above the bottom line
+            r1, r2 = below_bottom # y <= bottom for t in [r1, r2]
+            if len(above_top) < 2:
+                return [(r1, r2)] # Never reaches the top line: inside the whole time
+            s1, s2 = above_top # y < top for t in (s1, s2)
+            return [(r1, s1), (s2, r2)]
+        # No gravity: straight line in y
+        if abs(v0y_px_s) < 1e-12:
+            return [(-math.inf, math.inf)] if top_px <= initial_y_px <= bottom_px else []
+        t_top, t_bottom = (top_px - initial_y_px) / v0y_px_s, (bottom_px - initial_y_px) / v0y_px_s
+        return [(min(t_top, t_bottom), max(t_top, t_bottom))]
+
+    def _interval_inside_x(self, initial_x_px, v0x_px_s, left_px, right_px):
+        """Time interval during which left_px <= x(t) <= right_px, or None."""
+        if abs(v0x_px_s) < 1e-12:
+            return (-math.inf, math.inf) if left_px <= initial_x_px <= right_px else None
+        t_left, t_right = (left_px - initial_x_px) / v0x_px_s, (right_px - initial_x_px) / v0x_px_s
+        return (min(t_left, t_right), max(t_left, t_right))
+
+    def solve_trajectory_events(self, initial_pos_px, v0x_px_s, v0y_px_s, target_rect=None, bounds_rect=None, ground_y_px=None):
+        """
+        Solves, in closed form, when the drag-free trajectory hits its notable events.
+
+        Args:
+            initial_pos_px (list): Projectile's starting [x, y] in pixels.
+            v0x_px_s (float): Initial horizontal velocity in pixels/sec.
+            v0y_px_s (float): Initial vertical velocity in pixels/sec (Pygame coords).
+            target_rect (rect-like): Optional (left, top, width, height) of the target box.
+            bounds_rect (rect-like): Visible area (left, top, width, height). Defaults to the window.
+            ground_y_px (float): Pygame y of the ground line. Defaults to the window bottom.
+
+        Returns:
+            dict: Maps event name to (t_sec, [x, y]), or None if the event never happens (t >= 0):
+                  'apex'          - highest point (t = 0 if launched level or downwards),
+                  'ground_impact' - reaching ground_y_px while falling,
+                  'target_entry'  - first time the projectile center enters target_rect,
+                  'target_exit'   - time it leaves target_rect again after that entry,
+                  'screen_exit'   - first time it leaves bounds_rect.
+                  'screen_exit_edge' holds the edge name ('left', 'right', 'top', 'bottom') or None.
+        """
+        x0, y0 = initial_pos_px
+        g = self.gravity_px_s2
+        if bounds_rect is None:
+            bounds_rect = (0, 0, cfg.WIDTH, cfg.HEIGHT)
+        if ground_y_px is None:
+            ground_y_px = bounds_rect[1] + bounds_rect[3]
+
+        def event_at(t_sec):
+            pos_px, _ = self.calculate_kinematic_update(initial_pos_px, v0x_px_s, v0y_px_s, t_sec)
+            return (t_sec, pos_px)
+
+        events = {}
+
+        # Apex: vy(t) = v0y + g*t = 0 (only if moving upwards, v0y < 0 in Pygame coords)
+        t_apex = -v0y_px_s / g if g > 0 and v0y_px_s < 0 else 0.0
+        events['apex'] = event_at(t_apex)
+
+        # Ground impact: later root of y(t) = ground (falling through the line)
+        ground_times = [t for t in self._times_at_y(y0, v0y_px_s, ground_y_px) if t >= 0]
+        events['ground_impact'] = event_at(ground_times[-1]) if ground_times else None
+
+        # Target box: intersect the x-interval with the y-intervals, keep the first one at t >= 0
+        events['target_entry'] = events['target_exit'] = None
+        if target_rect is not None:
+            left, top, width, height = target_rect
+            x_interval = self._interval_inside_x(x0, v0x_px_s, left, left + width)
+            if x_interval is not None:
+                for y_start, y_end in self._intervals_inside_y(y0, v0y_px_s, top, top + height):
+                    t_start = max(x_interval[0], y_start, 0.0)
+                    t_end = min(x_interval[1], y_end)
+                    if t_start <= t_end:
+                        events['target_entry'] = event_at(t_start)
+                        events['target_exit'] = event_at(t_end) if math.isfinite(t_end) else None
+                        break
+
+        # Screen edges: first time after t = 0 that x or y leaves the bounds
+        left, top, width, height = bounds_rect
+        edge_times = []
+        if v0x_px_s < 0:
+            edge_times.append(((left - x0) / v0x_px_s, 'left'))
+        elif v0x_px_s > 0:
+            edge_times.append(((left + width - x0) / v0x_px_s, 'right'))
+        top_times = [t for t in self._times_at_y(y0, v0y_px_s, top) if t > 0]
+        if top_times and y0 >= top and (g > 0 or v0y_px_s < 0):
+            edge_times.append((top_times[0], 'top')) # Rising through the top line
+        bottom_times = [t for t in self._times_at_y(y0, v0y_px_s, top + height) if t > 0]
+        if bottom_times and (g > 0 or v0y_px_s > 0):
+            edge_times.append((bottom_times[-1], 'bottom')) # Falling through the bottom line
+        edge_times = [(t, edge) for t, edge in edge_times if t > 0]
+        if edge_times:
+            t_exit, edge = min(edge_times)
+            events['screen_exit'] = event_at(t_exit)
+            events['screen_exit_edge'] = edge
+        else:
+            events['screen_exit'] = None
+            events['screen_exit_edge'] = None
+
+        return events
+
@@ -0,0 +1,190 @@
+# profiler.py
+# -*- coding: utf-8 -*-
+import json
+from contextlib import nullcontext
+from time import perf_counter
+import numpy as np
+import pygame
+import config as cfg
+import utils
+
+_NULL_SECTION = nullcontext() # Returned by section() while profiling is off (no timing, no allocation)
+
+
+class _Section:
+    """Context manager timing one pass through a named section."""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._add(self.name, self.start, perf_counter())
+        return False
+
+
+class FrameProfiler:
+    """
+    Per-frame timers for named sections of the main loop.
+
+    Wrap work in `with frame_profiler.section("name"):` and call begin_frame() / end_frame()
+    once per loop iteration. Each section keeps the per-frame totals of the last
+    cfg.PROFILER_WINDOW_FRAMES frames in a ring buffer for rolling p50/p99 figures.
+    While disabled, section() hands back a shared no-op context manager.
+    """
+
+    def __init__(self, window_frames=None):
+        self.window_frames = max(2, int(window_frames if window_frames is not None else cfg.PROFILER_WINDOW_FRAMES))
+        self.enabled = cfg.PROFILER_ENABLED
+        self.overlay_visible = cfg.PROFILER_OVERLAY
+        self._samples = {} # Section name -> (window,) float64 ring buffer of milliseconds
+        self._sample_counts = {}
+        self._frame_totals = {} # Section name -> seconds spent in it during the current frame
+        self._frame_starts = np.zeros(self.window_frames) # perf_counter() at begin_frame, ring buffer
+        self._frame_count = 0
+        self._frame_start = None
+        self._trace_file = None
+        self._trace_origin = perf_counter()
+        self._overlay_lines = []
+        self._overlay_refresh_frame = 0
+
+    # --- Recording ---
+
+    def set_overlay(self, visible):
+        """Shows or hides the overlay (profiling is switched on while it is visible)."""
+        self.overlay_visible = visible
+        if visible:
+            self.enabled = True
+
+    def section(self, name):
+        """Context manager that adds the time spent inside it to section `name` for this frame."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def start(self):
+        """Start time for stop() (for code that can't be wrapped in a with block), None while disabled."""
+        return perf_counter() if self.enabled else None
+
+    def stop(self, name, start):
+        """Adds the time since start() to section `name`."""
+        if start is not None:
+            self._add(name, start, perf_counter())
+
+    def _add(self, name, start, end):
+        self._frame_totals[name] = self._frame_totals.get(name, 0.0) + (end - start)
+        if self._trace_file is not None:
+            self._write_trace_event(name, start, end)
+
+    def begin_frame(self):
+        """Starts a frame (closing the previous one if the loop skipped end_frame with `continue`)."""
+        if self._frame_start is not None:
+            self.end_frame()
+        if not self.enabled:
+            return
+        self._frame_start = perf_counter()
+        self._frame_starts[self._frame_count % self.window_frames] = self._frame_start
+        self._frame_totals.clear()
+
+    def end_frame(self):
+        """Closes the frame: stores every section's total (and the whole frame as 'frame')."""
+        if not self.enabled or self._frame_start is None:
+            return
+        end = perf_counter()
+        self._add("frame", self._frame_start, end)
+        for name, total_sec in self._frame_totals.items():
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = np.zeros(self.window_frames)
+                self._sample_counts[name] = 0
+            samples[self._sample_counts[name] % self.window_frames] = total_sec * 1000.0
+            self._sample_counts[name] += 1
+        self._frame_count += 1
+        self._frame_start = None
+
+    # --- Statistics ---
+
+    def fps(self):
+        """Frames per second over the window (measured between frame starts)."""
+        count = min(self._frame_count, self.window_frames)
+        if count < 2:
+            return 0.0
+        starts = self._frame_starts[:count] if self._frame_count <= self.window_frames else self._frame_starts
+        span = starts.max() - starts.min()
+        return (count - 1) / span if span > 0 else 0.0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Section name -> {'p50_ms', 'p99_ms', 'samples'} over the rolling window.
+        """
+        result = {}
+        for name, samples in self._samples.items():
+            count = min(self._sample_counts[name], self.window_frames)
+            p50, p99 = np.percentile(samples[:count], (50, 99))
+            result[name] = {'p50_ms': float(p50), 'p99_ms': float(p99), 'samples': count}
+        return result
+
+    # --- JSON Trace ---
+
+    def start_trace(self, path):
+        """
+        Streams every timed section to a JSON trace (Chrome trace event array: open it in
+        chrome://tracing or Perfetto). Enables profiling.
+        """
+        self.stop_trace()
+        self.enabled = True
+        self._trace_file = open(path, "w", encoding="utf-8")
+        self._trace_file.write("[\n")
+        self._trace_first_event = True
+
+    def _write_trace_event(self, name, start, end):
+        event = {"name": name, "ph": "X", "pid": 0, "tid": 0,
+                 "ts": round((start - self._trace_origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1)}
+        self._trace_file.write(("" if self._trace_first_event else ",\n") + json.dumps(event))
+        self._trace_first_event = False
+
+    def stop_trace(self):
+        if self._trace_file is not None:
+            self._trace_file.write("\n]\n")
+            self._trace_file.close()
+            self._trace_file = None
+
+    # --- Overlay ---
+
+    def draw_overlay(self, surface, overlay_font):
+        """
+        Draws rolling p50/p99 per section and the achieved FPS in the top-left corner.
+        The figures are refreshed every cfg.PROFILER_OVERLAY_REFRESH_FRAMES frames so they stay readable.
+
+        Returns:
+            pygame.Rect: Area drawn on, or None if the overlay is hidden.
+        """
+        if not self.overlay_visible or not overlay_font:
+            return None
+        if not self._overlay_lines or self._frame_count - self._overlay_refresh_frame >= cfg.PROFILER_OVERLAY_REFRESH_FRAMES:
+            self._overlay_refresh_frame = self._frame_count
+            self._overlay_lines = [f"FPS {self.fps():5.1f} / {cfg.PROFILER_TARGET_FPS}"]
+            for name, stat in sorted(self.stats().items()):
+                self._overlay_lines.append(f"{name:<18} p50 {stat['p50_ms']:6.2f}  p99 {stat['p99_ms']:6.2f} ms")
+
+        line_height = overlay_font.get_linesize()
+        width = max(overlay_font.size(line)[0] for line in self._overlay_lines) + 2 * cfg.PROFILER_OVERLAY_PADDING_PX
+        height = line_height * len(self._overlay_lines) + 2 * cfg.PROFILER_OVERLAY_PADDING_PX
+        rect = pygame.Rect(cfg.PROFILER_OVERLAY_POS, (width, height))
+        background = pygame.Surface(rect.size, pygame.SRCALPHA)
+        background.fill(cfg.PROFILER_OVERLAY_BG_COLOR)
+        surface.blit(background, rect.topleft)
+        y = rect.top + cfg.PROFILER_OVERLAY_PADDING_PX
+        for line in self._overlay_lines:
+            utils.draw_text(line, overlay_font, cfg.PROFILER_OVERLAY_TEXT_COLOR, surface, rect.left + cfg.PROFILER_OVERLAY_PADDING_PX, y, volatile=True)
+            y += line_height
+        return rect
+
+
+frame_profiler = FrameProfiler() # Shared by main.py and ui.py
@@ -0,0 +1,212 @@
+# replay.py
+# -*- coding: utf-8 -*-
+import math
+import struct
+from simulation import Simulation
+
+# --- Log Format ---
+# Header: MAGIC, then records of <clock_sec: float64><code: uint8><payload>, little endian.
+MAGIC = b"ATSREC\x01"
+RECORD_HEADER = struct.Struct("<dB")
+SLIDER_KEYS = ("circle_x", "circle_y", "box_x", "box_y")
+SLIDERS = struct.Struct("<4d") # Slider values in SLIDER_KEYS order, NaN if the slider is absent
+TIME = struct.Struct("<d") # Validated flight time, NaN for None (invalid input)
+FRAMES = struct.Struct("<b")
+TEXT_LENGTH = struct.Struct("<H")
+
+FRAME = 0 # simulation.update() at clock_sec
+SCENE = 1 # New Simulation (payload: scene name)
+RESET = 2 # reset_simulation() (payload: sliders after re-initialization)
+LAUNCH = 3 # Launch button / Enter (payload: time, sliders)
+PAUSE_TOGGLE = 4
+SPEED_DOWN = 5
+SPEED_UP = 6
+UPDATE_SLIDER = 7 # Slider moved (payload: sliders)
+SET_TIME = 8 # Valid time typed into the time box (payload: time)
+STEP_FRAME = 9 # Timeline frame step (payload: frames)
+TOGGLE_REVERSE = 10
+VOLLEY = 11 # Swarm volley (V key)
+
+ACTION_CODES = {
+    "launch": LAUNCH, "pause_toggle": PAUSE_TOGGLE, "speed_down": SPEED_DOWN, "speed_up": SPEED_UP,
+    "update_slider": UPDATE_SLIDER, "validate_time": SET_TIME, "step_frame": STEP_FRAME, "toggle_reverse": TOGGLE_REVERSE,
+    "volley": VOLLEY,
+}
+
+
+def _pack_sliders(sliders):
+    return SLIDERS.pack(*(sliders.get(key, math.nan) if sliders else math.nan for key in SLIDER_KEYS))
+
+def _unpack_sliders(data):
+    return {key: value for key, value in zip(SLIDER_KEYS, SLIDERS.unpack(data)) if not math.isnan(value)}
+
+def _pack_time(time_sec):
+    return TIME.pack(math.nan if time_sec is None else time_sec)
+
+def _unpack_time(data):
+    (time_sec,) = TIME.unpack(data)
+    return None if math.isnan(time_sec) else time_sec
+
+
+class InputRecorder:
+    """
+    Writes the inputs that reach the simulation (scene choice, UI actions with the slider
+    values / validated time they used, and every frame's clock) to a compact binary log.
+
+    Only what Simulation consumes is recorded, already resolved by the UI, so a replay
+    does not depend on pygame events, mouse positions or fonts.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+
+    def _write(self, clock_sec, code, payload=b""):
+        self._file.write(RECORD_HEADER.pack(clock_sec, code))
+        self._file.write(payload)
+
+    def frame(self, clock_sec):
+        """Records one simulation.update() call."""
+        self._write(clock_sec, FRAME)
+
+    def scene(self, clock_sec, scene_name):
+        name = scene_name.encode("utf-8")
+        self._write(clock_sec, SCENE, TEXT_LENGTH.pack(len(name)) + name)
+
+    def reset(self, clock_sec, sliders):
+        self._write(clock_sec, RESET, _pack_sliders(sliders))
+
+    def action(self, clock_sec, action, sliders=None, time_sec=None, frames=0):
+        """
+        Records a UI action by name (see ACTION_CODES).
+
+        Args:
+            sliders (dict): Slider values used by "launch" / "update_slider".
+            time_sec (float): Validated time used by "launch" (None: invalid input) / "validate_time".
+            frames (int): Frame count of "step_frame".
+        """
+        code = ACTION_CODES[action]
+        if code == LAUNCH:
+            payload = _pack_time(time_sec) + _pack_sliders(sliders)
+        elif code == UPDATE_SLIDER:
+            payload = _pack_sliders(sliders)
+        elif code == SET_TIME:
+            payload = _pack_time(time_sec)
+        elif code == STEP_FRAME:
+            payload = FRAMES.pack(frames)
+        else:
+            payload = b""
+        self._write(clock_sec, code, payload)
+
+    def close(self):
+        self._file.close()
+
+
+def read_log(path):
+    """
+    Yields (clock_sec, code, payload) records of an InputRecorder log (payload decoded).
+
+    Raises:
+        ValueError: If the file is not an input log, or a record is cut off or unreadable
+            (e.g. the recording session was killed mid-write).
+    """
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"'{path}' is not an input log")
+    offset = len(MAGIC)
+    while offset < len(data):
+        record_offset = offset
+        try:
+            clock_sec, code, payload, offset = _read_record(data, offset)
+        except (struct.error, UnicodeDecodeError) as error:
+            raise ValueError(f"'{path}' has a truncated or corrupt record at byte {record_offset}") from error
+        yield clock_sec, code, payload
+
+
+def _read_record(data, offset):
+    """Decodes the record at offset. Returns (clock_sec, code, payload, offset of the next record)."""
+    clock_sec, code = RECORD_HEADER.unpack_from(data, offset)
+    offset += RECORD_HEADER.size
+    payload = None
+    if code == SCENE:
+        (length,) = TEXT_LENGTH.unpack_from(data, offset)
+        offset += TEXT_LENGTH.size
+        if offset + length > len(data):
+            raise struct.error("scene name is cut off")
+        payload = data[offset:offset + length].decode("utf-8")
+        offset += length
+    elif code in (RESET, UPDATE_SLIDER):
+        payload = _unpack_sliders(data[offset:offset + SLIDERS.size])
+        offset += SLIDERS.size
+    elif code == LAUNCH:
+        time_sec = _unpack_time(data[offset:offset + TIME.size])
+        sliders = _unpack_sliders(data[offset + TIME.size:offset + TIME.size + SLIDERS.size])
+        payload = (time_sec, sliders)
+        offset += TIME.size + SLIDERS.size
+    elif code == SET_TIME:
+        payload = _unpack_time(data[offset:offset + TIME.size])
+        offset += TIME.size
+    elif code == STEP_FRAME:
+        (payload,) = FRAMES.unpack_from(data, offset)
+        offset += FRAMES.size
+    return clock_sec, code, payload, offset
+
+
+def replay(path, on_frame=None):
+    """
+    Replays an input log against headless Simulations as fast as possible.
+
+    Every record is applied exactly the way main.py applied it, with the recorded clock, so
+    the simulation goes through the same states as in the recorded session.
+
+    Args:
+        path (str): Log written by InputRecorder.
+        on_frame (callable): Optional on_frame(simulation) after every replayed frame.
+
+    Returns:
+        list: The Simulation of every scene opened in the log, in order.
+    """
+    simulations = []
+    simulation = None
+    for clock_sec, code, payload in read_log(path):
+        if code == SCENE:
+            simulation = Simulation(payload)
+            simulations.append(simulation)
+            continue
+        if simulation is None:
+            raise ValueError("Input log has records before the first scene")
+        simulation.set_clock(clock_sec)
+        if code == FRAME:
+            simulation.update()
+            if on_frame:
+                on_frame(simulation)
+        elif code == RESET:
+            simulation.reset()
+            simulation.update_positions_from_sliders(payload)
+            simulation.projectile.reset_to_initial()
+        elif code == LAUNCH:
+            time_sec, sliders = payload
+            simulation.update_positions_from_sliders(sliders)
+            simulation.launch(time_sec) # Ignored by scenes that calculate their own flight time
+        elif code == PAUSE_TOGGLE:
+            simulation.toggle_pause()
+        elif code == SPEED_DOWN:
+            simulation.speed_down()
+        elif code == SPEED_UP:
+            simulation.speed_up()
+        elif code == UPDATE_SLIDER:
+            if not simulation.simulation_running:
+                simulation.update_positions_from_sliders(payload)
+        elif code == SET_TIME:
+            simulation.set_time_to_target(payload)
+        elif code == STEP_FRAME:
+            simulation.step_frame(payload)
+        elif code == TOGGLE_REVERSE:
+            simulation.toggle_reverse()
+        elif code == VOLLEY:
+            simulation.launch_volley()
+        else:
+            raise ValueError(f"Unknown record code {code} in input log")
+    return simulations
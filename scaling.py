@@ -0,0 +1,166 @@
+# scaling.py
+# -*- coding: utf-8 -*-
+import math
+import pygame
+import config as cfg
+
+
+class ScaledDisplay:
+    """
+    Window showing a logical canvas of fixed size (the internal resolution, cfg.WIDTH x
+    cfg.HEIGHT) scaled to any window or fullscreen size, aspect ratio kept with letterbox bars.
+
+    Everything is drawn on `canvas` in logical coordinates and present() copies the frame to
+    the window. Changed areas are scaled one rect at a time, so a frame costs what changed,
+    not the window size. A full frame starts from the static background scaled once per
+    output size (cached), with only the frame's dynamic rects scaled on top. At 1:1 the
+    copies are plain blits.
+    """
+
+    def __init__(self, logical_size, window_size=None, fullscreen=False, resizable=True, smooth=True):
+        """
+        Args:
+            logical_size (tuple): Canvas size in pixels (internal resolution).
+            window_size (tuple): Window size when not fullscreen (default: logical_size).
+            fullscreen (bool): Start in fullscreen (desktop resolution).
+            resizable (bool): Whether the window can be resized by the user.
+            smooth (bool): Bilinear scaling (pygame.transform.smoothscale) instead of nearest neighbor.
+        """
+        self.logical_size = tuple(logical_size)
+        self.windowed_size = tuple(window_size) if window_size else self.logical_size
+        self.fullscreen = fullscreen
+        self.resizable = resizable
+        self.smooth = smooth
+        self._scaled_backgrounds = {} # Output size -> (background surface, its scaled copy)
+        self._set_mode()
+        self.canvas = pygame.Surface(self.logical_size, 0, self.window) # Same pixel format as the window
+
+    # --- Window ---
+
+    def _set_mode(self):
+        if self.fullscreen:
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.window = pygame.display.set_mode(self.windowed_size, pygame.RESIZABLE if self.resizable else 0)
+        self._layout()
+
+    def _layout(self):
+        """Places the canvas in the window (centered, aspect kept if cfg.SCALE_KEEP_ASPECT)."""
+        window_rect = self.window.get_rect()
+        logical_w, logical_h = self.logical_size
+        if cfg.SCALE_KEEP_ASPECT:
+            scale = min(window_rect.width / logical_w, window_rect.height / logical_h)
+            size = (max(1, round(logical_w * scale)), max(1, round(logical_h * scale)))
+        else:
+            size = window_rect.size
+        self.dest_rect = pygame.Rect((0, 0), size)
+        self.dest_rect.center = window_rect.center
+        self.scale_x = self.dest_rect.width / logical_w
+        self.scale_y = self.dest_rect.height / logical_h
+        self.scaling = self.dest_rect.size != self.logical_size
+        # Letterbox bars: the window areas outside dest_rect
+        self._bars = [rect for rect in (
+            pygame.Rect(0, 0, window_rect.width, self.dest_rect.top),
+            pygame.Rect(0, self.dest_rect.bottom, window_rect.width, window_rect.height - self.dest_rect.bottom),
+            pygame.Rect(0, self.dest_rect.top, self.dest_rect.left, self.dest_rect.height),
+            pygame.Rect(self.dest_rect.right, self.dest_rect.top, window_rect.width - self.dest_rect.right, self.dest_rect.height),
+        ) if rect.width > 0 and rect.height > 0]
+        # Bilinear scaling needs 24/32-bit surfaces
+        self._scale = pygame.transform.smoothscale if self.smooth and self.window.get_bitsize() >= 24 else pygame.transform.scale
+
+    def resize(self):
+        """Follows a window resize (VIDEORESIZE): the next frame must be presented in full."""
+        self.window = pygame.display.get_surface()
+        if not self.fullscreen:
+            self.windowed_size = self.window.get_size()
+        self._layout()
+
+    def toggle_fullscreen(self):
+        """Switches between fullscreen and the window (the next frame must be presented in full)."""
+        self.fullscreen = not self.fullscreen
+        self._set_mode()
+
+    # --- Coordinates ---
+
+    def to_logical(self, pos):
+        """Converts a window position to canvas coordinates (outside the canvas for the bars)."""
+        if not self.scaling:
+            return pos
+        return (math.floor((pos[0] - self.dest_rect.x) / self.scale_x),
+                math.floor((pos[1] - self.dest_rect.y) / self.scale_y))
+
+    def map_event(self, event):
+        """Returns the event with its pos / rel in canvas coordinates (events without pos unchanged)."""
+        if not self.scaling or not hasattr(event, "pos"):
+            return event
+        attributes = dict(event.dict)
+        attributes["pos"] = self.to_logical(event.pos)
+        if "rel" in attributes:
+            attributes["rel"] = (round(event.rel[0] / self.scale_x), round(event.rel[1] / self.scale_y))
+        return pygame.event.Event(event.type, attributes)
+
+    def to_window_rect(self, rect):
+        """Window area covering a canvas rect (rounded outwards, clipped to the canvas area)."""
+        left = self.dest_rect.x + math.floor(rect.left * self.scale_x)
+        top = self.dest_rect.y + math.floor(rect.top * self.scale_y)
+        right = self.dest_rect.x + math.ceil(rect.right * self.scale_x)
+        bottom = self.dest_rect.y + math.ceil(rect.bottom * self.scale_y)
+        return pygame.Rect(left, top, right - left, bottom - top).clip(self.dest_rect)
+
+    # --- Presenting ---
+
+    def _copy_rect(self, rect):
+        """Copies one canvas rect to the window. Returns the window rect written (None if empty)."""
+        rect = pygame.Rect(rect).clip(self.canvas.get_rect())
+        if not rect.width or not rect.height:
+            return None
+        if not self.scaling:
+            self.window.blit(self.canvas, rect, rect)
+            return rect
+        # A 1 px margin blends the edges with their real neighbors. The source is copied out of the
+        # canvas: smoothscale reads one row past the end of a subsurface (stale slivers otherwise).
+        rect = rect.inflate(2, 2).clip(self.canvas.get_rect())
+        window_rect = self.to_window_rect(rect)
+        if not window_rect.width or not window_rect.height:
+            return None
+        self._scale(self.canvas.subsurface(rect).copy(), window_rect.size, self.window.subsurface(window_rect))
+        return window_rect
+
+    def _scaled_background(self, background):
+        """background scaled to the canvas area, rescaled only for a new background or output size."""
+        size = self.dest_rect.size
+        cached = self._scaled_backgrounds.get(size)
+        if cached is None or cached[0] is not background:
+            # Copies of an older background are stale at every size
+            self._scaled_backgrounds = {key: entry for key, entry in self._scaled_backgrounds.items() if entry[0] is background}
+            scaled = pygame.Surface(size, 0, self.window)
+            self._scale(background, size, scaled)
+            cached = self._scaled_backgrounds[size] = (background, scaled)
+        return cached[1]
+
+    def present(self, rects=None, background=None):
+        """
+        Shows the canvas in the window.
+
+        Args:
+            rects (list): Canvas rects that changed since the last present (dirty-rect frame).
+                          None presents the whole canvas.
+            background (pygame.Surface): Presents a full frame drawn over this canvas-sized
+                surface (the UI's static layer): its cached scaled copy is blitted and only
+                `rects`, which must cover everything drawn over it, are scaled on top.
+        """
+        if rects is not None and background is None:
+            window_rects = [window_rect for window_rect in map(self._copy_rect, rects) if window_rect]
+            pygame.display.update(window_rects)
+            return
+        for bar in self._bars:
+            self.window.fill(cfg.SCALE_LETTERBOX_COLOR, bar)
+        if not self.scaling:
+            self.window.blit(self.canvas, self.dest_rect)
+        elif background is not None:
+            self.window.blit(self._scaled_background(background), self.dest_rect)
+            for rect in rects or ():
+                self._copy_rect(rect)
+        else:
+            self._scale(self.canvas, self.dest_rect.size, self.window.subsurface(self.dest_rect))
+        pygame.display.flip()
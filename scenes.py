@@ -0,0 +1,116 @@
+# scenes.py
+# -*- coding: utf-8 -*-
+import importlib
+import config as cfg
+
+
+class Scene:
+    """
+    Behavior of one simulation scene: launch solver, end of flight, peak logic and UI texts.
+
+    Simulation, UIManager and main.py ask the scene instead of comparing scene names, so a
+    new scene is a Scene subclass registered with register_scene(). Everything that does not
+    change during a session is a plain attribute, read once per frame without any branching
+    on the scene's name. The scene's data (title, start positions, enabled sliders, default
+    time) stays in its cfg.SCENES entry.
+    """
+    uses_time_input = True # The user types the flight time (otherwise solve_launch computes it)
+    enter_action = "validate_time" # UI action of Enter in the time box
+    input_label = "Hedef Süre (s):"
+    input_label_color = cfg.WHITE
+    time_label = "Hedef t" # Label of the flight time in the live formulas
+    draws_target = True
+    shows_peak = True # Peak dot and height are shown once the flight is finished
+
+    def __init__(self, name, config):
+        """
+        Args:
+            name (str): Scene name (key of the registry and of cfg.SCENES).
+            config (dict): Scene data, same keys as the cfg.SCENES entries.
+        """
+        self.name = name
+        self.config = config
+        self.title = config.get("title", "")
+
+    def place_target(self, target, projectile_pos_px, target_pos_px):
+        """Moves the target for a new projectile start / target position (from sliders or the scene data)."""
+        target.set_position(target_pos_px)
+
+    def solve_launch(self, physics_engine, initial_pos_px, target_center_px, time_to_target_sec):
+        """
+        Solves the launch with the engine's own motion (PhysicsEngine.solve_launch_velocities:
+        drag-free formula, or the Newton solver of DragPhysicsEngine).
+
+        Args:
+            physics_engine (PhysicsEngine): Gravity and velocity solver.
+            initial_pos_px (list): Projectile start [x, y] in pixels.
+            target_center_px (list): Target center [x, y] in pixels.
+            time_to_target_sec (float): Validated flight time typed by the user (None if the
+                scene does not use time input).
+
+        Returns:
+            tuple: (time_to_target_sec, v0x_px_s, v0y_px_s) of the launch.
+
+        Raises:
+            ValueError: If the launch is physically impossible (message shown to the user).
+        """
+        v0x_px_s, v0y_px_s = physics_engine.solve_launch_velocities(initial_pos_px, target_center_px, time_to_target_sec)
+        return time_to_target_sec, v0x_px_s, v0y_px_s
+
+    def flight_end_pos_px(self, physics_engine, initial_pos_px, v0_px_s, flight_end_sec):
+        """Exact [x, y] where the flight ends, or None to take it from the trajectory."""
+        return None
+
+
+# --- Registry ---
+
+_scene_factories = {} # Scene name -> (Scene subclass or "module.Class" path, config or None)
+_loaded_scenes = {} # Scene name -> Scene instance, created on first selection
+
+
+def register_scene(name, factory, config=None):
+    """
+    Registers a scene (shown on the selection screen in registration order).
+
+    Args:
+        name (str): Scene name.
+        factory (type or str): Scene subclass, or its "module.Class" path to import it only
+                               when the scene is first selected.
+        config (dict): Scene data (default: cfg.SCENES[name], looked up on first selection).
+    """
+    _scene_factories[name] = (factory, config)
+    _loaded_scenes.pop(name, None)
+
+
+def scene_names():
+    """Registered scene names, in registration order (nothing is loaded)."""
+    return list(_scene_factories)
+
+
+def get_scene(name):
+    """
+    Returns the scene object, creating it (and importing its module) on first use.
+
+    Raises:
+        KeyError: If no scene is registered under name.
+    """
+    scene = _loaded_scenes.get(name)
+    if scene is None:
+        if name not in _scene_factories:
+            raise KeyError(f"Scene '{name}' is not registered")
+        factory, config = _scene_factories[name]
+        if isinstance(factory, str):
+            module_name, _, class_name = factory.rpartition(".")
+            factory = getattr(importlib.import_module(module_name), class_name)
+        scene = _loaded_scenes[name] = factory(name, config if config is not None else cfg.SCENES[name])
+    return scene
+
+
+# Slanted throw is the default behavior; the other built-in scenes live in their own
+# modules, imported when the scene is first selected
+register_scene("Eğik Atış", Scene)
+register_scene("Dikey Atış", "vertical_throw.VerticalThrowScene")
+register_scene("Yatay Atış", "horizontal_throw.HorizontalThrowScene")
+for _name in cfg.SCENES: # Scenes only defined in config.py get the default behavior
+    if _name not in _scene_factories:
+        register_scene(_name, Scene)
@@ -0,0 +1,485 @@
+# simulation.py
+# -*- coding: utf-8 -*-
+from bisect import bisect_right
+import numpy as np
+import config as cfg
+import utils
+from game_objects import Projectile, Target
+from drag import DragPhysicsEngine
+from physics import PhysicsEngine
+from scenes import get_scene
+from swarm import ProjectileSwarm
+from trail import TrailBuffer
+from trajectory import TrajectoryTable
+
+class Simulation:
+    """
+    Runs the launch logic of a scene against a simulated clock.
+
+    Nothing here touches the display or pygame's timer: the caller either feeds
+    wall-clock time in through set_clock() + update() (the interactive main loop) or advances
+    the simulated clock itself with advance() / run_until_finished() (headless runs).
+
+    Each launch precomputes its whole trajectory into a TrajectoryTable. Clock time (scaled
+    by the speed multiplier) is collected in an accumulator and consumed in fixed steps of
+    cfg.PHYSICS_TIMESTEP_SEC, which feed the trail and fire scheduled events; the projectile
+    is drawn at the exact effective time, looked up in the table.
+    """
+
+    def __init__(self, scene_name, physics_engine=None):
+        """
+        Args:
+            scene_name (str): Registered scene name (see scenes.scene_names()).
+            physics_engine (PhysicsEngine): Engine for every launch. Default: a
+                drag.DragPhysicsEngine if cfg.DRAG_ENABLED, otherwise a drag-free PhysicsEngine.
+        """
+        self.scene = get_scene(scene_name) # scenes.Scene: launch solver, end of flight, peak and UI rules (KeyError if unknown)
+        self.scene_name = scene_name
+        self.scene_config = self.scene.config
+        self.projectile = Projectile(initial_pos_px=list(self.scene_config["initial_projectile_pos"])) # Use list copy
+        self.target = Target(initial_pos_px=list(self.scene_config["initial_target_pos"])) # Use list copy
+        if physics_engine is None: # Air drag mode is chosen in config.py
+            physics_engine = DragPhysicsEngine() if cfg.DRAG_ENABLED else PhysicsEngine()
+        self.physics_engine = physics_engine
+        self.scene.place_target(self.target, self.projectile.initial_pos_px, self.target.pos_px)
+
+        self.clock_sec = 0.0 # Simulated absolute time (seconds)
+        self.last_update_clock_sec = 0.0 # clock_sec at the previous update()
+        self.simulation_speed_multiplier = 1.0
+        self.projectile_trail = TrailBuffer(cfg.MAX_TRAIL_POINTS) # Mermi iz noktaları (halka tampon)
+        self.exporter = None # Optional export.TrajectoryExporter: receives every physics step of every launch
+        # Optional many-projectile mode (volleys), flies alongside the main projectile
+        self.swarm = ProjectileSwarm(cfg.SWARM_CAPACITY, self.physics_engine) if cfg.SWARM_CAPACITY > 0 else None
+        self.reset()
+
+    def reset(self):
+        """Resets the launch state for the current scene (positions are kept)."""
+        self.simulation_running = False
+        self.simulation_paused = False
+        self.launch_v0x_px_s = 0.0
+        self.launch_v0y_px_s = 0.0
+        self.current_vx_px_s = 0.0
+        self.current_vy_px_s = 0.0
+        self.launch_v0x_mps_display = 0.0
+        self.launch_v0y_mps_display = 0.0
+        self.current_t_elapsed_sec = 0.0 # Clock time spent flying (not scaled by speed)
+        self._reset_steps()
+        self.trajectory_events = {} # Events of the current launch (PhysicsEngine.solve_trajectory_events / TrajectoryTable.find_events)
+        self.event_schedule = [] # (t_sec, name) sorted by time
+        self.next_event_index = 0
+        self.passed_events = []
+        self.flight_end_sec = 0.0
+        self.trajectory_table = None # TrajectoryTable of the current launch
+        self.exported_time_sec = 0.0 # Newest effective time of the current launch written to the exporter
+        self.playback_direction = 1 # 1: forward, -1: playing the launch in reverse
+        try:
+            self.time_to_target_sec = float(self.scene_config.get("default_time_str", "2.0"))
+        except ValueError:
+            self.time_to_target_sec = 2.0 # Fallback default
+        self.projectile.reset_to_initial()
+        self.clear_trail()
+        self.clear_peak_info()
+        if self.swarm is not None:
+            self.swarm.clear()
+
+    def clear_trail(self):
+        """Removes all trail points."""
+        self.projectile_trail.clear()
+        self.trail_points_added = 0 # Yörünge tablosundan ize eklenmiş nokta sayısı
+
+    def _reset_steps(self):
+        """Clears the fixed-step state (simulation time, accumulator, latest step state)."""
+        self.sim_time_sec = 0.0 # Effective simulation time of the latest physics step
+        self.accumulator_sec = 0.0 # Simulation time not yet consumed by a fixed step
+        self.step_pos_px = list(self.projectile.initial_pos_px)
+        self.step_v_px_s = [0.0, 0.0]
+
+    def clear_peak_info(self):
+        """Forgets the computed peak point."""
+        self.peak_time_sec = 0.0 # Tepe noktasına ulaşma süresi
+        self.peak_position_px = None # Tepe noktasının [x, y] konumu (piksel)
+        self.show_peak_info = False # Tepe noktası bilgisini gösterme bayrağı
+
+    # --- Clock ---
+
+    def set_clock(self, now_sec):
+        """Sets the simulated absolute time (e.g. from the wall clock)."""
+        self.clock_sec = now_sec
+
+    def advance(self, dt_sec):
+        """Advances the simulated clock by dt_sec and updates the simulation."""
+        self.clock_sec += dt_sec
+        self.update()
+
+    def run_until_finished(self, dt_sec=1.0 / 60.0, max_time_sec=600.0):
+        """
+        Steps the simulated clock until the current launch has finished.
+
+        Args:
+            dt_sec (float): Simulated clock step per iteration (default: one 60 FPS frame).
+            max_time_sec (float): Safety limit on simulated clock time to run.
+
+        Returns:
+            int: Number of steps taken.
+        """
+        steps = 0
+        limit_sec = self.clock_sec + max_time_sec
+        while self.simulation_running and not self.simulation_paused and self.clock_sec < limit_sec:
+            self.advance(dt_sec)
+            steps += 1
+        return steps
+
+    # --- Actions ---
+
+    def update_positions_from_sliders(self, sliders):
+        """Updates initial projectile and target positions from slider values (0-1) of enabled sliders."""
+        sliders_enabled = self.scene_config.get("sliders_enabled", []) # Get enabled sliders for scene
+        projectile = self.projectile
+        target = self.target
+
+        drawable_height = cfg.DRAWABLE_HEIGHT
+        y_offset = cfg.DRAWABLE_Y_OFFSET
+
+        # Calculate Ranges
+        circle_range_x = cfg.WIDTH - 2 * projectile.radius
+        circle_range_y = drawable_height - 2 * projectile.radius
+        box_range_x = cfg.WIDTH - target.width
+        box_range_y = drawable_height - target.height
+
+        # Update Positions based on ENABLED sliders
+        new_proj_x, new_proj_y = projectile.initial_pos_px
+        new_target_x, new_target_y = target.pos_px
+
+        if "circle_x" in sliders_enabled and "circle_x" in sliders:
+            # Check range to avoid division by zero if width is too small
+            new_proj_x = projectile.radius + sliders.get("circle_x", 0.5) * circle_range_x if circle_range_x > 0 else projectile.radius
+        if "circle_y" in sliders_enabled and "circle_y" in sliders:
+            new_proj_y = y_offset + projectile.radius + sliders.get("circle_y", 0.5) * circle_range_y if circle_range_y > 0 else y_offset + projectile.radius
+        if "box_x" in sliders_enabled and "box_x" in sliders:
+            new_target_x = sliders.get("box_x", 0.5) * box_range_x if box_range_x > 0 else 0
+        if "box_y" in sliders_enabled and "box_y" in sliders:
+            new_target_y = y_offset + sliders.get("box_y", 0.5) * box_range_y if box_range_y > 0 else y_offset # Box Y maps like circle Y
+
+        # Apply updates
+        projectile.set_initial_position([new_proj_x, new_proj_y])
+
+        self.scene.place_target(target, [new_proj_x, new_proj_y], [new_target_x, new_target_y])
+
+        # If sim not running, ensure current projectile pos is reset
+        if not self.simulation_running:
+            projectile.reset_to_initial()
+
+    def set_time_to_target(self, time_to_target_sec):
+        """Stores a validated target time (used by scenes where the user enters it)."""
+        self.time_to_target_sec = time_to_target_sec
+
+    def launch(self, time_to_target_sec=None):
+        """
+        Launches the projectile using the active scene's rules (Scene.solve_launch).
+
+        Args:
+            time_to_target_sec (float): Validated flight time for scenes where the user
+                enters it (Scene.uses_time_input). None means the input was invalid:
+                the previous trail and peak info are still cleared but nothing is launched.
+                Ignored by scenes that calculate their own flight time.
+
+        Returns:
+            str: Error message if the launch is physically impossible, otherwise None.
+        """
+        self.clear_trail() # Fırlatmadan önce eski izi temizle
+        self.clear_peak_info()
+
+        if self.scene.uses_time_input and time_to_target_sec is None:
+            return None
+        try:
+            self.time_to_target_sec, self.launch_v0x_px_s, self.launch_v0y_px_s = self.scene.solve_launch(
+                self.physics_engine, self.projectile.initial_pos_px, self.target.center_pos_px, time_to_target_sec)
+        except ValueError as error:
+            self.time_to_target_sec = 0
+            return str(error)
+        self.launch_v0x_mps_display = utils.px_s_to_mps(self.launch_v0x_px_s)
+        self.launch_v0y_mps_display = utils.px_s_to_mps(-self.launch_v0y_px_s) if self.launch_v0y_px_s else 0.0 # Y is inverted for display (no -0.0)
+
+        if self.time_to_target_sec > 1e-6:
+            self._start_flight()
+            self._calculate_peak_info()
+        else: # Nothing to fly (e.g. zero gravity)
+            self.simulation_running = False
+            self.simulation_paused = False
+            self.current_t_elapsed_sec = 0.0
+            self.current_vx_px_s = self.launch_v0x_px_s
+            self.current_vy_px_s = self.launch_v0y_px_s
+        return None
+
+    def launch_volley(self):
+        """
+        Fires cfg.SWARM_VOLLEY_SIZE swarm projectiles from the projectile's start at the target
+        center, with flight times spread over cfg.SWARM_VOLLEY_TIME_RANGE_SEC.
+
+        Returns:
+            str: Error message if nothing could be fired, None otherwise.
+        """
+        if self.swarm is None:
+            return "Sürü modu kapalı (config.SWARM_CAPACITY)"
+        count = min(cfg.SWARM_VOLLEY_SIZE, self.swarm.capacity - len(self.swarm))
+        if count <= 0:
+            return "Sürü dolu, mermilerin düşmesini bekleyin"
+        flight_times_sec = np.linspace(*cfg.SWARM_VOLLEY_TIME_RANGE_SEC, count)
+        self.swarm.spawn_volley(self.projectile.initial_pos_px, self.target.center_pos_px, flight_times_sec)
+        return None
+
+    @property
+    def swarm_active(self):
+        """True while swarm projectiles are in the air."""
+        return self.swarm is not None and bool(self.swarm.alive.any())
+
+    def _start_flight(self):
+        """Starts the clock for a launch whose velocities are already set."""
+        self.simulation_paused = False
+        self.current_t_elapsed_sec = 0.0
+        self.projectile.reset_to_initial()
+        self._reset_steps()
+        self.step_v_px_s = [self.launch_v0x_px_s, self.launch_v0y_px_s]
+        self.playback_direction = 1
+        self.simulation_running = True
+        self.last_update_clock_sec = self.clock_sec # Flight time starts counting from now
+        self.current_vx_px_s = self.launch_v0x_px_s
+        self.current_vy_px_s = self.launch_v0y_px_s
+        self.flight_end_sec = self.time_to_target_sec
+        self._build_trajectory_table()
+        self._schedule_events()
+        self.exported_time_sec = 0.0
+        if self.exporter is not None:
+            self.exporter.write(0.0, self.step_pos_px, self.step_v_px_s)
+
+    def _build_trajectory_table(self):
+        """Precomputes the launch's trajectory (and trail points) up to the end of the flight."""
+        initial_pos_px = self.projectile.initial_pos_px
+        end_pos_px = self.scene.flight_end_pos_px(self.physics_engine, initial_pos_px,
+                                                  [self.launch_v0x_px_s, self.launch_v0y_px_s], self.flight_end_sec)
+        self.trajectory_table = TrajectoryTable(self.physics_engine, initial_pos_px,
+                                                [self.launch_v0x_px_s, self.launch_v0y_px_s],
+                                                self.flight_end_sec, end_pos_px=end_pos_px)
+
+    def _schedule_events(self):
+        """
+        Solves the launch's events and schedules the ones that happen during the flight: in
+        closed form, or on the trajectory table for engines without one (air drag).
+        """
+        if self.physics_engine.has_closed_form:
+            self.trajectory_events = self.physics_engine.solve_trajectory_events(
+                self.projectile.initial_pos_px, self.launch_v0x_px_s, self.launch_v0y_px_s, target_rect=self.target.rect)
+        else:
+            self.trajectory_events = self.trajectory_table.find_events(target_rect=self.target.rect)
+        schedule = [(self.flight_end_sec, "flight_end")]
+        for name in ("apex", "target_entry", "target_exit", "ground_impact", "screen_exit"):
+            event = self.trajectory_events.get(name)
+            if event is not None and 0 < event[0] < self.flight_end_sec:
+                schedule.append((event[0], name))
+        self.event_schedule = sorted(schedule)
+        self.next_event_index = 0
+        self.passed_events = [] # (name, t_sec, [x, y]) in the order they happened
+
+    def _calculate_peak_info(self):
+        """Stores the peak point of the current launch (the start point if not launched upwards, none if still rising at the end)."""
+        self.peak_time_sec, self.peak_position_px = self.trajectory_events['apex'] or (0.0, None)
+
+    def toggle_pause(self):
+        """Pauses or resumes the running simulation."""
+        self.simulation_paused = not self.simulation_paused
+
+    def speed_down(self):
+        """Decreases the simulation speed multiplier by 0.1 (min 0.1x)."""
+        self.simulation_speed_multiplier = max(0.1, round(self.simulation_speed_multiplier - 0.1, 1))
+
+    def speed_up(self):
+        """Increases the simulation speed multiplier by 0.1 (max 5.0x)."""
+        self.simulation_speed_multiplier = min(5.0, round(self.simulation_speed_multiplier + 0.1, 1))
+
+    # --- Per-frame Update ---
+
+    def update(self):
+        """
+        Consumes the clock time since the previous update in fixed physics steps and
+        sets the projectile's drawn position/velocity from the trajectory table.
+        """
+        frame_dt_sec = self.clock_sec - self.last_update_clock_sec
+        self.last_update_clock_sec = self.clock_sec
+        if self.swarm is not None and not self.simulation_paused:
+            self.swarm.advance(max(0.0, min(frame_dt_sec, cfg.MAX_FRAME_TIME_SEC)) * self.simulation_speed_multiplier)
+        if self.playback_direction < 0:
+            self._update_reverse(frame_dt_sec)
+            return
+        if not self.simulation_running or self.simulation_paused:
+            return
+
+        self.current_t_elapsed_sec += frame_dt_sec
+        # Clamp long stalls so a single frame can't queue up an unbounded number of steps
+        frame_dt_sec = max(0.0, min(frame_dt_sec, cfg.MAX_FRAME_TIME_SEC))
+        self.accumulator_sec += frame_dt_sec * self.simulation_speed_multiplier
+
+        dt_sec = cfg.PHYSICS_TIMESTEP_SEC
+        while self.simulation_running and self.accumulator_sec >= dt_sec:
+            self.accumulator_sec -= dt_sec
+            self._step(dt_sec)
+
+        if self.simulation_running:
+            # The table knows every instant: draw at the exact effective time, not the last step
+            pos_px, v_px_s = self.trajectory_table.lookup(min(self.sim_time_sec + self.accumulator_sec, self.flight_end_sec))
+        else:
+            # Flight finished inside this frame: show the exact final state
+            pos_px, v_px_s = self.step_pos_px, self.step_v_px_s
+        self.projectile.update_position(pos_px)
+        self.current_vx_px_s, self.current_vy_px_s = v_px_s
+
+    def _step(self, dt_sec):
+        """Advances the stepped state by one fixed step of simulation time."""
+        table = self.trajectory_table
+
+        # Never step past the scheduled end of the flight: land exactly on the target time
+        t_next = min(self.sim_time_sec + dt_sec, self.flight_end_sec)
+        if self.flight_end_sec - t_next < 1e-9: # Summed steps fall short by rounding: this is the end, not a near-duplicate step before it
+            t_next = self.flight_end_sec
+
+        # --- Add the precomputed trail points due before t_next (independent of frame rate) ---
+        if cfg.TRAIL_ENABLED:
+            trail_due = table.trail_count_before(t_next)
+            if trail_due > self.trail_points_added:
+                self.projectile_trail.extend(table.trail_points_px[self.trail_points_added:trail_due])
+                self.trail_points_added = trail_due
+
+        self.step_pos_px, self.step_v_px_s = table.lookup(t_next)
+        self.sim_time_sec = t_next
+        if self.exporter is not None and t_next - self.exported_time_sec > 1e-9: # Replayed after a seek back: already written (up to rounding)
+            self.exporter.write(t_next, self.step_pos_px, self.step_v_px_s)
+            self.exported_time_sec = t_next
+
+        # --- Fire the scheduled events this step reached (no per-step condition polling) ---
+        while self.next_event_index < len(self.event_schedule) and self.event_schedule[self.next_event_index][0] <= t_next:
+            t_event, name = self.event_schedule[self.next_event_index]
+            self.next_event_index += 1
+            if name == "flight_end":
+                self._finish_flight()
+            else:
+                self.passed_events.append((name, t_event, self.trajectory_events[name][1]))
+
+    def _finish_flight(self):
+        """Stops the simulation once the target time has been reached."""
+        self.simulation_running = False # Stop the simulation state
+        self.accumulator_sec = 0.0
+        self.current_t_elapsed_sec = self.time_to_target_sec / self.simulation_speed_multiplier if self.simulation_speed_multiplier > 0 else 0
+
+        # --- Set flag to show peak info AFTER simulation ends (if applicable scene) ---
+        if self.scene.shows_peak and cfg.PEAK_DOT_ENABLED and self.peak_position_px is not None:
+            self.show_peak_info = True # Sadece sim bittiğinde göster
+
+        # --- Add final point to trail if enabled ---
+        if cfg.TRAIL_ENABLED:
+            if self.projectile_trail.last() != tuple(self.step_pos_px):
+                self.projectile_trail.append(self.step_pos_px)
+
+    # --- Timeline (seek / scrub) ---
+
+    @property
+    def playback_time_sec(self):
+        """Effective simulation time of the launch currently shown (0 .. flight_end_sec)."""
+        return min(self.sim_time_sec + self.accumulator_sec, self.flight_end_sec)
+
+    def seek(self, t_sec):
+        """
+        Jumps the current launch to effective time t_sec (clamped to the flight).
+
+        The state comes straight from the trajectory table and the trail is rebuilt from its
+        precomputed points, so the cost does not depend on how far the jump is. Seeking to the
+        end finishes the flight; seeking back from a finished flight resumes it (the paused
+        flag is kept). The exporter keeps one time-ordered series per launch: after a seek
+        back nothing is written until playback passes the newest exported time, and a seek
+        forward leaves a gap.
+
+        Returns:
+            bool: False if there is no launch to seek in.
+        """
+        table = self.trajectory_table
+        if table is None:
+            return False
+        t_sec = min(max(t_sec, 0.0), self.flight_end_sec)
+        self.sim_time_sec = t_sec
+        self.accumulator_sec = 0.0
+        self.last_update_clock_sec = self.clock_sec # Clock time before the seek is not played afterwards
+        self.step_pos_px, self.step_v_px_s = table.lookup(t_sec)
+        self.projectile.update_position(self.step_pos_px)
+        self.current_vx_px_s, self.current_vy_px_s = self.step_v_px_s
+        self.current_t_elapsed_sec = t_sec / self.simulation_speed_multiplier if self.simulation_speed_multiplier > 0 else 0
+
+        # Trail: exactly the points the forward run would have added by t_sec (the newest ones that fit)
+        self.projectile_trail.clear()
+        self.trail_points_added = 0
+        if cfg.TRAIL_ENABLED:
+            trail_due = table.trail_count_before(t_sec)
+            self.projectile_trail.extend(table.trail_points_px[max(0, trail_due - self.projectile_trail.capacity):trail_due])
+            self.trail_points_added = trail_due
+
+        # Events: everything scheduled up to t_sec has happened
+        event_times = [t_event for t_event, _ in self.event_schedule]
+        self.next_event_index = bisect_right(event_times, t_sec)
+        self.passed_events = [(name, t_event, self.trajectory_events[name][1])
+                              for t_event, name in self.event_schedule[:self.next_event_index] if name != "flight_end"]
+
+        if t_sec >= self.flight_end_sec:
+            self._finish_flight()
+        else:
+            self.simulation_running = True
+            self.show_peak_info = False # Shown again once the flight is finished
+        return True
+
+    def step_frame(self, frames=1):
+        """Pauses and moves the current launch by frames * cfg.SCRUB_FRAME_SEC (negative: backwards)."""
+        if self.trajectory_table is None:
+            return False
+        self.simulation_paused = True
+        return self.seek(self.playback_time_sec + frames * cfg.SCRUB_FRAME_SEC)
+
+    def toggle_reverse(self):
+        """Switches between forward and reverse playback of the current launch."""
+        self.playback_direction = -self.playback_direction
+        self.last_update_clock_sec = self.clock_sec
+
+    def _update_reverse(self, frame_dt_sec):
+        """
+        Reverse playback: seeks backwards by the frame's (speed-scaled) clock time. At t = 0 the
+        launch is back at its start: the flight stops (ready for a new launch) and playback
+        turns forward again.
+        """
+        if self.trajectory_table is None or self.simulation_paused:
+            return
+        if self.playback_time_sec > 0:
+            frame_dt_sec = max(0.0, min(frame_dt_sec, cfg.MAX_FRAME_TIME_SEC))
+            self.seek(self.playback_time_sec - frame_dt_sec * self.simulation_speed_multiplier)
+        if self.playback_time_sec <= 0:
+            self.simulation_running = False
+            self.playback_direction = 1
+
+    # --- State for UI ---
+
+    @property
+    def display_t_elapsed(self):
+        """Elapsed time shown to the user, clamped to the flight duration."""
+        if self.time_to_target_sec > 0 and self.simulation_speed_multiplier > 0:
+            return min(self.current_t_elapsed_sec, self.time_to_target_sec / self.simulation_speed_multiplier)
+        return max(self.current_t_elapsed_sec, 0.0)
+
+    def get_game_state(self):
+        """Returns the state dictionary consumed by UIManager.draw_all."""
+        return {
+            'projectile': self.projectile, 'target': self.target,
+            'simulation_running': self.simulation_running, 'simulation_paused': self.simulation_paused,
+            'simulation_speed_multiplier': self.simulation_speed_multiplier,
+            'time_to_target_sec': self.time_to_target_sec,
+            'current_t_elapsed_sec': self.display_t_elapsed,
+            'launch_v0x_px_s': self.launch_v0x_px_s, 'launch_v0y_px_s': self.launch_v0y_px_s,
+            'launch_v0x_mps_display': self.launch_v0x_mps_display, 'launch_v0y_mps_display': self.launch_v0y_mps_display,
+            'current_vx_px_s': self.current_vx_px_s, 'current_vy_px_s': self.current_vy_px_s,
+            'swarm': self.swarm,
+            'scene_title': self.scene_config.get("title", ""),
+            'active_scene_name': self.scene_name
+        }
@@ -0,0 +1,292 @@
+# swarm.py
+# -*- coding: utf-8 -*-
+import numpy as np
+import pygame
+import config as cfg
+from physics import PhysicsEngine
+
+
+class ProjectileSwarm:
+    """
+    Many projectiles kept in struct-of-arrays storage (one NumPy array per field).
+
+    Slots hold the launch position, launch velocity and launch time of each projectile;
+    update(t) evaluates the closed-form (drag-free) motion of every slot in a few array
+    operations, or integrates all slots as one batch with an engine without closed form
+    (DragPhysicsEngine), and draw() blits one prerendered circle per visible projectile in
+    a single Surface.blits call. A projectile dies when it leaves the window through the bottom or
+    the sides, and its slot is reused by the next spawn.
+    """
+
+    def __init__(self, capacity, physics_engine=None, radius=None, color=None):
+        """
+        Args:
+            capacity (int): Maximum number of projectiles alive at the same time.
+            physics_engine (PhysicsEngine): Gravity and launch velocity solver (default: PhysicsEngine()).
+            radius (int): Circle radius in pixels (default: cfg.SWARM_PROJECTILE_RADIUS_PX).
+            color (tuple): Circle color (default: cfg.SWARM_PROJECTILE_COLOR).
+        """
+        self.capacity = max(1, int(capacity))
+        self.physics_engine = physics_engine if physics_engine is not None else PhysicsEngine()
+        self.radius = cfg.SWARM_PROJECTILE_RADIUS_PX if radius is None else radius
+        self.color = cfg.SWARM_PROJECTILE_COLOR if color is None else color
+        self.initial_pos_px = np.zeros((self.capacity, 2))
+        self.v0_px_s = np.zeros((self.capacity, 2))
+        self.launch_time_sec = np.zeros(self.capacity)
+        self.pos_px = np.zeros((self.capacity, 2)) # Positions at time_sec
+        self.v_px_s = np.zeros((self.capacity, 2)) # Velocities at time_sec
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.time_sec = 0.0 # Swarm time of the latest update()
+        # Scratch arrays reused by every update()
+        self._elapsed = np.zeros((self.capacity, 1))
+        self._term = np.zeros((self.capacity, 2))
+        self._gone = np.zeros(self.capacity, dtype=bool)
+        self._sprite = None
+        self._sprite_key = None
+
+    def __len__(self):
+        """Number of live projectiles."""
+        return int(np.count_nonzero(self.alive))
+
+    def clear(self):
+        """Kills every projectile."""
+        self.alive[:] = False
+
+    # --- Spawning ---
+
+    def spawn(self, initial_pos_px, v0_px_s, launch_time_sec=None):
+        """
+        Adds projectiles (inputs broadcast against each other with NumPy rules).
+
+        Args:
+            initial_pos_px (array_like): Launch [x, y] positions in pixels, shape (n, 2) or (2,).
+            v0_px_s (array_like): Launch [vx, vy] velocities in pixels/sec (Pygame coords), shape (n, 2) or (2,).
+            launch_time_sec (array_like): Swarm times of the launches, shape (n,) or scalar
+                                          (default: now). Later times wait at their launch position.
+
+        Returns:
+            np.ndarray: Slot indices of the new projectiles.
+
+        Raises:
+            ValueError: If there are not enough free slots.
+        """
+        launch_time_sec = self.time_sec if launch_time_sec is None else launch_time_sec
+        initial_pos_px, v0_px_s = np.broadcast_arrays(np.asarray(initial_pos_px, dtype=np.float64).reshape(-1, 2),
+                                                      np.asarray(v0_px_s, dtype=np.float64).reshape(-1, 2))
+        count = len(initial_pos_px)
+        free = np.flatnonzero(~self.alive)
+        if count > len(free):
+            raise ValueError(f"Swarm is full: {count} projectiles requested, {len(free)} free slots of {self.capacity}")
+        slots = free[:count]
+        self.initial_pos_px[slots] = initial_pos_px
+        self.v0_px_s[slots] = v0_px_s
+        self.launch_time_sec[slots] = launch_time_sec
+        self.pos_px[slots] = initial_pos_px
+        self.v_px_s[slots] = v0_px_s
+        self.alive[slots] = True
+        return slots
+
+    def spawn_volley(self, initial_pos_px, target_center_px, time_to_target_sec, launch_time_sec=None):
+        """
+        Launches projectiles that reach the target center(s) after the given flight time(s).
+
+        Args:
+            initial_pos_px (array_like): Launch [x, y] positions, shape (n, 2) or (2,).
+            target_center_px (array_like): Target [x, y] centers, shape (n, 2) or (2,).
+            time_to_target_sec (array_like): Flight times in seconds, shape (n,) or scalar.
+            launch_time_sec (array_like): As in spawn().
+
+        Returns:
+            np.ndarray: Slot indices of the new projectiles.
+        """
+        v0x_px_s, v0y_px_s = self.physics_engine.solve_launch_velocities_batch(initial_pos_px, target_center_px, time_to_target_sec)
+        v0_px_s = np.stack(np.broadcast_arrays(v0x_px_s, v0y_px_s), axis=-1)
+        return self.spawn(initial_pos_px, v0_px_s, launch_time_sec)
+
+    def spawn_spread(self, initial_pos_px, speed_px_s, angles_deg, launch_time_sec=None):
+        """
+        Launches a fan of projectiles from one point with the same speed.
+
+        Args:
+            initial_pos_px (list): Launch [x, y] position in pixels.
+            speed_px_s (float): Launch speed in pixels/sec.
+            angles_deg (array_like): Launch angles above the horizontal in degrees, shape (n,).
+            launch_time_sec (array_like): As in spawn().
+
+        Returns:
+            np.ndarray: Slot indices of the new projectiles.
+        """
+        angles_rad = np.radians(np.asarray(angles_deg, dtype=np.float64).reshape(-1))
+        v0_px_s = np.column_stack((speed_px_s * np.cos(angles_rad), -speed_px_s * np.sin(angles_rad))) # Up is -y
+        return self.spawn(initial_pos_px, v0_px_s, launch_time_sec)
+
+    # --- Update ---
+
+    def update(self, t_sec):
+        """Moves every live projectile to swarm time t_sec and kills the ones that left the window."""
+        if self.physics_engine.has_closed_form:
+            self._update_closed_form(t_sec)
+        else:
+            self._update_integrated(t_sec)
+        self.time_sec = t_sec
+
+        # Out through the bottom or the sides (above the top is fine: it comes back down)
+        gone = self._gone
+        np.greater(self.pos_px[:, 1], cfg.HEIGHT + self.radius, out=gone)
+        gone |= self.pos_px[:, 0] < -self.radius
+        gone |= self.pos_px[:, 0] > cfg.WIDTH + self.radius
+        self.alive &= ~gone
+
+    def _update_closed_form(self, t_sec):
+        """Evaluates the drag-free motion of every slot at t_sec."""
+        elapsed = self._elapsed
+        term = self._term
+        gravity_px_s2 = self.physics_engine.gravity_px_s2
+
+        # Time since launch, 0 for projectiles still waiting to be launched
+        np.subtract(t_sec, self.launch_time_sec, out=elapsed[:, 0])
+        np.maximum(elapsed, 0.0, out=elapsed)
+
+        # pos = p0 + v0 * t + 0.5 * g * t^2 (gravity on y only), v = v0 + g * t
+        np.multiply(self.v0_px_s, elapsed, out=term)
+        np.add(self.initial_pos_px, term, out=self.pos_px)
+        np.square(elapsed[:, 0], out=term[:, 0])
+        self.pos_px[:, 1] += 0.5 * gravity_px_s2 * term[:, 0]
+        self.v_px_s[:, 0] = self.v0_px_s[:, 0]
+        np.multiply(elapsed[:, 0], gravity_px_s2, out=self.v_px_s[:, 1])
+        self.v_px_s[:, 1] += self.v0_px_s[:, 1]
+
+    def _update_integrated(self, t_sec):
+        """
+        Integrates the launched slots from swarm time self.time_sec (or from their launch if
+        that is later) to t_sec with the engine. Going back in time starts them over from the launch.
+        """
+        if t_sec < self.time_sec:
+            self.pos_px[:] = self.initial_pos_px
+            self.v_px_s[:] = self.v0_px_s
+            from_sec = self.launch_time_sec
+        else:
+            from_sec = np.maximum(self.launch_time_sec, self.time_sec)
+        flying = np.flatnonzero(self.alive & (self.launch_time_sec < t_sec))
+        durations_sec = t_sec - from_sec[flying]
+        for duration_sec in np.unique(durations_sec): # One batch per launch time inside this update (usually one)
+            slots = flying[durations_sec == duration_sec]
+            state = self.physics_engine.make_state(self.pos_px[slots], self.v_px_s[slots])
+            self.physics_engine.integrate(state, float(duration_sec))
+            self.pos_px[slots] = state[:, :2]
+            self.v_px_s[slots] = state[:, 2:]
+
+    def advance(self, dt_sec):
+        """Advances swarm time by dt_sec."""
+        self.update(self.time_sec + dt_sec)
+
+    # --- Drawing ---
+
+    def _get_sprite(self):
+        """Circle surface shared by every projectile (rebuilt if radius or color change)."""
+        key = (self.radius, self.color)
+        if self._sprite_key != key:
+            size = 2 * self.radius + 1
+            self._sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(self._sprite, self.color, (self.radius, self.radius), self.radius)
+            self._sprite_key = key
+        return self._sprite
+
+    def visible_indices(self):
+        """Slots of the live, already launched projectiles whose center is inside the window."""
+        x = self.pos_px[:, 0]
+        y = self.pos_px[:, 1]
+        visible = self.alive & (self.launch_time_sec <= self.time_sec) & (x >= 0) & (x <= cfg.WIDTH) & (y >= 0) & (y <= cfg.HEIGHT)
+        return np.flatnonzero(visible)
+
+    def draw(self, surface):
+        """
+        Draws all visible projectiles with one blits call.
+
+        Returns:
+            pygame.Rect: Bounding rect of everything drawn, or None if nothing was drawn.
+        """
+        indices = self.visible_indices()
+        if not len(indices):
+            return None
+        sprite = self._get_sprite()
+        top_left = self.pos_px[indices].astype(int) - self.radius # Same rounding as Projectile.draw
+        surface.blits([(sprite, dest) for dest in top_left.tolist()], doreturn=False)
+        left, top = top_left.min(axis=0).tolist()
+        right, bottom = top_left.max(axis=0).tolist()
+        size = sprite.get_width()
+        return pygame.Rect(left, top, right - left + size, bottom - top + size).clip(surface.get_rect())
+
+    # --- Single-Object Access ---
+
+    def view(self, index):
+        """Projectile-compatible view of one slot (see ProjectileView)."""
+        return ProjectileView(self, index)
+
+
+class ProjectileView:
+    """
+    Thin game_objects.Projectile stand-in backed by one ProjectileSwarm slot, for code
+    written against a single projectile (UI, Simulation helpers).
+
+    Positions are returned as new lists, so assigning to an element (view.current_pos_px[0] = x)
+    does not reach the swarm; use update_position() / set_initial_position() instead.
+    """
+    __slots__ = ("swarm", "index")
+
+    def __init__(self, swarm, index):
+        self.swarm = swarm
+        self.index = int(index)
+
+    @property
+    def radius(self):
+        return self.swarm.radius
+
+    @property
+    def color(self):
+        return self.swarm.color
+
+    @property
+    def initial_pos_px(self):
+        return self.swarm.initial_pos_px[self.index].tolist()
+
+    @initial_pos_px.setter
+    def initial_pos_px(self, pos_px):
+        self.swarm.initial_pos_px[self.index] = pos_px
+
+    @property
+    def current_pos_px(self):
+        return self.swarm.pos_px[self.index].tolist()
+
+    @current_pos_px.setter
+    def current_pos_px(self, pos_px):
+        self.swarm.pos_px[self.index] = pos_px
+
+    @property
+    def current_v_px_s(self):
+        return self.swarm.v_px_s[self.index].tolist()
+
+    @property
+    def alive(self):
+        return bool(self.swarm.alive[self.index])
+
+    def set_initial_position(self, pos_px):
+        """Sets both initial and current position."""
+        self.initial_pos_px = pos_px
+        self.current_pos_px = pos_px
+
+    def reset_to_initial(self):
+        """Resets the current position to the initial position."""
+        self.swarm.pos_px[self.index] = self.swarm.initial_pos_px[self.index]
+
+    def update_position(self, new_pos_px):
+        """Updates the current position (overwritten by the next swarm update())."""
+        self.current_pos_px = new_pos_px
+
+    def draw(self, surface):
+        """Draws this projectile alone. Returns the drawn rect (None if off-screen)."""
+        center_x_int = int(self.swarm.pos_px[self.index, 0])
+        center_y_int = int(self.swarm.pos_px[self.index, 1])
+        if 0 <= center_x_int <= cfg.WIDTH and 0 <= center_y_int <= cfg.HEIGHT:
+            return pygame.draw.circle(surface, self.color, (center_x_int, center_y_int), self.radius)
+        return None
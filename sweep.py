@@ -0,0 +1,131 @@
+# sweep.py
+# -*- coding: utf-8 -*-
+import os
+import glob
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from physics import PhysicsEngine
+
+# Grid shared with worker processes (set once per worker by _init_worker)
+_worker_grid = None
+
+def _init_worker(start_positions_px, target_positions_px, flight_times_sec):
+    """Process pool initializer: keeps the grid axes in the worker so tasks only carry index ranges."""
+    global _worker_grid
+    _worker_grid = (start_positions_px, target_positions_px, flight_times_sec)
+
+def _solve_chunk(output_dir, chunk_index, first_cell, last_cell):
+    """Solves grid cells [first_cell, last_cell) and writes them to the chunk's .npz file."""
+    start_positions_px, target_positions_px, flight_times_sec = _worker_grid
+    shape = (len(start_positions_px), len(target_positions_px), len(flight_times_sec))
+    start_idx, target_idx, time_idx = np.unravel_index(np.arange(first_cell, last_cell), shape)
+
+    initial_pos_px = start_positions_px[start_idx]
+    target_center_px = target_positions_px[target_idx]
+    time_to_target_sec = flight_times_sec[time_idx]
+    v0x_px_s, v0y_px_s = PhysicsEngine().calculate_required_velocities_batch(initial_pos_px, target_center_px, time_to_target_sec)
+
+    # Write under a temporary name first so an interrupted run never leaves a half-written chunk
+    final_path = ParameterSweep.chunk_path(output_dir, chunk_index)
+    tmp_path = final_path + ".tmp.npz"
+    np.savez(tmp_path, cell_index=np.arange(first_cell, last_cell, dtype=np.int64),
+             start_x_px=initial_pos_px[:, 0], start_y_px=initial_pos_px[:, 1],
+             target_x_px=target_center_px[:, 0], target_y_px=target_center_px[:, 1],
+             time_to_target_sec=time_to_target_sec, v0x_px_s=v0x_px_s, v0y_px_s=v0y_px_s)
+    os.replace(tmp_path, final_path)
+    return chunk_index
+
+
+class ParameterSweep:
+    """
+    Solves the "Eğik Atış" launch velocities over a grid of start positions x target
+    positions x flight times, in parallel chunks.
+
+    Each chunk is written to its own .npz file in output_dir as soon as it completes;
+    running the same sweep again skips the chunks already on disk, so an interrupted
+    sweep resumes where it stopped.
+    """
+
+    GRID_FILE = "grid.npz"
+
+    def __init__(self, start_positions_px, target_positions_px, flight_times_sec, output_dir, chunk_size=1_000_000):
+        """
+        Args:
+            start_positions_px (array_like): Projectile start [x, y] positions in pixels, shape (S, 2).
+            target_positions_px (array_like): Target center [x, y] positions in pixels, shape (T, 2).
+            flight_times_sec (array_like): Flight times in seconds, shape (N,).
+            output_dir (str): Directory for the grid description and result chunks.
+            chunk_size (int): Grid cells per chunk (one task for one worker process).
+        """
+        self.start_positions_px = np.asarray(start_positions_px, dtype=np.float64).reshape(-1, 2)
+        self.target_positions_px = np.asarray(target_positions_px, dtype=np.float64).reshape(-1, 2)
+        self.flight_times_sec = np.asarray(flight_times_sec, dtype=np.float64).reshape(-1)
+        self.output_dir = output_dir
+        self.chunk_size = max(1, int(chunk_size))
+        self.total_cells = len(self.start_positions_px) * len(self.target_positions_px) * len(self.flight_times_sec)
+        self.num_chunks = -(-self.total_cells // self.chunk_size) # Ceiling division
+
+    @staticmethod
+    def chunk_path(output_dir, chunk_index):
+        return os.path.join(output_dir, f"chunk_{chunk_index:06d}.npz")
+
+    def _prepare_output_dir(self):
+        """Creates output_dir and its grid file, or checks that an existing one describes this same sweep."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        grid_path = os.path.join(self.output_dir, self.GRID_FILE)
+        if os.path.exists(grid_path):
+            with np.load(grid_path) as grid:
+                same_grid = (int(grid["chunk_size"]) == self.chunk_size
+                             and np.array_equal(grid["start_positions_px"], self.start_positions_px)
+                             and np.array_equal(grid["target_positions_px"], self.target_positions_px)
+                             and np.array_equal(grid["flight_times_sec"], self.flight_times_sec))
+            if not same_grid:
+                raise ValueError(f"'{self.output_dir}' holds results of a different sweep; use another output directory.")
+        else:
+            np.savez(grid_path, start_positions_px=self.start_positions_px, target_positions_px=self.target_positions_px,
+                     flight_times_sec=self.flight_times_sec, chunk_size=self.chunk_size)
+        # Leftovers of chunks that were being written when a previous run was interrupted
+        for tmp_path in glob.glob(os.path.join(self.output_dir, "chunk_*.tmp.npz")):
+            os.remove(tmp_path)
+
+    def pending_chunks(self):
+        """Indices of the chunks that have no result file yet."""
+        return [i for i in range(self.num_chunks) if not os.path.exists(self.chunk_path(self.output_dir, i))]
+
+    def run(self, max_workers=None, progress=None):
+        """
+        Solves all pending chunks across a process pool.
+
+        Args:
+            max_workers (int): Worker processes (default: os.cpu_count()).
+            progress (callable): Optional progress(chunks_done, num_chunks), called as chunks complete.
+
+        Returns:
+            int: Number of chunks solved by this call (0 if the sweep was already complete).
+        """
+        self._prepare_output_dir()
+        pending = self.pending_chunks()
+        done = self.num_chunks - len(pending)
+        if not pending:
+            return 0
+
+        init_args = (self.start_positions_px, self.target_positions_px, self.flight_times_sec)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=init_args) as executor:
+            futures = [executor.submit(_solve_chunk, self.output_dir, i, i * self.chunk_size,
+                                       min((i + 1) * self.chunk_size, self.total_cells))
+                       for i in pending]
+            for future in as_completed(futures):
+                future.result() # Re-raise worker errors
+                done += 1
+                if progress:
+                    progress(done, self.num_chunks)
+        return len(pending)
+
+    def iter_results(self):
+        """Yields the solved chunks in grid order as dicts of 1-D arrays (one chunk in memory at a time)."""
+        for i in range(self.num_chunks):
+            path = self.chunk_path(self.output_dir, i)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Chunk {i} has not been solved yet; call run() first.")
+            with np.load(path) as chunk:
+                yield {name: chunk[name] for name in chunk.files}
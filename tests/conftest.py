@@ -0,0 +1,9 @@
+# conftest.py
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+# The modules live flat in the repository root; tests never open a real window
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
@@ -0,0 +1,116 @@
+# test_drag.py
+# -*- coding: utf-8 -*-
+import math
+import numpy as np
+import pytest
+import config as cfg
+from drag import DragPhysicsEngine
+from physics import PhysicsEngine
+
+LAUNCHES = [((100.0, 600.0), (450.0, -520.0)), ((640.0, 200.0), (-130.0, 0.0)), ((50.0, 700.0), (0.0, -800.0))]
+
+
+def drag_free_engine(drag_model, integrator):
+    """DragPhysicsEngine whose drag constant is 0 for the given model."""
+    return DragPhysicsEngine(drag_model=drag_model, integrator=integrator, drag_coefficient=0.0, linear_drag_coeff_kg_s=0.0)
+
+
+@pytest.mark.parametrize("drag_model", DragPhysicsEngine.DRAG_MODELS)
+@pytest.mark.parametrize("integrator", DragPhysicsEngine.INTEGRATORS)
+def test_zero_drag_matches_kinematic_update(drag_model, integrator):
+    engine = drag_free_engine(drag_model, integrator)
+    assert engine.drag_constant == 0.0
+    duration_sec = 2.3
+    for initial_pos_px, v0_px_s in LAUNCHES:
+        state = engine.make_state(initial_pos_px, v0_px_s)
+        steps = engine.integrate(state, duration_sec)
+        exact_pos_px, exact_v_px_s = PhysicsEngine().calculate_kinematic_update(initial_pos_px, *v0_px_s, duration_sec)
+        np.testing.assert_allclose(state[0, 2:], exact_v_px_s, rtol=0, atol=1e-9)
+        if integrator == "semi_implicit_euler":
+            # First order: y runs ahead of the parabola by exactly g * T * dt / 2
+            exact_pos_px[1] += 0.5 * engine.gravity_px_s2 * duration_sec * (duration_sec / steps)
+        np.testing.assert_allclose(state[0, :2], exact_pos_px, rtol=0, atol=1e-8)
+
+
+@pytest.mark.parametrize("integrator", DragPhysicsEngine.INTEGRATORS)
+def test_zero_drag_sample_trajectory_matches_closed_form(integrator):
+    engine = drag_free_engine("quadratic", integrator)
+    times_sec = np.append(np.arange(200) * cfg.TRAJECTORY_SAMPLE_DT_SEC, 1.7)
+    pos_px, v_px_s = engine.sample_trajectory((100.0, 600.0), (450.0, -520.0), times_sec)
+    exact_pos_px, exact_v_px_s = PhysicsEngine().sample_trajectory((100.0, 600.0), (450.0, -520.0), times_sec)
+    np.testing.assert_allclose(v_px_s, exact_v_px_s, rtol=0, atol=1e-9)
+    if integrator == "semi_implicit_euler": # First order: at most g * t * dt / 2 ahead of the parabola
+        assert np.all(np.abs(pos_px - exact_pos_px).max(axis=1) <= 0.5 * engine.gravity_px_s2 * times_sec * cfg.DRAG_TIMESTEP_SEC + 1e-6)
+    else:
+        np.testing.assert_allclose(pos_px, exact_pos_px, rtol=0, atol=1e-8)
+
+
+@pytest.mark.parametrize("integrator", DragPhysicsEngine.INTEGRATORS)
+def test_sample_trajectory_is_one_pass_through_the_sample_times(integrator):
+    engine = DragPhysicsEngine(drag_model="quadratic", integrator=integrator)
+    times_sec = [0.0, 0.013, 0.25, 0.6, 1.0, 1.999, 2.4]
+    pos_px, v_px_s = engine.sample_trajectory((100.0, 600.0), (450.0, -520.0), times_sec)
+
+    # Same as carrying one state from sample time to sample time
+    state = engine.make_state((100.0, 600.0), (450.0, -520.0))
+    t_prev = 0.0
+    for i, t_sec in enumerate(times_sec):
+        engine.integrate(state, t_sec - t_prev)
+        t_prev = t_sec
+        atol = 1e-3 if integrator == "rk45" else 0.0 # rk45 keeps its step size across samples
+        np.testing.assert_allclose(pos_px[i], state[0, :2], rtol=0, atol=atol)
+        np.testing.assert_allclose(v_px_s[i], state[0, 2:], rtol=0, atol=atol)
+
+    # Higher order integrators stay close to a fine reference solution (Euler's accuracy: see the convergence test)
+    if integrator != "semi_implicit_euler":
+        reference_px, _ = DragPhysicsEngine(drag_model="quadratic").sample_trajectory(
+            (100.0, 600.0), (450.0, -520.0), times_sec, dt_sec=1 / 3840, integrator="rk4")
+        np.testing.assert_allclose(pos_px, reference_px, rtol=0, atol=1e-3)
+
+
+def test_integration_error_converges_at_the_integrator_order():
+    engine = DragPhysicsEngine()
+    pos, vel = [launch[0] for launch in LAUNCHES], [launch[1] for launch in LAUNCHES]
+    # Drag-free reference: semi-implicit Euler is first order, RK4 and RK45 are exact for constant gravity
+    euler = [engine.integration_error(pos, vel, 3.0, dt_sec, "semi_implicit_euler")['max_pos_error_px'] for dt_sec in (1 / 60, 1 / 120, 1 / 240)]
+    assert euler[0] / euler[1] == pytest.approx(2.0, rel=0.02)
+    assert euler[1] / euler[2] == pytest.approx(2.0, rel=0.02)
+    for integrator in ("rk4", "rk45"):
+        report = engine.integration_error(pos, vel, 3.0, 1 / 60, integrator)
+        assert report['max_pos_error_px'] < 1e-8 and report['max_vel_error_px_s'] < 1e-8
+
+    # With drag, against a fine RK4 reference: halving dt divides the error by 2 (Euler) and 16 (RK4).
+    # Launches that stay away from v = 0, where quadratic drag |v|·v is not smooth enough for 4th order
+    pos, vel = pos[:2], vel[:2]
+    reference_px = engine.calculate_drag_batch(pos, vel, 3.0, dt_sec=1 / 7680, integrator="rk4")[0]
+    for integrator, order in (("semi_implicit_euler", 1), ("rk4", 4)):
+        errors = [np.abs(engine.calculate_drag_batch(pos, vel, 3.0, dt_sec, integrator)[0] - reference_px).max()
+                  for dt_sec in (1 / 30, 1 / 60, 1 / 120)]
+        for coarse, fine in zip(errors, errors[1:]):
+            assert math.log2(coarse / fine) == pytest.approx(order, abs=0.3)
+
+
+def test_workspace_kept_at_largest_batch():
+    engine = DragPhysicsEngine()
+    engine.integrate(engine.make_state(np.zeros((64, 2)), np.ones((64, 2))), 0.1)
+    workspace = engine._workspace
+    for n in (1, 64, 7, 1, 32):
+        state = engine.make_state(np.zeros((n, 2)), np.full((n, 2), 100.0))
+        engine.integrate(state, 0.1)
+        assert engine._workspace is workspace # Smaller batches use views, nothing is reallocated
+        assert engine._workspace_view.n == n and engine._workspace_view.tmp.shape == (n, 4)
+        assert np.shares_memory(engine._workspace_view.tmp, workspace.tmp) or n == 64
+    engine.integrate(engine.make_state(np.zeros((65, 2)), np.ones((65, 2))), 0.1)
+    assert engine._workspace.n == 65
+
+
+def test_batch_results_do_not_depend_on_earlier_batch_sizes():
+    fresh, reused = DragPhysicsEngine(), DragPhysicsEngine()
+    reused.integrate(reused.make_state(np.zeros((50, 2)), np.ones((50, 2))), 0.5)
+    for n in (3, 1):
+        rows = [launch for launch in LAUNCHES][:n]
+        a = fresh.make_state([r[0] for r in rows], [r[1] for r in rows])
+        b = a.copy()
+        fresh.integrate(a, 1.3)
+        reused.integrate(b, 1.3)
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,144 @@
+# test_drag_solver.py
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+import config as cfg
+from drag import DragPhysicsEngine
+
+START_PX = (120.0, 640.0)
+TARGET_PX = (1040.0, 420.0)
+
+
+def landing_px(engine, initial_pos_px, v0_px_s, time_to_target_sec):
+    """Where the launches are after time_to_target_sec, integrated finely (independent of the solver's shots)."""
+    state = engine.make_state(initial_pos_px, v0_px_s)
+    engine.integrate(state, time_to_target_sec, dt_sec=1 / 2000, integrator="rk4")
+    return state[:, :2]
+
+
+@pytest.mark.parametrize("drag_model", DragPhysicsEngine.DRAG_MODELS)
+@pytest.mark.parametrize("time_to_target_sec", (0.6, 2.0, 3.5))
+def test_scalar_solve_round_trip(drag_model, time_to_target_sec):
+    engine = DragPhysicsEngine(drag_model=drag_model)
+    v0x, v0y, converged = engine.solve_required_velocities(START_PX, TARGET_PX, time_to_target_sec)
+    assert converged
+    end_px = landing_px(engine, START_PX, (v0x, v0y), time_to_target_sec)[0]
+    assert np.hypot(*(end_px - TARGET_PX)) <= cfg.DRAG_SOLVER_TOLERANCE_PX + 1e-3
+    # Drag slows the shot down, so it needs more than the drag-free velocity
+    free_v0x, _ = engine.calculate_required_velocities(START_PX, TARGET_PX, time_to_target_sec)
+    assert v0x > free_v0x
+
+
+def test_batch_solve_round_trip():
+    engine = DragPhysicsEngine()
+    rng = np.random.default_rng(3)
+    n = 4 * cfg.DRAG_SOLVER_SCALAR_MAX_ROWS + 3 # Vectorized _newton_solve path
+    targets_px = np.column_stack((rng.uniform(300, 1200, n), rng.uniform(100, 700, n)))
+    v0x, v0y, converged = engine.solve_required_velocities_batch(START_PX, targets_px, 1.8)
+    assert converged.all()
+    end_px = landing_px(engine, START_PX, np.column_stack((v0x, v0y)), 1.8)
+    assert np.hypot(*(end_px - targets_px).T).max() <= cfg.DRAG_SOLVER_TOLERANCE_PX + 1e-3
+
+    # Same answers as the plain-float path, one row at a time
+    scalar_engine = DragPhysicsEngine()
+    for i in range(0, n, 7):
+        sx, sy, ok = scalar_engine.solve_required_velocities(START_PX, targets_px[i], 1.8)
+        assert ok
+        assert abs(sx - v0x[i]) < 0.05 and abs(sy - v0y[i]) < 0.05
+
+
+def test_newton_solve_rows_are_independent():
+    engine = DragPhysicsEngine()
+    starts = np.array([START_PX, (400.0, 500.0), (50.0, 700.0)])
+    targets = np.array([TARGET_PX, (900.0, 650.0), (60.0, 100.0)])
+    times = np.array([2.0, 0.7, 1.4])
+    v0_px_s, converged = engine._newton_solve(starts, targets, times)
+    assert converged.all()
+    for i in range(3):
+        end_px = landing_px(engine, starts[i], v0_px_s[i], times[i])[0]
+        assert np.hypot(*(end_px - targets[i])) <= cfg.DRAG_SOLVER_TOLERANCE_PX + 1e-3
+
+
+def test_non_positive_time_gives_zero_velocity():
+    v0x, v0y, converged = DragPhysicsEngine().solve_required_velocities_batch(START_PX, TARGET_PX, [0.0, -1.0])
+    assert v0x.tolist() == [0.0, 0.0] and v0y.tolist() == [0.0, 0.0] and converged.all()
+
+
+def test_cache_hit_skips_the_solver(monkeypatch):
+    engine = DragPhysicsEngine()
+    first = engine.solve_required_velocities(START_PX, TARGET_PX, 2.0)
+    assert len(engine._solution_cache) == 1
+
+    def fail(*args):
+        raise AssertionError("cached configuration was solved again")
+    monkeypatch.setattr(engine, "_newton_solve_scalar", fail)
+    monkeypatch.setattr(engine, "_newton_solve", fail)
+    noisy_start = (START_PX[0] + 1e-9, START_PX[1] - 1e-9) # Float noise from slider math
+    assert engine.solve_required_velocities(noisy_start, TARGET_PX, 2.0) == first
+    v0x, v0y, converged = engine.solve_required_velocities_batch(START_PX, [TARGET_PX] * 20, 2.0)
+    assert converged.all() and np.all(v0x == first[0]) and np.all(v0y == first[1])
+
+    # A different drag configuration is a different key
+    engine.drag_coefficient *= 2
+    with pytest.raises(AssertionError):
+        engine.solve_required_velocities(START_PX, TARGET_PX, 2.0)
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(cfg, "DRAG_SOLVER_CACHE_MAX_ENTRIES", 3)
+    engine = DragPhysicsEngine()
+    for time_to_target_sec in (1.0, 1.5, 2.0):
+        engine.solve_required_velocities(START_PX, TARGET_PX, time_to_target_sec)
+    engine.solve_required_velocities(START_PX, TARGET_PX, 1.0) # Hit: 1.0 becomes the newest
+    engine.solve_required_velocities(START_PX, TARGET_PX, 2.5) # Evicts 1.5
+    cached_times = [key[4] for key in engine._solution_cache]
+    assert cached_times == [2.0, 1.0, 2.5]
+
+
+def test_scalar_warm_start_needs_fewer_shots(monkeypatch):
+    engine = DragPhysicsEngine()
+    shots = []
+    shoot = engine._shoot_scalar
+    monkeypatch.setattr(engine, "_shoot_scalar", lambda *args: shots.append(1) or shoot(*args))
+
+    (vx, vy), converged = engine._newton_solve_scalar(START_PX, TARGET_PX, 2.0)
+    assert converged
+    cold_shots = len(shots)
+    assert engine._last_jacobian is not None and engine._last_drag_correction != (0.0, 0.0)
+
+    # A slider moved the target a little: drag correction and Jacobian carry over
+    del shots[:]
+    (vx2, vy2), converged = engine._newton_solve_scalar(START_PX, (TARGET_PX[0] + 3.0, TARGET_PX[1] - 2.0), 2.0)
+    assert converged
+    assert len(shots) <= 3 < cold_shots
+    end_px = landing_px(engine, START_PX, (vx2, vy2), 2.0)[0]
+    assert np.hypot(end_px[0] - TARGET_PX[0] - 3.0, end_px[1] - TARGET_PX[1] + 2.0) <= cfg.DRAG_SOLVER_TOLERANCE_PX + 1e-3
+
+
+def test_non_convergence_is_reported(monkeypatch):
+    monkeypatch.setattr(cfg, "DRAG_SOLVER_MAX_ITERATIONS", 0) # Only the drag-free first guess is tried
+    engine = DragPhysicsEngine()
+    free_v0 = engine.calculate_required_velocities(START_PX, TARGET_PX, 2.0)
+
+    v0x, v0y, converged = engine.solve_required_velocities(START_PX, TARGET_PX, 2.0)
+    assert not converged
+    assert (v0x, v0y) == pytest.approx(free_v0) # Last iterate: the first guess
+    assert not engine._solution_cache # Failures are not cached
+
+    v0_px_s, converged = engine._newton_solve(np.array([START_PX] * 2), np.array([TARGET_PX] * 2), np.array([2.0, 2.0]))
+    assert not converged.any()
+
+    # The scene hook raises the user message; the batch hook returns the iterates
+    with pytest.raises(ValueError):
+        engine.solve_launch_velocities(START_PX, TARGET_PX, 2.0)
+    v0x, v0y = engine.solve_launch_velocities_batch(START_PX, [TARGET_PX] * 12, 2.0)
+    assert len(v0x) == 12
+
+
+def test_simulation_launch_reports_solver_failure(monkeypatch):
+    from simulation import Simulation
+    simulation = Simulation("Eğik Atış", physics_engine=DragPhysicsEngine())
+    monkeypatch.setattr(cfg, "DRAG_SOLVER_MAX_ITERATIONS", 0)
+    error = simulation.launch(2.0)
+    assert error == "Hava direnciyle bu sürede hedefe ulaşan atış bulunamadı!"
+    assert not simulation.simulation_running
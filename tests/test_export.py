@@ -0,0 +1,127 @@
+# test_export.py
+# -*- coding: utf-8 -*-
+import csv
+import json
+import os
+import zipfile
+import numpy as np
+import pytest
+from export import COLUMNS, TrajectoryExporter, CsvExporter, NpzExporter, ColumnarExporter, iter_columnar, open_exporter, to_si
+
+BUFFER_ROWS = 4
+
+
+def make_samples(n):
+    rng = np.random.default_rng(n)
+    t_sec = np.arange(n) / 120.0
+    return t_sec, rng.uniform(0, 800, (n, 2)), rng.uniform(-500, 500, (n, 2))
+
+
+def export_samples(exporter, t_sec, pos_px, v_px_s):
+    """Writes the first half one row at a time and the rest as one batch."""
+    half = len(t_sec) // 2
+    with exporter:
+        for i in range(half):
+            exporter.write(t_sec[i], pos_px[i], v_px_s[i])
+        exporter.write_batch(t_sec[half:], pos_px[half:], v_px_s[half:])
+    return exporter
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        assert tuple(next(reader)) == COLUMNS
+        return np.array([[float(value) for value in row] for row in reader]).reshape(-1, len(COLUMNS))
+
+
+# Row counts around the buffer flush boundary
+ROW_COUNTS = (0, 1, BUFFER_ROWS - 1, BUFFER_ROWS, BUFFER_ROWS + 1, 2 * BUFFER_ROWS, 2 * BUFFER_ROWS + 3)
+
+
+@pytest.mark.parametrize("n", ROW_COUNTS)
+def test_csv_round_trip(tmp_path, n):
+    path = str(tmp_path / "run.csv")
+    samples = make_samples(n)
+    exporter = export_samples(CsvExporter(path, buffer_rows=BUFFER_ROWS), *samples)
+    assert exporter.rows_written == n
+    np.testing.assert_allclose(read_csv(path), to_si(*samples), rtol=1e-8, atol=1e-9) # Written with 9 significant digits
+
+
+@pytest.mark.parametrize("n", ROW_COUNTS)
+def test_npz_round_trip(tmp_path, n):
+    path = str(tmp_path / "run.npz")
+    samples = make_samples(n)
+    export_samples(NpzExporter(path, buffer_rows=BUFFER_ROWS), *samples)
+    expected = to_si(*samples)
+    with np.load(path) as archive:
+        assert sorted(archive.files) == sorted(COLUMNS)
+        for i, name in enumerate(COLUMNS):
+            assert archive[name].dtype == np.float64 and archive[name].shape == (n,)
+            np.testing.assert_array_equal(archive[name], expected[:, i])
+    assert os.listdir(tmp_path) == ["run.npz"] # Column temporaries removed
+
+
+def test_npz_members_use_version_2_header(tmp_path):
+    path = str(tmp_path / "run.npz")
+    export_samples(NpzExporter(path, buffer_rows=BUFFER_ROWS), *make_samples(11))
+    with zipfile.ZipFile(path) as archive:
+        for name in COLUMNS:
+            with archive.open(name + ".npy") as member:
+                assert np.lib.format.read_magic(member) == (2, 0)
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(member)
+                assert shape == (11,) and not fortran_order and dtype == np.dtype("<f8")
+                assert len(member.read()) == 11 * 8
+
+
+@pytest.mark.parametrize("n", ROW_COUNTS)
+def test_columnar_round_trip(tmp_path, n):
+    path = str(tmp_path / "run")
+    samples = make_samples(n)
+    export_samples(ColumnarExporter(path, buffer_rows=BUFFER_ROWS), *samples)
+    with open(os.path.join(path, ColumnarExporter.SCHEMA_FILE), encoding="utf-8") as schema_file:
+        schema = json.load(schema_file)
+    assert schema["rows"] == n and sum(schema["row_groups"]) == n
+    assert all(rows == BUFFER_ROWS for rows in schema["row_groups"][:-1]) # One row group per full buffer
+
+    groups = list(iter_columnar(path))
+    assert len(groups) == len(schema["row_groups"])
+    read_back = np.empty((0, len(COLUMNS)))
+    for group in groups:
+        read_back = np.vstack((read_back, np.column_stack([group[name] for name in COLUMNS])))
+    np.testing.assert_array_equal(read_back, to_si(*samples))
+
+
+def test_columnar_replaces_earlier_row_groups(tmp_path):
+    path = str(tmp_path / "run")
+    export_samples(ColumnarExporter(path, buffer_rows=BUFFER_ROWS), *make_samples(3 * BUFFER_ROWS))
+    export_samples(ColumnarExporter(path, buffer_rows=BUFFER_ROWS), *make_samples(2))
+    assert sum(len(group["t_s"]) for group in iter_columnar(path)) == 2
+    assert sorted(os.listdir(path)) == ["part_000000.npz", ColumnarExporter.SCHEMA_FILE]
+
+
+def test_flush_boundary_and_close():
+    written = []
+
+    class ListExporter(TrajectoryExporter): # Collects its blocks instead of writing a file
+        def _write_block(self, block):
+            written.append(block.copy())
+
+    exporter = ListExporter(None, buffer_rows=BUFFER_ROWS)
+    t_sec, pos_px, v_px_s = make_samples(2 * BUFFER_ROWS + 1)
+    for i in range(BUFFER_ROWS - 1):
+        exporter.write(t_sec[i], pos_px[i], v_px_s[i])
+    assert written == [] and exporter.rows_written == 0
+    exporter.write(t_sec[BUFFER_ROWS - 1], pos_px[BUFFER_ROWS - 1], v_px_s[BUFFER_ROWS - 1])
+    assert len(written) == 1 and exporter.rows_written == BUFFER_ROWS # Flushed exactly when full
+    exporter.write_batch(t_sec[BUFFER_ROWS:], pos_px[BUFFER_ROWS:], v_px_s[BUFFER_ROWS:])
+    assert [len(block) for block in written] == [BUFFER_ROWS, BUFFER_ROWS]
+    exporter.close()
+    exporter.close() # Safe to call twice
+    assert [len(block) for block in written] == [BUFFER_ROWS, BUFFER_ROWS, 1]
+    np.testing.assert_array_equal(np.concatenate(written), to_si(t_sec, pos_px, v_px_s))
+
+
+def test_open_exporter_picks_format_from_path(tmp_path):
+    for name, exporter_class in (("a.csv", CsvExporter), ("a.NPZ", NpzExporter), ("a_dir", ColumnarExporter)):
+        with open_exporter(str(tmp_path / name)) as exporter:
+            assert type(exporter) is exporter_class
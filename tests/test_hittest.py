@@ -0,0 +1,138 @@
+# test_hittest.py
+# -*- coding: utf-8 -*-
+import random
+import pygame
+import pytest
+import config as cfg
+from hittest import HitGrid
+from scenes import get_scene, scene_names
+from simulation import Simulation
+from ui import UIManager
+
+
+def first_hit(items, pos):
+    """Reference: linear scan in priority order."""
+    for key, rect in items:
+        if pygame.Rect(rect).collidepoint(pos):
+            return key
+    return None
+
+
+def test_rect_spanning_cells_is_hit_in_every_cell():
+    grid = HitGrid(cell_size=10)
+    grid.rebuild([("wide", (5, 5, 30, 12))]) # Spans 4 x 2 cells
+    for pos in ((5, 5), (34, 5), (5, 16), (34, 16), (20, 10), (10, 10), (9, 9)):
+        assert grid.hit(pos) == "wide"
+    for pos in ((4, 5), (35, 5), (5, 17), (35, 17)): # Right and bottom edges are exclusive, as in pygame.Rect
+        assert grid.hit(pos) is None
+
+
+def test_first_registered_rect_wins_where_rects_overlap():
+    grid = HitGrid(cell_size=16)
+    grid.rebuild([("front", (10, 10, 20, 20)), ("back", (0, 0, 100, 100)), ("late", (15, 15, 5, 5))])
+    assert grid.hit((15, 15)) == "front"
+    assert grid.hit((29, 29)) == "front"
+    assert grid.hit((30, 30)) == "back" # Same cell, only the later rect contains it
+    assert grid.hit((5, 5)) == "back"
+    grid.rebuild([("late", (15, 15, 5, 5)), ("front", (10, 10, 20, 20))]) # Order decides, not size
+    assert grid.hit((16, 16)) == "late"
+
+
+def test_points_outside_the_grid():
+    grid = HitGrid(cell_size=32)
+    grid.rebuild([("button", (40, 40, 20, 20)), ("edge", (-10, -10, 15, 15))])
+    assert grid.hit(None) is None
+    for pos in ((-1000, 50), (50, -1000), (10 ** 6, 10 ** 6), (39, 45), (60, 45)):
+        assert grid.hit(pos) is None
+    assert grid.hit((-10, -10)) == "edge" and grid.hit((4, 4)) == "edge" # Negative cells work too
+    assert grid.hit((-11, -10)) is None
+
+
+def test_empty_rects_are_skipped_and_rebuild_replaces():
+    grid = HitGrid(cell_size=8)
+    grid.rebuild([("empty", (10, 10, 0, 5)), ("button", (10, 10, 5, 5))])
+    assert grid.hit((10, 10)) == "button" and "empty" not in grid.rects
+    grid.rebuild([("other", (100, 100, 5, 5))])
+    assert grid.hit((10, 10)) is None and grid.hit((102, 102)) == "other"
+
+
+@pytest.mark.parametrize("cell_size", (1, 7, 64, 1000))
+def test_matches_linear_scan(cell_size):
+    rng = random.Random(cell_size)
+    items = [(i, (rng.randint(-50, 400), rng.randint(-50, 400), rng.randint(0, 120), rng.randint(0, 120))) for i in range(60)]
+    grid = HitGrid(cell_size=cell_size)
+    grid.rebuild(items)
+    for _ in range(2000):
+        pos = (rng.randint(-80, 560), rng.randint(-80, 560))
+        assert grid.hit(pos) == first_hit(items, pos)
+
+
+# --- UIManager: cached slider handles and the hit index ---
+
+SLIDER_SCENES = [scene_name for scene_name in scene_names() if get_scene(scene_name).config.get("sliders_enabled")]
+
+def make_ui(scene_name="Eğik Atış"):
+    simulation = Simulation(scene_name)
+    ui_manager = UIManager(pygame.Surface((cfg.WIDTH, cfg.HEIGHT)), get_scene(scene_name))
+    ui_manager.initialize_sliders(simulation.projectile, simulation.target)
+    return ui_manager
+
+
+def recomputed_handle_rect(ui_manager, slider_key):
+    """Handle rect computed from scratch from the slider value."""
+    track_rect = ui_manager.slider_rects_track[slider_key]
+    handle_x = track_rect.left + ui_manager.sliders[slider_key] * (track_rect.width - cfg.SLIDER_HANDLE_WIDTH)
+    handle_x = max(track_rect.left, min(handle_x, track_rect.right - cfg.SLIDER_HANDLE_WIDTH))
+    return pygame.Rect(handle_x, track_rect.centery - cfg.SLIDER_HANDLE_HEIGHT // 2, cfg.SLIDER_HANDLE_WIDTH, cfg.SLIDER_HANDLE_HEIGHT)
+
+
+def click(ui_manager, pos, event_type=pygame.MOUSEBUTTONDOWN):
+    event = pygame.event.Event(event_type, button=1, pos=pos) if event_type != pygame.MOUSEMOTION else pygame.event.Event(event_type, pos=pos)
+    return ui_manager.handle_event(event, simulation_running=False, simulation_paused=False)
+
+
+@pytest.mark.parametrize("scene_name", SLIDER_SCENES)
+def test_cached_handle_rects_follow_set_slider(scene_name):
+    ui_manager = make_ui(scene_name)
+    for slider_key in ui_manager.sliders_enabled:
+        assert ui_manager.get_slider_handle_rect(slider_key) == recomputed_handle_rect(ui_manager, slider_key)
+        for value in (0.0, 0.37, 1.0, -0.5, 1.5):
+            ui_manager._set_slider(slider_key, value)
+            assert ui_manager.sliders[slider_key] == min(1.0, max(0.0, value))
+            assert ui_manager.get_slider_handle_rect(slider_key) == recomputed_handle_rect(ui_manager, slider_key)
+    assert ui_manager.get_slider_handle_rect("not_a_slider") is None
+
+
+@pytest.mark.parametrize("scene_name", SLIDER_SCENES)
+def test_clicks_route_to_moved_handles(scene_name):
+    ui_manager = make_ui(scene_name)
+    for slider_key in ui_manager.sliders_enabled:
+        ui_manager._set_slider(slider_key, 0.8)
+        handle_rect = ui_manager.get_slider_handle_rect(slider_key)
+        # Hit index: the slider key anywhere on the handle's part of the track
+        track_rect = ui_manager.slider_rects_track[slider_key]
+        assert ui_manager.hit_index.hit(handle_rect.center) == slider_key
+        assert ui_manager.hit_index.hit((handle_rect.left, track_rect.top)) == slider_key
+        assert ui_manager.hit_index.hit((handle_rect.right - 1, track_rect.bottom - 1)) == slider_key
+        assert click(ui_manager, handle_rect.center) == "update_slider"
+        assert ui_manager.dragging_slider == slider_key
+        assert ui_manager.get_slider_handle_rect(slider_key).collidepoint(handle_rect.center) # Centered under the mouse
+
+        # Dragging moves the cached handle; a new click there still reaches the slider
+        assert click(ui_manager, (track_rect.left + 5, track_rect.centery), pygame.MOUSEMOTION) == "update_slider"
+        click(ui_manager, (track_rect.left + 5, track_rect.centery), pygame.MOUSEBUTTONUP)
+        moved_rect = ui_manager.get_slider_handle_rect(slider_key)
+        assert moved_rect == recomputed_handle_rect(ui_manager, slider_key) and moved_rect.left == track_rect.left
+        assert ui_manager.hit_index.hit(moved_rect.center) == slider_key
+        assert click(ui_manager, moved_rect.center) == "update_slider"
+        click(ui_manager, moved_rect.center, pygame.MOUSEBUTTONUP)
+
+
+def test_ui_hit_index_matches_linear_scan():
+    ui_manager = make_ui()
+    items = [(key, rect) for key, rect in ui_manager.hit_index.rects.items()]
+    assert items[0][0] == "back" and ui_manager.hit_index.hit(ui_manager.launch_button_rect.center) == "launch"
+    rng = random.Random(9)
+    for _ in range(3000):
+        pos = (rng.randrange(cfg.WIDTH), rng.randrange(cfg.HEIGHT))
+        assert ui_manager.hit_index.hit(pos) == first_hit(items, pos)
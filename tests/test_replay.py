@@ -0,0 +1,171 @@
+# test_replay.py
+# -*- coding: utf-8 -*-
+import pytest
+import replay
+from replay import InputRecorder, read_log
+from simulation import Simulation
+
+FRAME_SEC = 1.0 / 60.0
+
+
+def snapshot(simulation):
+    """State a replay must reproduce exactly."""
+    return (simulation.scene_name, tuple(simulation.projectile.current_pos_px),
+            simulation.current_vx_px_s, simulation.current_vy_px_s, simulation.current_t_elapsed_sec,
+            simulation.simulation_running, simulation.simulation_paused, simulation.simulation_speed_multiplier,
+            simulation.projectile_trail.to_array().tobytes(), tuple(simulation.target.pos_px),
+            simulation.time_to_target_sec, simulation.launch_v0x_px_s, simulation.launch_v0y_px_s)
+
+
+def event_names(simulation):
+    return tuple(name for name, _, _ in simulation.passed_events)
+
+
+class ScriptedSession:
+    """Drives Simulations the way main.py does, recording every input on the way."""
+
+    def __init__(self, path):
+        self.recorder = InputRecorder(path)
+        self.simulation = None
+        self.clock_sec = 0.0
+        self.frames = [] # snapshot() after every frame
+        self.events = [] # (frame index, passed event names) whenever they change
+
+    def open_scene(self, scene_name, sliders):
+        self.simulation = Simulation(scene_name)
+        self.simulation.set_clock(self.clock_sec)
+        self.recorder.scene(self.clock_sec, scene_name)
+        self.simulation.update_positions_from_sliders(sliders)
+        self.simulation.projectile.reset_to_initial()
+        self.recorder.reset(self.clock_sec, sliders)
+
+    def run_frames(self, count):
+        for _ in range(count):
+            self.clock_sec += FRAME_SEC
+            self.simulation.set_clock(self.clock_sec)
+            self.simulation.update()
+            self.recorder.frame(self.clock_sec)
+            record_frame(self.simulation, self.frames, self.events)
+
+    def action(self, action, **payload):
+        simulation = self.simulation
+        simulation.set_clock(self.clock_sec)
+        if action == "launch":
+            simulation.update_positions_from_sliders(payload["sliders"])
+            simulation.launch(payload.get("time_sec"))
+        elif action == "update_slider":
+            simulation.update_positions_from_sliders(payload["sliders"])
+        elif action == "validate_time":
+            simulation.set_time_to_target(payload["time_sec"])
+        elif action == "step_frame":
+            simulation.step_frame(payload["frames"])
+        else:
+            getattr(simulation, {"pause_toggle": "toggle_pause", "volley": "launch_volley"}.get(action, action))()
+        self.recorder.action(self.clock_sec, action, **payload)
+
+    def close(self):
+        self.recorder.close()
+
+
+def record_frame(simulation, frames, events):
+    frames.append(snapshot(simulation))
+    names = event_names(simulation)
+    if not events or events[-1][1] != names:
+        events.append((len(frames) - 1, names))
+
+
+def scripted_session(path):
+    session = ScriptedSession(path)
+    sliders = {"circle_x": 0.1, "circle_y": 0.8, "box_x": 0.7, "box_y": 0.4}
+    session.open_scene("Eğik Atış", sliders)
+    session.run_frames(5)
+    session.action("update_slider", sliders=dict(sliders, box_x=0.75))
+    session.action("validate_time", time_sec=1.5)
+    session.action("launch", sliders=dict(sliders, box_x=0.75), time_sec=1.5)
+    session.run_frames(30)
+    session.action("speed_up")
+    session.run_frames(10)
+    session.action("pause_toggle")
+    session.run_frames(5)
+    session.action("step_frame", frames=-4)
+    session.action("pause_toggle")
+    session.action("toggle_reverse")
+    session.run_frames(20)
+    session.action("toggle_reverse")
+    session.run_frames(200) # Reaches the target
+    session.action("launch", sliders=sliders, time_sec=None) # Invalid time: nothing launched
+    session.run_frames(3)
+
+    session.open_scene("Yatay Atış", {"circle_y": 0.2, "box_x": 0.6})
+    session.action("volley")
+    session.action("launch", sliders={"circle_y": 0.2, "box_x": 0.6})
+    session.run_frames(120)
+    session.close()
+    return session
+
+
+def test_replay_reproduces_recorded_session(tmp_path):
+    path = str(tmp_path / "session.atsrec")
+    session = scripted_session(path)
+    assert any(names for _, names in session.events) # The flights did pass events
+
+    replayed_frames, replayed_events = [], []
+    simulations = replay.replay(path, on_frame=lambda simulation: record_frame(simulation, replayed_frames, replayed_events))
+    assert [simulation.scene_name for simulation in simulations] == ["Eğik Atış", "Yatay Atış"]
+    assert replayed_frames == session.frames
+    assert replayed_events == session.events
+    assert snapshot(simulations[-1]) == snapshot(session.simulation)
+    assert simulations[-1].passed_events == session.simulation.passed_events
+
+
+def test_read_log_decodes_every_record(tmp_path):
+    path = str(tmp_path / "session.atsrec")
+    recorder = InputRecorder(path)
+    recorder.scene(0.0, "Dikey Atış")
+    recorder.reset(0.0, {"circle_x": 0.25})
+    recorder.frame(0.5)
+    recorder.action(1.0, "launch", sliders={"box_x": 0.5, "box_y": 0.125}, time_sec=None)
+    recorder.action(1.5, "validate_time", time_sec=2.5)
+    recorder.action(2.0, "step_frame", frames=-3)
+    recorder.action(2.5, "volley")
+    recorder.close()
+    assert list(read_log(path)) == [
+        (0.0, replay.SCENE, "Dikey Atış"), (0.0, replay.RESET, {"circle_x": 0.25}), (0.5, replay.FRAME, None),
+        (1.0, replay.LAUNCH, (None, {"box_x": 0.5, "box_y": 0.125})), (1.5, replay.SET_TIME, 2.5),
+        (2.0, replay.STEP_FRAME, -3), (2.5, replay.VOLLEY, None)]
+
+
+def test_truncated_log_raises_value_error(tmp_path):
+    path = tmp_path / "session.atsrec"
+    scripted_session(str(path))
+    data = path.read_bytes()
+    records = list(read_log(str(path)))
+    for cut in (len(replay.MAGIC) + 3, len(replay.MAGIC) + replay.RECORD_HEADER.size + 1, len(data) - 1):
+        path.write_bytes(data[:cut])
+        with pytest.raises(ValueError, match="truncated or corrupt"):
+            list(read_log(str(path)))
+    # The records before the cut are still readable one by one
+    path.write_bytes(data[:-1])
+    readable = []
+    with pytest.raises(ValueError):
+        for record in read_log(str(path)):
+            readable.append(record)
+    assert readable == records[:-1]
+
+
+def test_corrupt_log_raises_value_error(tmp_path):
+    path = tmp_path / "session.atsrec"
+    path.write_bytes(b"not a log at all")
+    with pytest.raises(ValueError, match="not an input log"):
+        list(read_log(str(path)))
+    # Scene name that is not UTF-8
+    path.write_bytes(replay.MAGIC + replay.RECORD_HEADER.pack(0.0, replay.SCENE) + replay.TEXT_LENGTH.pack(2) + b"\xff\xfe")
+    with pytest.raises(ValueError, match="truncated or corrupt"):
+        list(read_log(str(path)))
+    # Unknown record code: read_log passes it on, replay rejects it
+    scene_name = "Eğik Atış".encode("utf-8")
+    path.write_bytes(replay.MAGIC + replay.RECORD_HEADER.pack(0.0, replay.SCENE) + replay.TEXT_LENGTH.pack(len(scene_name))
+                     + scene_name + replay.RECORD_HEADER.pack(0.1, 99))
+    assert list(read_log(str(path)))[-1] == (0.1, 99, None)
+    with pytest.raises(ValueError, match="Unknown record code 99"):
+        replay.replay(str(path))
@@ -0,0 +1,141 @@
+# test_simulation.py
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+import config as cfg
+from physics import PhysicsEngine
+from drag import DragPhysicsEngine
+from scenes import Scene, get_scene
+from simulation import Simulation
+
+FRAME_SEC = 1.0 / 60.0
+
+
+class RecordingExporter:
+    """Stands in for export.TrajectoryExporter: keeps every written row."""
+
+    def __init__(self):
+        self.rows = []
+
+    def write(self, t_sec, pos_px, v_px_s):
+        self.rows.append((t_sec, list(pos_px), list(v_px_s)))
+
+
+def launched_simulation(time_to_target_sec=2.0):
+    simulation = Simulation("Eğik Atış", physics_engine=PhysicsEngine())
+    assert simulation.launch(time_to_target_sec) is None
+    return simulation
+
+
+def assert_at_launch_start(simulation):
+    assert simulation.playback_time_sec == 0.0
+    assert simulation.projectile.current_pos_px == pytest.approx(simulation.projectile.initial_pos_px)
+    assert [simulation.current_vx_px_s, simulation.current_vy_px_s] == pytest.approx(
+        [simulation.launch_v0x_px_s, simulation.launch_v0y_px_s])
+    assert len(simulation.projectile_trail) == 0 and simulation.passed_events == []
+
+
+def test_reverse_playback_stops_at_launch_start():
+    simulation = launched_simulation()
+    for _ in range(60):
+        simulation.advance(FRAME_SEC)
+    simulation.toggle_reverse()
+    assert simulation.playback_direction == -1
+    for _ in range(200): # Much longer than the second played forward
+        simulation.advance(FRAME_SEC)
+    assert_at_launch_start(simulation)
+    assert not simulation.simulation_running # Back at the start: ready for a new launch
+    assert simulation.playback_direction == 1
+
+    # Further frames change nothing, and a new launch runs forwards to the target
+    simulation.advance(FRAME_SEC)
+    assert_at_launch_start(simulation)
+    assert simulation.launch(1.0) is None
+    simulation.run_until_finished()
+    assert simulation.projectile.current_pos_px == pytest.approx(simulation.target.center_pos_px, abs=1e-6)
+
+
+def test_step_frame_back_to_start_clamps_and_resumes():
+    simulation = launched_simulation()
+    for _ in range(10):
+        simulation.advance(FRAME_SEC)
+    for _ in range(30): # More frames back than were played
+        assert simulation.step_frame(-1)
+    assert simulation.simulation_paused and simulation.simulation_running
+    assert_at_launch_start(simulation)
+
+    simulation.toggle_pause()
+    simulation.run_until_finished()
+    assert not simulation.simulation_running
+    assert simulation.playback_time_sec == simulation.flight_end_sec
+    assert simulation.projectile.current_pos_px == pytest.approx(simulation.target.center_pos_px, abs=1e-6)
+
+
+def test_seek_before_start_and_after_end():
+    simulation = launched_simulation()
+    assert simulation.seek(-5.0)
+    assert_at_launch_start(simulation)
+    assert simulation.simulation_running
+
+    assert simulation.seek(99.0) # Past the end: the flight finishes on the target
+    assert not simulation.simulation_running
+    assert simulation.projectile.current_pos_px == pytest.approx(simulation.target.center_pos_px, abs=1e-6)
+    assert simulation.seek(0.0) # Back from a finished flight resumes it
+    assert simulation.simulation_running
+    assert_at_launch_start(simulation)
+    assert Simulation("Eğik Atış").seek(1.0) is False # Nothing launched yet
+
+
+def test_seek_matches_forward_run():
+    forward = launched_simulation()
+    for _ in range(45):
+        forward.advance(0.0123) # Off the trail point grid: no ties at its boundaries
+    seeked = launched_simulation()
+    seeked.seek(forward.playback_time_sec)
+    assert seeked.projectile.current_pos_px == pytest.approx(forward.projectile.current_pos_px, abs=1e-9)
+    assert np.array_equal(np.concatenate(seeked.projectile_trail.views()), np.concatenate(forward.projectile_trail.views()))
+    assert seeked.passed_events == forward.passed_events
+
+
+def test_export_stays_time_ordered_after_seek_back():
+    simulation = Simulation("Eğik Atış", physics_engine=PhysicsEngine())
+    simulation.exporter = exporter = RecordingExporter()
+    simulation.launch(2.0)
+    for _ in range(60):
+        simulation.advance(FRAME_SEC)
+    simulation.seek(0.25)
+    simulation.step_frame(-3)
+    simulation.toggle_pause()
+    simulation.run_until_finished()
+
+    times_sec = [t_sec for t_sec, _, _ in exporter.rows]
+    assert times_sec[0] == 0.0 and times_sec[-1] == simulation.flight_end_sec
+    assert all(t0 < t1 for t0, t1 in zip(times_sec, times_sec[1:]))
+    assert exporter.rows[-1][1] == pytest.approx(simulation.target.center_pos_px, abs=1e-6)
+    # One row per physics step, none repeated by the replayed stretch
+    assert len(times_sec) == round(simulation.flight_end_sec / cfg.PHYSICS_TIMESTEP_SEC) + 1
+
+
+def test_export_gap_after_seek_forward():
+    simulation = Simulation("Eğik Atış", physics_engine=PhysicsEngine())
+    simulation.exporter = exporter = RecordingExporter()
+    simulation.launch(2.0)
+    simulation.advance(FRAME_SEC)
+    simulation.seek(1.5)
+    simulation.run_until_finished()
+    times_sec = [t_sec for t_sec, _, _ in exporter.rows]
+    assert all(t0 < t1 for t0, t1 in zip(times_sec, times_sec[1:]))
+    assert not any(0.05 < t_sec < 1.5 for t_sec in times_sec)
+
+
+@pytest.mark.parametrize("physics_engine", (PhysicsEngine(), DragPhysicsEngine()))
+def test_vertical_throw_returns_to_start(physics_engine):
+    simulation = Simulation("Dikey Atış", physics_engine=physics_engine)
+    assert simulation.launch(2.0) is None
+    assert simulation.launch_v0x_px_s == pytest.approx(0.0, abs=1e-9)
+    simulation.run_until_finished()
+    assert simulation.projectile.current_pos_px == simulation.projectile.initial_pos_px
+
+
+def test_slanted_throw_is_the_default_scene():
+    assert type(get_scene("Eğik Atış")) is Scene
@@ -0,0 +1,121 @@
+# test_trail.py
+# -*- coding: utf-8 -*-
+import numpy as np
+import pygame
+from trail import TrailBuffer, TrailLayer
+
+
+def points(start, count):
+    """count distinct [x, y] points numbered from start."""
+    index = np.arange(start, start + count, dtype=np.float64)
+    return np.stack([index, -index], axis=1)
+
+
+def buffered(trail):
+    """Buffer contents oldest-to-newest as one array."""
+    views = trail.views()
+    return np.concatenate(views) if views else np.zeros((0, 2))
+
+
+def test_views_wrap_around_after_eviction():
+    trail = TrailBuffer(5)
+    for point in points(0, 8):
+        trail.append(point)
+    views = trail.views()
+    assert len(views) == 2 # Oldest point is at index 3, the newest ones wrapped to the front
+    np.testing.assert_array_equal(np.concatenate(views), points(3, 5))
+    assert len(trail) == 5
+    assert trail.total_appended == 8
+
+
+def test_newest_views_across_the_wrap():
+    trail = TrailBuffer(5)
+    trail.extend(points(0, 8))
+    for n in range(7):
+        views = trail.newest_views(n)
+        expected = points(8 - min(n, 5), min(n, 5))
+        got = np.concatenate(views) if views else np.zeros((0, 2))
+        np.testing.assert_array_equal(got, expected)
+    assert trail.newest_views(0) == ()
+    assert trail.newest_views(-3) == ()
+
+
+def test_extend_matches_repeated_append():
+    for capacity in (1, 4, 7):
+        for first in range(0, 10):
+            for second in range(0, 3 * capacity):
+                extended, appended = TrailBuffer(capacity), TrailBuffer(capacity)
+                extended.extend(points(0, first))
+                extended.extend(points(first, second))
+                for point in points(0, first + second):
+                    appended.append(point)
+                np.testing.assert_array_equal(buffered(extended), buffered(appended))
+                assert extended.total_appended == appended.total_appended == first + second
+
+
+def test_extend_larger_than_capacity_keeps_newest():
+    trail = TrailBuffer(4)
+    trail.append((100.0, 100.0))
+    trail.extend(points(0, 11))
+    np.testing.assert_array_equal(buffered(trail), points(7, 4))
+    assert len(trail) == 4
+    assert trail.total_appended == 12
+    assert trail.last() == (10.0, -10.0)
+
+
+def test_last_and_views_on_empty_buffer():
+    trail = TrailBuffer(3)
+    assert trail.last() is None
+    assert trail.views() == ()
+    assert not trail
+    trail.extend(np.zeros((0, 2)))
+    assert trail.last() is None
+    assert trail.total_appended == 0
+
+
+def test_clear_keeps_capacity_and_counts_clears():
+    trail = TrailBuffer(3)
+    trail.extend(points(0, 5))
+    trail.clear()
+    assert trail.last() is None
+    assert len(trail) == 0 and trail.total_appended == 0
+    assert trail.clear_count == 1
+    trail.append((1.0, 2.0))
+    assert trail.last() == (1.0, 2.0)
+    np.testing.assert_array_equal(buffered(trail), [[1.0, 2.0]])
+
+
+def layer_pixels(layer):
+    """RGBA bytes of the whole layer surface."""
+    return pygame.image.tobytes(layer.surface, "RGBA")
+
+
+def test_layer_shows_exactly_the_buffered_points():
+    rng = np.random.default_rng(5)
+    trail = TrailBuffer(40)
+    layer = TrailLayer(trail, (120, 90))
+    target = pygame.Surface((120, 90))
+    walk = np.cumsum(rng.normal(0.0, 2.5, size=(700, 2)), axis=0) % (130, 100) - 5 # Dense, overlapping, partly off the layer
+    position = 0
+    for step in range(150):
+        count = int(rng.integers(0, 6)) if step % 50 else 45 # Several appends (and evictions) between draws, sometimes more than fit
+        trail.extend(walk[position:position + count])
+        position += count
+        layer.draw(target)
+        fresh = TrailLayer(trail, (120, 90))
+        fresh.draw(target)
+        assert layer_pixels(layer) == layer_pixels(fresh), f"step {step}"
+    assert trail.total_appended > 5 * trail.capacity # Ran long past the first eviction
+
+
+def test_layer_changed_rect_covers_erased_points():
+    trail = TrailBuffer(2)
+    layer = TrailLayer(trail, (100, 100))
+    target = pygame.Surface((100, 100))
+    trail.extend([[10, 10], [50, 50]])
+    layer.draw(target)
+    trail.append((90, 90)) # Evicts (10, 10)
+    changed = layer.draw(target)
+    assert changed.collidepoint(10, 10) and changed.collidepoint(90, 90)
+    assert layer.surface.get_at((10, 10)).a == 0
+    assert layer.surface.get_at((50, 50)).a == 255
@@ -0,0 +1,101 @@
+# test_trajectory.py
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+import config as cfg
+from physics import PhysicsEngine
+from drag import DragPhysicsEngine
+from trajectory import TrajectoryTable
+
+START_PX = [100.0, 600.0]
+V0_PX_S = [300.0, -650.0]
+
+
+def target_rect_around(engine, t_sec, size_px=60.0):
+    """Target box centred on the drag-free position at t_sec."""
+    (x, y), _ = engine.calculate_kinematic_update(START_PX, V0_PX_S[0], V0_PX_S[1], t_sec)
+    return (x - size_px / 2, y - size_px / 2, size_px, size_px)
+
+
+def test_hermite_lookup_is_exact_for_the_parabola():
+    engine = PhysicsEngine()
+    table = TrajectoryTable(engine, START_PX, V0_PX_S, 2.345)
+    times_sec = np.concatenate((np.linspace(0.0, 2.345, 997), [2.345 - 1e-7, 1e-7]))
+    exact_pos_px, exact_v_px_s = engine.calculate_kinematic_batch(START_PX, V0_PX_S, times_sec)
+
+    pos_px, v_px_s = table.sample(times_sec)
+    np.testing.assert_allclose(pos_px, exact_pos_px, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(v_px_s, exact_v_px_s, rtol=0, atol=1e-9)
+    for t_sec, exact_pos, exact_v in zip(times_sec[::37], exact_pos_px[::37], exact_v_px_s[::37]):
+        pos, v = table.lookup(t_sec)
+        assert pos == pytest.approx(exact_pos.tolist(), abs=1e-9)
+        assert v == pytest.approx(exact_v.tolist(), abs=1e-9)
+
+    # Times outside the flight are clamped to its ends
+    assert table.lookup(-1.0)[0] == pytest.approx(START_PX)
+    assert table.lookup(9.0)[0] == pytest.approx(exact_pos_px[-3].tolist())
+
+
+def test_find_events_matches_closed_form():
+    engine = PhysicsEngine()
+    target_rect = target_rect_around(engine, 0.9)
+    closed = engine.solve_trajectory_events(START_PX, V0_PX_S[0], V0_PX_S[1], target_rect=target_rect)
+    last_event_sec = max(event[0] for name, event in closed.items() if name != 'screen_exit_edge' and event)
+    table = TrajectoryTable(engine, START_PX, V0_PX_S, last_event_sec + 0.1)
+    sampled = table.find_events(target_rect=target_rect)
+
+    assert sampled.keys() == closed.keys()
+    assert sampled['screen_exit_edge'] == closed['screen_exit_edge']
+    for name in ('apex', 'ground_impact', 'target_entry', 'target_exit', 'screen_exit'):
+        assert closed[name] is not None
+        t_sec, pos_px = sampled[name]
+        # Bisection stops at ~1e-12 of a sample spacing; Hermite lookup is exact here
+        assert t_sec == pytest.approx(closed[name][0], abs=1e-9)
+        assert pos_px == pytest.approx(closed[name][1], abs=1e-6)
+
+
+def test_find_events_with_drag_agree_with_integration():
+    engine = DragPhysicsEngine()
+    table = TrajectoryTable(engine, START_PX, V0_PX_S, 4.0)
+    x, y = engine.sample_trajectory(START_PX, V0_PX_S, [0.9])[0][0]
+    target_rect = (x - 30.0, y - 30.0, 60.0, 60.0) # Around the drag trajectory
+    events = table.find_events(target_rect=target_rect)
+    t_apex, apex_px = events['apex']
+    _, v_px_s = engine.sample_trajectory(START_PX, V0_PX_S, [t_apex - 1e-3, t_apex + 1e-3])
+    assert v_px_s[0, 1] < 0 < v_px_s[1, 1] # Vertical velocity turns around at the apex
+    t_ground, ground_px = events['ground_impact']
+    assert ground_px[1] == pytest.approx(cfg.HEIGHT, abs=1e-6)
+    t_entry, entry_px = events['target_entry']
+    t_exit, exit_px = events['target_exit']
+    assert 0 < t_entry < t_exit < t_ground
+    left, top, width, height = target_rect
+    for x, y in (entry_px, exit_px): # On the box's border
+        assert min(abs(x - left), abs(x - left - width), abs(y - top), abs(y - top - height)) < 1e-6
+
+
+def test_zero_duration_table():
+    engine = PhysicsEngine()
+    table = TrajectoryTable(engine, START_PX, V0_PX_S, 0.0)
+    assert len(table) == 1
+    assert table.lookup(0.5) == (START_PX, V0_PX_S)
+    pos_px, v_px_s = table.sample(np.zeros((3, 4)))
+    assert pos_px.shape == v_px_s.shape == (3, 4, 2)
+    assert np.all(pos_px == START_PX) and np.all(v_px_s == V0_PX_S)
+    assert table.trail_points_px.shape == (0, 2) and table.trail_count_before(1.0) == 0
+
+    events = table.find_events(target_rect=target_rect_around(engine, 0.9))
+    assert events['apex'] is None # Still rising: the apex is after the (empty) flight
+    assert events['target_entry'] is None and events['target_exit'] is None
+    assert events['ground_impact'] is None and events['screen_exit'] is None
+
+
+def test_target_exit_is_none_when_flight_ends_inside_target():
+    engine = PhysicsEngine()
+    target_rect = target_rect_around(engine, 0.9)
+    table = TrajectoryTable(engine, START_PX, V0_PX_S, 0.9) # Lands in the box's centre
+    events = table.find_events(target_rect=target_rect)
+    assert events['target_entry'] is not None and 0 < events['target_entry'][0] < 0.9
+    assert events['target_exit'] is None
+    # The closed form sees the whole parabola, so it does report a later exit
+    closed = engine.solve_trajectory_events(START_PX, V0_PX_S[0], V0_PX_S[1], target_rect=target_rect)
+    assert closed['target_exit'][0] > 0.9
@@ -0,0 +1,42 @@
+# test_utils.py
+# -*- coding: utf-8 -*-
+import numpy as np
+import pygame
+import config as cfg
+import utils
+
+
+def test_volatile_readouts_do_not_evict_static_labels():
+    utils.clear_text_cache()
+    text_font = utils.get_font(cfg.FONT_SIZE_SMALL)
+    label = utils.render_text_cached(text_font, "Fırlat", cfg.BLACK)
+    for frame in range(3 * cfg.TEXT_CACHE_MAX_ENTRIES):
+        utils.render_text_cached(text_font, f"Geçen Süre: {frame / 60:.2f} s", cfg.WHITE, volatile=True)
+    assert utils.render_text_cached(text_font, "Fırlat", cfg.BLACK) is label
+    assert len(utils._volatile_text_cache) == cfg.TEXT_CACHE_VOLATILE_MAX_ENTRIES
+
+
+def test_unchanged_readout_is_reused():
+    utils.clear_text_cache()
+    text_font = utils.get_font(cfg.FONT_SIZE_SMALL)
+    first = utils.render_text_cached(text_font, "Geçen Süre: 1.00 s", cfg.WHITE, volatile=True)
+    assert utils.render_text_cached(text_font, "Geçen Süre: 1.00 s", cfg.WHITE, volatile=True) is first
+    assert not utils._text_cache
+
+
+def test_draw_arrows_matches_draw_arrow():
+    rng = np.random.default_rng(5)
+    starts = rng.uniform(-20, 220, (300, 2))
+    ends = starts + rng.normal(0, 40, (300, 2))
+    ends[:20] = starts[:20] # Zero-length arrows have no head
+    batched, single = pygame.Surface((200, 200)), pygame.Surface((200, 200))
+    changed = utils.draw_arrows(batched, cfg.RED, starts, ends, cfg.VECTOR_ARROW_SIZE)
+    for start, end in zip(starts, ends):
+        utils.draw_arrow(single, cfg.RED, start, end, cfg.VECTOR_ARROW_SIZE)
+    assert pygame.image.tobytes(batched, "RGB") == pygame.image.tobytes(single, "RGB")
+    # Everything drawn is inside the returned rect
+    outside = pygame.Surface((200, 200))
+    outside.blit(batched, (0, 0))
+    outside.fill(cfg.BLACK, changed)
+    assert pygame.mask.from_threshold(outside, cfg.BLACK, (1, 1, 1, 255)).count() == 200 * 200
+    assert utils.draw_arrows(batched, cfg.RED, np.empty((0, 2)), np.empty((0, 2)), cfg.VECTOR_ARROW_SIZE) is None
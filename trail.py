@@ -0,0 +1,226 @@
+# trail.py
+from collections import deque
+import numpy as np
+import pygame
+import config as cfg
+
+class TrailBuffer:
+    """
+    Fixed-capacity ring buffer of [x, y] trail points (pixels).
+
+    Points live in one preallocated float64 array, so appending is O(1) and, once
+    full, silently overwrites the oldest point instead of shifting the whole list.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(1, int(capacity))
+        self._points = np.zeros((self.capacity, 2), dtype=np.float64)
+        self._start = 0 # Index of the oldest point
+        self._count = 0
+        self.total_appended = 0 # Points appended since the last clear (including evicted ones)
+        self.clear_count = 0 # Incremented by clear(), lets renderers notice a reset
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def clear(self):
+        """Removes all points (the storage is kept)."""
+        self._start = 0
+        self._count = 0
+        self.total_appended = 0
+        self.clear_count += 1
+
+    def append(self, pos_px):
+        """Adds a point, evicting the oldest one if the buffer is full."""
+        end = (self._start + self._count) % self.capacity
+        self._points[end, 0] = pos_px[0]
+        self._points[end, 1] = pos_px[1]
+        self.total_appended += 1
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def extend(self, points_px):
+        """Appends an (n, 2) block of points in order (same result as n append() calls)."""
+        points_px = np.asarray(points_px, dtype=np.float64).reshape(-1, 2)
+        total = len(points_px)
+        if not total:
+            return
+        self.total_appended += total
+        kept = points_px[-self.capacity:] # Older ones would be evicted right away
+        end = (self._start + self._count + total - len(kept)) % self.capacity # Where the first kept point lands
+        first_part = min(len(kept), self.capacity - end)
+        self._points[end:end + first_part] = kept[:first_part]
+        self._points[:len(kept) - first_part] = kept[first_part:]
+        new_count = self._count + total
+        if new_count > self.capacity:
+            self._start = (self._start + new_count - self.capacity) % self.capacity
+            self._count = self.capacity
+        else:
+            self._count = new_count
+
+    def last(self):
+        """Returns the newest point as an (x, y) tuple, or None if empty."""
+        if not self._count:
+            return None
+        x, y = self._points[(self._start + self._count - 1) % self.capacity]
+        return (float(x), float(y))
+
+    def views(self):
+        """
+        Returns the points oldest-to-newest as at most two zero-copy array views.
+
+        Returns:
+            tuple: One or two (n, 2) float64 views into the buffer (empty tuple if no points).
+                   The views are only valid until the next append/clear.
+        """
+        if not self._count:
+            return ()
+        end = self._start + self._count
+        if end <= self.capacity:
+            return (self._points[self._start:end],)
+        return (self._points[self._start:], self._points[:end - self.capacity])
+
+    def newest_views(self, n):
+        """Returns the newest n points (oldest first) as at most two zero-copy views."""
+        n = min(max(0, n), self._count)
+        if not n:
+            return ()
+        first = self._start + self._count - n # Unwrapped index of the first wanted point
+        end = self._start + self._count
+        if first >= self.capacity:
+            return (self._points[first - self.capacity:end - self.capacity],)
+        if end <= self.capacity:
+            return (self._points[first:end],)
+        return (self._points[first:], self._points[:end - self.capacity])
+
+    def to_array(self):
+        """Returns a contiguous (n, 2) copy of the points, oldest first."""
+        views = self.views()
+        if not views:
+            return np.empty((0, 2), dtype=np.float64)
+        return np.concatenate(views)
+
+    def __iter__(self):
+        for view in self.views():
+            for x, y in view:
+                yield (float(x), float(y))
+
+
+class TrailLayer:
+    """
+    Persistent transparent surface the trail is drawn onto.
+
+    Each trail point is stamped once when it first appears in the TrailBuffer and the
+    layer is then blitted with a single call per frame. When the full buffer evicts a point,
+    only that point is erased: its square is cleared and the still-buffered points reaching
+    into it (found through a spatial hash of the stamped points) are stamped again, so the
+    layer always shows exactly the buffered points at a cost per evicted point, not per
+    trail point. The layer is wiped only when the buffer is cleared (reset / launch) or has
+    evicted every stamped point. A new scene gets a new buffer, hence a new layer.
+    """
+
+    def __init__(self, trail_buffer, size):
+        self.trail_buffer = trail_buffer
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self._cell_size = 8 * max(1, cfg.TRAIL_POINT_RADIUS) # Spatial hash cell edge (pixels)
+        self.invalidate()
+
+    def invalidate(self):
+        """Wipes the layer; all buffered points are stamped again on the next draw."""
+        self.surface.fill((0, 0, 0, 0))
+        self._clear_count = self.trail_buffer.clear_count
+        self._first_stamped = self.trail_buffer.total_appended - len(self.trail_buffer) # Index of the oldest stamped point
+        self._stamped_total = self._first_stamped # Points appended before this index are on the layer
+        self._stamped_px = [None] * self.trail_buffer.capacity # Integer center of stamped point i, at i % capacity
+        self._cells = {} # (column, row) -> deque of stamped point indices in the cell, oldest first
+        self._bounds = None # Area of the layer that has been drawn on
+
+    @property
+    def bounds(self):
+        """Area the layer covers when blitted (all buffered points), or None while empty."""
+        return self._bounds
+
+    def draw(self, surface):
+        """
+        Stamps new trail points onto the layer, erases evicted ones and blits the layer onto surface.
+
+        Returns:
+            pygame.Rect: Area that looks different from the previous draw (newly stamped or
+                         erased points, or the old trail area after a wipe), or None if unchanged.
+        """
+        trail = self.trail_buffer
+        changed_rect = None
+        oldest_buffered = trail.total_appended - len(trail)
+        if trail.clear_count != self._clear_count or oldest_buffered > self._first_stamped and oldest_buffered >= self._stamped_total:
+            changed_rect = self._bounds # The old trail disappears from here
+            self.invalidate() # Cleared, or every stamped point was evicted from the buffer
+        elif oldest_buffered > self._first_stamped:
+            changed_rect = self._erase_evicted(oldest_buffered)
+
+        new_points = trail.total_appended - self._stamped_total
+        if new_points > 0:
+            radius = cfg.TRAIL_POINT_RADIUS
+            cell_size = self._cell_size
+            capacity = trail.capacity
+            index = trail.total_appended - min(new_points, len(trail)) # Only buffered points are stamped
+            for points in trail.newest_views(new_points):
+                for point_x, point_y in points.astype(int).tolist():
+                    dirty = pygame.draw.circle(self.surface, cfg.TRAIL_POINT_COLOR, (point_x, point_y), radius)
+                    self._stamped_px[index % capacity] = (point_x, point_y)
+                    cell = self._cells.get((point_x // cell_size, point_y // cell_size))
+                    if cell is None:
+                        cell = self._cells[(point_x // cell_size, point_y // cell_size)] = deque()
+                    cell.append(index)
+                    index += 1
+                    self._bounds = dirty if self._bounds is None else self._bounds.union(dirty)
+                    changed_rect = dirty if changed_rect is None else changed_rect.union(dirty)
+            self._stamped_total = trail.total_appended
+
+        if self._bounds is not None:
+            surface.blit(self.surface, self._bounds.topleft, self._bounds) # Only the area with points
+        return changed_rect
+
+    def _erase_evicted(self, oldest_buffered):
+        """
+        Erases the stamped points the buffer has evicted (indices before oldest_buffered) and
+        re-stamps the buffered points that overlapped them.
+
+        Returns:
+            pygame.Rect: Area that was erased.
+        """
+        radius = cfg.TRAIL_POINT_RADIUS
+        size = 2 * radius + 1 # Square holding a whole stamped circle
+        cell_size = self._cell_size
+        capacity = self.trail_buffer.capacity
+        stamped_px = self._stamped_px
+        layer_rect = self.surface.get_rect()
+        erased_rects = []
+        for index in range(self._first_stamped, oldest_buffered):
+            x, y = stamped_px[index % capacity]
+            erased = pygame.Rect(x - radius, y - radius, size, size)
+            self.surface.fill((0, 0, 0, 0), erased.clip(layer_rect)) # Clipped here: fill() shifts rects that stick out on the left
+            erased_rects.append(erased)
+            key = (x // cell_size, y // cell_size)
+            cell = self._cells[key]
+            cell.popleft() # Points leave the buffer in the order they were stamped
+            if not cell:
+                del self._cells[key]
+        self._first_stamped = oldest_buffered
+
+        # Circles centered within radius of an erased square lost some pixels: stamp them again
+        restamp = set()
+        for erased in erased_rects:
+            reach = erased.inflate(2 * radius, 2 * radius)
+            for row in range(reach.top // cell_size, (reach.bottom - 1) // cell_size + 1):
+                for column in range(reach.left // cell_size, (reach.right - 1) // cell_size + 1):
+                    for index in self._cells.get((column, row), ()):
+                        if reach.collidepoint(stamped_px[index % capacity]):
+                            restamp.add(index)
+        for index in sorted(restamp):
+            pygame.draw.circle(self.surface, cfg.TRAIL_POINT_COLOR, stamped_px[index % capacity], radius)
+        return erased_rects[0].unionall(erased_rects[1:])
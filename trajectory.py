@@ -0,0 +1,189 @@
+# trajectory.py
+# -*- coding: utf-8 -*-
+import math
+import numpy as np
+import config as cfg
+
+class TrajectoryTable:
+    """
+    Sampled trajectory of one launch, computed once when the launch is committed.
+
+    Positions and velocities are stored every sample_dt_sec of effective simulation time
+    (plus an exact sample at the end of the flight). Any time in between is served by
+    indexed lookup: positions with cubic Hermite interpolation (exact for the drag-free
+    parabola), velocities linearly (exact when the acceleration is constant).
+    The trail points (every cfg.TRAIL_POINT_INTERVAL_SEC) are precomputed too.
+    """
+
+    def __init__(self, physics_engine, initial_pos_px, v0_px_s, duration_sec, sample_dt_sec=None, end_pos_px=None):
+        """
+        Args:
+            physics_engine (PhysicsEngine): Engine whose sample_trajectory() produces the samples.
+            initial_pos_px (list): Projectile's starting [x, y] in pixels.
+            v0_px_s (list): Initial [vx, vy] velocity in pixels/sec (Pygame coords).
+            duration_sec (float): Flight duration (effective simulation time).
+            sample_dt_sec (float): Sample spacing. Default: cfg.TRAJECTORY_SAMPLE_DT_SEC.
+            end_pos_px (list): Optional exact [x, y] to use for the final sample.
+        """
+        self.duration_sec = max(0.0, float(duration_sec))
+        self.sample_dt_sec = sample_dt_sec if sample_dt_sec is not None else cfg.TRAJECTORY_SAMPLE_DT_SEC
+
+        # Uniform samples strictly before the end, then the exact end time
+        num_uniform = max(1, math.ceil(self.duration_sec / self.sample_dt_sec - 1e-9))
+        self.times_sec = np.append(np.arange(num_uniform) * self.sample_dt_sec, self.duration_sec)
+        if self.duration_sec == 0:
+            self.times_sec = self.times_sec[:1]
+        self.positions_px, self.velocities_px_s = physics_engine.sample_trajectory(initial_pos_px, v0_px_s, self.times_sec)
+        if end_pos_px is not None:
+            self.positions_px[-1] = end_pos_px
+
+        # Plain-float copies for per-frame lookups (avoids NumPy scalar overhead)
+        self._times = self.times_sec.tolist()
+        self._positions = self.positions_px.tolist()
+        self._velocities = self.velocities_px_s.tolist()
+
+        # Trail points: every TRAIL_POINT_INTERVAL_SEC, strictly before the end of the flight
+        interval = cfg.TRAIL_POINT_INTERVAL_SEC
+        num_trail = max(0, math.ceil(self.duration_sec / interval - 1e-9) - 1) if interval > 0 else 0
+        self.trail_times_sec = np.arange(1, num_trail + 1) * interval
+        self.trail_points_px = self.sample(self.trail_times_sec)[0]
+
+    def __len__(self):
+        return len(self._times)
+
+    def _segment(self, t_sec):
+        """Index i of the sample interval [times[i], times[i + 1]] containing t_sec (clamped)."""
+        last = len(self._times) - 2
+        if last < 0:
+            return None
+        return min(max(int(t_sec / self.sample_dt_sec), 0), last)
+
+    def lookup(self, t_sec):
+        """
+        Position and velocity at effective time t_sec (clamped to the flight).
+
+        Returns:
+            tuple: ([x, y], [vx, vy]) as plain float lists, like calculate_kinematic_update.
+        """
+        i = self._segment(t_sec)
+        if i is None: # Single sample (zero-length flight)
+            return list(self._positions[0]), list(self._velocities[0])
+        t0 = self._times[i]
+        h = self._times[i + 1] - t0
+        s = min(max((t_sec - t0) / h, 0.0), 1.0) if h > 0 else 0.0
+        s2, s3 = s * s, s * s * s
+        h00, h10, h01, h11 = 2 * s3 - 3 * s2 + 1, s3 - 2 * s2 + s, -2 * s3 + 3 * s2, s3 - s2
+        (p0x, p0y), (p1x, p1y) = self._positions[i], self._positions[i + 1]
+        (v0x, v0y), (v1x, v1y) = self._velocities[i], self._velocities[i + 1]
+        pos_px = [h00 * p0x + h10 * h * v0x + h01 * p1x + h11 * h * v1x,
+                  h00 * p0y + h10 * h * v0y + h01 * p1y + h11 * h * v1y]
+        v_px_s = [v0x + (v1x - v0x) * s, v0y + (v1y - v0y) * s]
+        return pos_px, v_px_s
+
+    def sample(self, times_sec):
+        """
+        Vectorized lookup for an array of times.
+
+        Returns:
+            tuple: (pos_px, v_px_s) float64 arrays of shape (..., 2).
+        """
+        t = np.asarray(times_sec, dtype=np.float64)
+        if len(self._times) < 2:
+            shape = t.shape + (2,)
+            return np.broadcast_to(self.positions_px[0], shape).copy(), np.broadcast_to(self.velocities_px_s[0], shape).copy()
+        i = np.clip((t / self.sample_dt_sec).astype(np.int64), 0, len(self._times) - 2)
+        t0 = self.times_sec[i]
+        h = (self.times_sec[i + 1] - t0)[..., np.newaxis]
+        s = np.clip((t - t0)[..., np.newaxis] / np.where(h > 0, h, 1.0), 0.0, 1.0)
+        s2, s3 = s * s, s * s * s
+        p0, p1 = self.positions_px[i], self.positions_px[i + 1]
+        v0, v1 = self.velocities_px_s[i], self.velocities_px_s[i + 1]
+        pos_px = (2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * h * v0 + (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * h * v1
+        v_px_s = v0 + (v1 - v0) * s
+        return pos_px, v_px_s
+
+    def trail_count_before(self, t_sec):
+        """Number of trail points whose time is strictly before t_sec."""
+        return int(np.searchsorted(self.trail_times_sec, t_sec, side='left'))
+
+    # --- Events (trajectories without a closed form) ---
+
+    def _first_time(self, mask, predicate, after_index=0):
+        """
+        Earliest time a condition holds, from its value at every sample (mask) and at any time
+        (predicate(pos_px, v_px_s)): the first sample where it holds after after_index, refined
+        by bisection between it and the previous sample. None if no sample satisfies it.
+        """
+        hits = np.flatnonzero(mask[after_index:])
+        if not len(hits):
+            return None
+        i = after_index + int(hits[0])
+        if i == 0:
+            return 0.0
+        t_low, t_high = self._times[i - 1], self._times[i]
+        for _ in range(40): # Interval shrinks to ~1e-12 of a sample spacing
+            t_mid = 0.5 * (t_low + t_high)
+            if predicate(*self.lookup(t_mid)):
+                t_high = t_mid
+            else:
+                t_low = t_mid
+        return t_high
+
+    def find_events(self, target_rect=None, bounds_rect=None, ground_y_px=None):
+        """
+        Sampled counterpart of PhysicsEngine.solve_trajectory_events for engines without a
+        closed form (air drag): same arguments and result, located on the table's samples
+        and refined by bisection on lookup().
+
+        Only the tabulated flight is searched: events after its end are None, and so is the
+        apex of a projectile still rising when the flight ends. Contact shorter than one
+        sample spacing (grazing a target corner) can be missed.
+        """
+        if bounds_rect is None:
+            bounds_rect = (0, 0, cfg.WIDTH, cfg.HEIGHT)
+        if ground_y_px is None:
+            ground_y_px = bounds_rect[1] + bounds_rect[3]
+        x, y = self.positions_px[:, 0], self.positions_px[:, 1]
+        vy = self.velocities_px_s[:, 1]
+
+        def event_at(t_sec):
+            return None if t_sec is None else (t_sec, self.lookup(t_sec)[0])
+
+        events = {}
+
+        # Apex: vertical velocity turns downwards (t = 0 if launched level or downwards)
+        events['apex'] = event_at(self._first_time(vy >= 0, lambda pos, v: v[1] >= 0))
+
+        # Ground impact: at or below the ground line while falling
+        events['ground_impact'] = event_at(self._first_time((y >= ground_y_px) & (vy > 0), lambda pos, v: pos[1] >= ground_y_px and v[1] > 0))
+
+        # Target box: first time inside, then first time outside again
+        events['target_entry'] = events['target_exit'] = None
+        if target_rect is not None:
+            left, top, width, height = target_rect
+            right, bottom = left + width, top + height
+            inside = (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+            t_entry = self._first_time(inside, lambda pos, v: left <= pos[0] <= right and top <= pos[1] <= bottom)
+            if t_entry is not None:
+                events['target_entry'] = event_at(t_entry)
+                entry_index = int(np.searchsorted(self.times_sec, t_entry))
+                events['target_exit'] = event_at(self._first_time(
+                    ~inside, lambda pos, v: not (left <= pos[0] <= right and top <= pos[1] <= bottom), after_index=entry_index))
+
+        # Screen edges: the top only counts when starting below it (as in the closed form)
+        left, top, width, height = bounds_rect
+        right, bottom = left + width, top + height
+        check_top = self._positions[0][1] >= top
+
+        def outside(pos, v):
+            return pos[0] < left or pos[0] > right or pos[1] > bottom or (check_top and pos[1] < top)
+
+        outside_mask = (x < left) | (x > right) | (y > bottom) | ((y < top) & check_top)
+        t_exit = self._first_time(outside_mask, outside)
+        events['screen_exit'] = event_at(t_exit)
+        events['screen_exit_edge'] = None
+        if t_exit is not None:
+            exit_x, exit_y = events['screen_exit'][1]
+            events['screen_exit_edge'] = ('left' if exit_x < left else 'right' if exit_x > right else
+                                          'bottom' if exit_y > bottom else 'top')
+        return events
@@ -3,27 +3,34 @@ import pygame
 import config as cfg
 import utils # For drawing text, arrows, conversions
 import math
+import numpy as np
+from hittest import HitGrid
+from profiler import frame_profiler
 
 class UIManager:
     """Manages UI elements, state, drawing, and interactions."""
 
-    def __init__(self, screen, scene_config):
+    SLIDER_LABELS = {"circle_x": "Çember X0", "circle_y": "Çember Y0", "box_x": "Kutu X", "box_y": "Kutu Y"}
+
+    def __init__(self, screen, scene):
         self.screen = screen
-        self.scene_config = scene_config
+        self.scene = scene # scenes.Scene: input labels and Enter behavior of the scene
+        self.scene_config = scene.config
         self.scene_title = self.scene_config.get("title", "Atış Simülasyonu")
         # Get explicitly enabled sliders for this scene
         self.sliders_enabled = self.scene_config.get("sliders_enabled", []) # Use empty list if none specified
 
-        # Load fonts
-        self.font_large = pygame.font.Font(None, cfg.FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, cfg.FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, cfg.FONT_SIZE_SMALL)
-        self.font_formula = pygame.font.Font(None, cfg.FONT_SIZE_FORMULA)
-        self.font_title = pygame.font.Font(None, cfg.FONT_SIZE_SMALL) # Font for title
-        self.font_back_button = pygame.font.Font(None, cfg.FONT_SIZE_SMALL) # Font for back button
+        # Fonts (shared registry: each size is loaded once for all scenes)
+        self.font_large = utils.get_font(cfg.FONT_SIZE_LARGE)
+        self.font_medium = utils.get_font(cfg.FONT_SIZE_MEDIUM)
+        self.font_small = utils.get_font(cfg.FONT_SIZE_SMALL)
+        self.font_formula = utils.get_font(cfg.FONT_SIZE_FORMULA)
+        self.font_title = utils.get_font(cfg.FONT_SIZE_SMALL) # Font for title
+        self.font_back_button = utils.get_font(cfg.FONT_SIZE_SMALL) # Font for back button
 
         # --- UI State ---
         self.sliders = {}
+        self.slider_handle_rects = {} # Enabled slider -> handle rect, updated when its value changes
         self.dragging_slider = None
         self.input_active = False
         self.input_error = False
@@ -33,6 +40,11 @@ class UIManager:
         self.show_vectors = True
         self.show_velocity_vector = False
         self.show_acceleration_vector = False
+        # Prerendered static background (see get_static_layer)
+        self.static_layer = None
+        self.static_layer_key = None
+        self.static_layer_rebuilt = False
+        self.dirty_rects = [] # Areas drawn by the last draw_all (see draw_all)
 
         # --- UI Element Rects ---
         # Define ALL potential slider rects first, even if not enabled for this scene
@@ -42,6 +54,9 @@ class UIManager:
         # Define back button relative to sliders (use circle_y if possible)
         # PASS self.sliders_enabled so it knows which sliders are active
         self._define_back_button_rect(self.sliders_enabled)
+        # Hit-test index over the clickable rects (rebuild with _build_hit_index if they move)
+        self.hit_index = HitGrid()
+        self._build_hit_index()
 
 
     def _define_all_slider_rects(self):
@@ -94,6 +109,25 @@ class UIManager:
             cfg.BACK_BUTTON_HEIGHT
         )
 
+    def _build_hit_index(self):
+        """Indexes the clickable rects in the order handle_event used to test them (back button first)."""
+        items = [("back", self.back_button_rect)]
+        # Track or handle of enabled sliders, taller than the track to be easier to click
+        items += [(key, self.slider_rects_track[key].inflate(0, cfg.SLIDER_HANDLE_HEIGHT))
+                  for key in self.sliders_enabled if key in self.slider_rects_track]
+        items += [
+            ("input_box", self.input_box_rect),
+            ("launch", self.launch_button_rect),
+            ("reset", self.restart_button_rect),
+            ("toggle_vectors", self.toggle_vec_vis_button_rect),
+            ("toggle_velocity", self.toggle_vec_mode_button_rect),
+            ("toggle_acceleration", self.toggle_vec_type_button_rect),
+            ("speed_down", self.speed_minus_button_rect),
+            ("speed_up", self.speed_plus_button_rect),
+            ("pause_toggle", self.pause_button_rect),
+        ]
+        self.hit_index.rebuild(items)
+
     def initialize_sliders(self, projectile, target):
          """Calculates initial slider values based on object positions for ENABLED sliders."""
          drawable_height = cfg.DRAWABLE_HEIGHT
@@ -125,79 +159,67 @@ class UIManager:
                  sliders_temp[key] = 0.5
 
          # Store clamped values for enabled sliders
-         self.sliders = {k: max(0.0, min(1.0, sliders_temp.get(k, 0.5))) for k in self.sliders_enabled}
-
-
-    def get_slider_handle_rect(self, slider_key):
-        """Calculates the rectangle for a slider's handle."""
-        # Check if this slider is actually enabled for the current scene
-        if slider_key not in self.sliders_enabled:
-            return None # Do not calculate or draw if not enabled
-        # Check if track rect exists (safety)
-        if slider_key not in self.slider_rects_track:
-             return None
-
-        track_rect = self.slider_rects_track[slider_key]
-        slider_val = self.sliders.get(slider_key, 0.5) # Get current value (0-1)
-        slider_val = max(0.0, min(1.0, slider_val)) # Clamp value
-
-        # Calculate handle position based on value
+         self.sliders = {}
+         self.slider_handle_rects = {}
+         for key in self.sliders_enabled:
+             self._set_slider(key, sliders_temp.get(key, 0.5))
+
+
+    def _set_slider(self, slider_key, value):
+        """Stores a slider value (clamped to 0-1) and moves its cached handle rect."""
+        self.sliders[slider_key] = max(0.0, min(1.0, value))
+        track_rect = self.slider_rects_track.get(slider_key)
+        if track_rect is None:
+            return
         # Use track_rect.width - cfg.SLIDER_HANDLE_WIDTH as the effective range for the handle's left edge
         effective_track_width = track_rect.width - cfg.SLIDER_HANDLE_WIDTH
-        handle_x = track_rect.left + slider_val * effective_track_width
+        handle_x = track_rect.left + self.sliders[slider_key] * effective_track_width
         handle_y = track_rect.centery - cfg.SLIDER_HANDLE_HEIGHT // 2
-
         # Clamp handle position (redundant due to calculation method, but safe)
         handle_x = max(track_rect.left, min(handle_x, track_rect.right - cfg.SLIDER_HANDLE_WIDTH))
+        self.slider_handle_rects[slider_key] = pygame.Rect(handle_x, handle_y, cfg.SLIDER_HANDLE_WIDTH, cfg.SLIDER_HANDLE_HEIGHT)
 
-        return pygame.Rect(handle_x, handle_y, cfg.SLIDER_HANDLE_WIDTH, cfg.SLIDER_HANDLE_HEIGHT)
+    def _drag_slider(self, slider_key, mouse_x):
+        """Sets a slider from the mouse x position (the handle centered under the mouse)."""
+        track_rect = self.slider_rects_track[slider_key]
+        effective_track_width = track_rect.width - cfg.SLIDER_HANDLE_WIDTH
+        if effective_track_width > 0:
+            raw_val = (mouse_x - track_rect.left - cfg.SLIDER_HANDLE_WIDTH / 2) / effective_track_width
+        else:
+            raw_val = 0.5 # Avoid division by zero if track too small
+        self._set_slider(slider_key, raw_val)
+
+    def get_slider_handle_rect(self, slider_key):
+        """Returns the cached handle rect of an enabled slider (None for sliders not enabled in this scene)."""
+        return self.slider_handle_rects.get(slider_key)
 
 
     def handle_event(self, event, simulation_running, simulation_paused):
         """Processes a single Pygame event and updates UI state."""
         action = None
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = getattr(event, "pos", None) # Canvas coordinates (main.py maps window positions)
+
+        # One grid lookup per click instead of testing every rect
+        clicked = self.hit_index.hit(mouse_pos) if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 else None
 
         # Check Back Button First
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if self.back_button_rect.collidepoint(mouse_pos):
-                return "back_to_menu"
+        if clicked == "back":
+            return "back_to_menu"
 
         # Handle Slider Interactions (Only if sliders are enabled for the scene)
         if self.sliders_enabled: # Optimization: Only check sliders if there are any enabled
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 self.dragging_slider = None
-                for key in self.sliders_enabled: # Only check enabled sliders
-                    track_rect = self.slider_rects_track.get(key)
-                    handle_rect = self.get_slider_handle_rect(key) # This now returns None if not enabled
-                    if track_rect and handle_rect: # Check if rects exist
-                        # Allow clicking on track or handle
-                        clickable_area = track_rect.inflate(0, cfg.SLIDER_HANDLE_HEIGHT) # Make track easier to click vertically
-                        if clickable_area.collidepoint(mouse_pos):
-                            self.dragging_slider = key
-                            # Update value immediately if track clicked
-                            # Adjust calculation for effective width
-                            effective_track_width = track_rect.width - cfg.SLIDER_HANDLE_WIDTH
-                            if effective_track_width > 0:
-                               raw_val = (mouse_pos[0] - track_rect.left - cfg.SLIDER_HANDLE_WIDTH / 2) / effective_track_width
-                            else:
-                               raw_val = 0.5 # Avoid division by zero if track too small
-                            self.sliders[key] = max(0.0, min(1.0, raw_val))
-                            action = "update_slider"
-                            break # Found slider, stop checking
+                if clicked in self.sliders_enabled: # Track or handle of an enabled slider
+                    self.dragging_slider = clicked
+                    self._drag_slider(clicked, mouse_pos[0]) # Update value immediately if track clicked
+                    action = "update_slider"
             elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 self.dragging_slider = None
             elif event.type == pygame.MOUSEMOTION and self.dragging_slider is not None:
                 # Ensure the dragged slider is actually enabled for this scene
                 if self.dragging_slider in self.sliders_enabled:
-                    track_rect = self.slider_rects_track[self.dragging_slider]
-                    # Adjust calculation for effective width
-                    effective_track_width = track_rect.width - cfg.SLIDER_HANDLE_WIDTH
-                    if effective_track_width > 0:
-                        raw_val = (mouse_pos[0] - track_rect.left - cfg.SLIDER_HANDLE_WIDTH / 2) / effective_track_width
-                    else:
-                        raw_val = 0.5
-                    self.sliders[self.dragging_slider] = max(0.0, min(1.0, raw_val))
+                    self._drag_slider(self.dragging_slider, mouse_pos[0])
                     action = "update_slider"
                 else: # Should not happen if logic is correct, but safety check
                     self.dragging_slider = None
@@ -206,33 +228,25 @@ class UIManager:
         if self.dragging_slider is None:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # Input Box Activation
-                self.input_active = self.input_box_rect.collidepoint(mouse_pos)
+                self.input_active = clicked == "input_box"
                 if self.input_active:
                     self.input_error = False; self.error_message = None
 
                 # Button Clicks
-                if self.launch_button_rect.collidepoint(mouse_pos) and not simulation_running: action = "launch"
-                elif self.restart_button_rect.collidepoint(mouse_pos): action = "reset"
-                elif self.toggle_vec_vis_button_rect.collidepoint(mouse_pos): self.show_vectors = not self.show_vectors
-                elif self.toggle_vec_mode_button_rect.collidepoint(mouse_pos): self.show_velocity_vector = not self.show_velocity_vector
-                elif self.toggle_vec_type_button_rect.collidepoint(mouse_pos): self.show_acceleration_vector = not self.show_acceleration_vector
-                elif self.speed_minus_button_rect.collidepoint(mouse_pos): action = "speed_down"
-                elif self.speed_plus_button_rect.collidepoint(mouse_pos): action = "speed_up"
-                elif self.pause_button_rect.collidepoint(mouse_pos) and (simulation_running or simulation_paused): # Allow toggle even if finished but was running
+                if clicked == "launch":
+                    if not simulation_running: action = "launch"
+                elif clicked in ("reset", "speed_down", "speed_up"): action = clicked
+                elif clicked == "toggle_vectors": self.show_vectors = not self.show_vectors
+                elif clicked == "toggle_velocity": self.show_velocity_vector = not self.show_velocity_vector
+                elif clicked == "toggle_acceleration": self.show_acceleration_vector = not self.show_acceleration_vector
+                elif clicked == "pause_toggle" and (simulation_running or simulation_paused): # Allow toggle even if finished but was running
                     action = "pause_toggle"
 
             # Keyboard Input for Active Input Box
             elif event.type == pygame.KEYDOWN and self.input_active:
-                active_scene_name = self.scene_config.get("title", "") # Get scene name for context
                 if event.key == pygame.K_RETURN:
                     self.input_active = False
-                    # Trigger action based on scene type after Enter
-                    if active_scene_name.startswith("Yatay Atış"):
-                        action = "launch" # Yatay calculates time, so Enter launches
-                    elif active_scene_name.startswith("Dikey Atış"):
-                         action = "launch" # Dikey uses input time, Enter launches
-                    else: # Default (Eğik Atış etc.)
-                        action = "validate_time" # Other scenes validate time first
+                    action = self.scene.enter_action # Launch, or validate the time first
                 elif event.key == pygame.K_BACKSPACE:
                     self.time_to_target_str = self.time_to_target_str[:-1]
                     self.input_error = False; self.error_message = None
@@ -258,46 +272,148 @@ class UIManager:
             return None
 
     def draw_all(self, game_state):
-        """Draws all UI elements based on the provided game state."""
-        self.screen.fill(cfg.BLUE)
-        self.draw_scene_title(game_state.get('scene_title', '')) # Draw scene title first
-        self.draw_formulas(game_state)
+        """
+        Draws all UI elements based on the provided game state.
+
+        Afterwards dirty_rects lists the screen areas the per-frame draws touched and
+        static_layer_rebuilt tells whether the whole background changed (for dirty-rect rendering).
+        """
+        self.dirty_rects = []
+        self.static_layer_rebuilt = False
+        # Everything that only changes with scene / toggles / pause comes from one cached surface
+        with frame_profiler.section("ui.static_layer"):
+            self.screen.blit(self.get_static_layer(game_state), (0, 0))
+        with frame_profiler.section("ui.draw_formulas"):
+            self.draw_formulas(game_state)
         self.draw_formula_controls(game_state['simulation_paused'], game_state['simulation_speed_multiplier'])
-        self.draw_separator()
         # Draw sliders only if they are enabled for the scene
         if self.sliders_enabled:
-            self.draw_sliders(game_state['projectile'], game_state['target'])
-        self.draw_back_button() # Draw back button (positioning is now independent)
-        self.draw_bottom_controls(game_state.get('active_scene_name')) # Pass scene name for context
+            with frame_profiler.section("ui.draw_sliders"):
+                self.draw_sliders(game_state['projectile'], game_state['target'])
+        self.draw_bottom_controls()
         self.draw_time(game_state['current_t_elapsed_sec'])
         # Draw vectors only if enabled AND simulation has started or finished (velocities exist)
         if self.show_vectors and (game_state['simulation_running'] or game_state['current_t_elapsed_sec'] > 0 or game_state['simulation_paused']):
-             self.draw_vectors(game_state)
-
+            with frame_profiler.section("ui.draw_vectors"):
+                self.draw_vectors(game_state)
+
+    # --- Static Background Layer ---
+
+    def _static_layer_key(self, game_state):
+        """Everything the static layer depends on; the layer is rebuilt when this changes."""
+        return (game_state.get('scene_title', ''), game_state.get('active_scene_name'), game_state['simulation_paused'],
+                self.show_vectors, self.show_velocity_vector, self.show_acceleration_vector, self.screen.get_size())
+
+    def get_static_layer(self, game_state):
+        """Returns the prerendered static background, rebuilding it only if its inputs changed."""
+        key = self._static_layer_key(game_state)
+        if self.static_layer is None or key != self.static_layer_key:
+            self.static_layer = self.build_static_layer(game_state)
+            self.static_layer_key = key
+            self.static_layer_rebuilt = True
+        return self.static_layer
+
+    def invalidate_static_layer(self):
+        """Forces the static layer to be rebuilt on the next draw."""
+        self.static_layer = None
+
+    def build_static_layer(self, game_state):
+        """Draws background, title, formula headings, separator, slider tracks and buttons onto a new surface."""
+        surface = pygame.Surface(self.screen.get_size(), 0, self.screen) # Same pixel format as the screen
+        surface.fill(cfg.BLUE)
+        self.draw_scene_title(surface, game_state.get('scene_title', '')) # Draw scene title first
+        self.draw_formula_headings(surface)
+        self.draw_formula_buttons(surface, game_state['simulation_paused'])
+        self.draw_separator(surface)
+        if self.sliders_enabled:
+            self.draw_slider_tracks(surface)
+        self.draw_back_button(surface) # Draw back button (positioning is now independent)
+        self.draw_control_buttons(surface)
+        return surface
 
-    def draw_back_button(self):
+    def draw_back_button(self, surface):
         """Draws the Back button."""
-        pygame.draw.rect(self.screen, cfg.GRAY, self.back_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        utils.draw_text(cfg.BACK_BUTTON_TEXT, self.font_back_button, cfg.BLACK, self.screen, self.back_button_rect.centerx, self.back_button_rect.centery, center=True)
+        pygame.draw.rect(surface, cfg.GRAY, self.back_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        utils.draw_text(cfg.BACK_BUTTON_TEXT, self.font_back_button, cfg.BLACK, surface, self.back_button_rect.centerx, self.back_button_rect.centery, center=True)
 
-    def draw_scene_title(self, title):
+    def draw_scene_title(self, surface, title):
         """Draws the current scene title at the top."""
         # No longer need to adjust Y position based on back button
         title_y = cfg.SCENE_TITLE_Y
         if title:
-             utils.draw_text(title, self.font_title, cfg.WHITE, self.screen, cfg.WIDTH / 2, title_y, center=True)
+             utils.draw_text(title, self.font_title, cfg.WHITE, surface, cfg.WIDTH / 2, title_y, center=True)
 
-    def draw_formulas(self, game_state):
-        """Draws the formula text display."""
+    def draw_formula_headings(self, surface):
+        """Draws the fixed kinematic equations and the heading of the live calculations."""
         line_height = self.font_formula.get_linesize() * cfg.FORMULA_LINE_HEIGHT_MULTIPLIER
         col1_x = cfg.FORMULA_COL1_X
-        col2_x = cfg.FORMULA_COL2_X
 
         # Kinematic Equations
-        utils.draw_text("Kinematik Denklemler:", self.font_medium, cfg.WHITE, self.screen, col1_x, cfg.FORMULA_Y_START)
-        utils.draw_text(f"x(t) = V0x * t", self.font_formula, cfg.WHITE, self.screen, col1_x, cfg.FORMULA_Y_START + line_height * 1.2)
-        utils.draw_text(f"y(t) = V0y * t - 0.5 * g * t²", self.font_formula, cfg.WHITE, self.screen, col1_x, cfg.FORMULA_Y_START + line_height * 2.2)
-        utils.draw_text(f"(g = {cfg.G_METERS_PER_SEC2} m/s², V0y yukarı pozitif)", self.font_small, cfg.LIGHT_GRAY, self.screen, col1_x, cfg.FORMULA_Y_START + line_height * 3.2)
+        utils.draw_text("Kinematik Denklemler:", self.font_medium, cfg.WHITE, surface, col1_x, cfg.FORMULA_Y_START)
+        utils.draw_text(f"x(t) = V0x * t", self.font_formula, cfg.WHITE, surface, col1_x, cfg.FORMULA_Y_START + line_height * 1.2)
+        utils.draw_text(f"y(t) = V0y * t - 0.5 * g * t²", self.font_formula, cfg.WHITE, surface, col1_x, cfg.FORMULA_Y_START + line_height * 2.2)
+        utils.draw_text(f"(g = {cfg.G_METERS_PER_SEC2} m/s², V0y yukarı pozitif)", self.font_small, cfg.LIGHT_GRAY, surface, col1_x, cfg.FORMULA_Y_START + line_height * 3.2)
+
+        utils.draw_text("Anlık Hesaplamalar:", self.font_medium, cfg.WHITE, surface, cfg.FORMULA_COL2_X, cfg.FORMULA_Y_START)
+
+    def draw_formula_buttons(self, surface, simulation_paused):
+        """Draws the pause/resume and speed control buttons."""
+        pause_text = "Devam Et" if simulation_paused else "Durdur"
+        pygame.draw.rect(surface, cfg.LIGHT_GRAY, self.pause_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        utils.draw_text(pause_text, self.font_medium, cfg.BLACK, surface, self.pause_button_rect.centerx, self.pause_button_rect.centery, center=True)
+        pygame.draw.rect(surface, cfg.LIGHT_GRAY, self.speed_minus_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        utils.draw_text("-", self.font_large, cfg.BLACK, surface, self.speed_minus_button_rect.centerx, self.speed_minus_button_rect.centery, center=True)
+        pygame.draw.rect(surface, cfg.LIGHT_GRAY, self.speed_plus_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        utils.draw_text("+", self.font_large, cfg.BLACK, surface, self.speed_plus_button_rect.centerx, self.speed_plus_button_rect.centery, center=True)
+
+    def draw_separator(self, surface):
+        """Draws the line separating formula area from main simulation area."""
+        line_y = cfg.FORMULA_AREA_HEIGHT - cfg.FORMULA_AREA_LINE_Y_OFFSET
+        pygame.draw.line(surface, cfg.WHITE, (0, line_y), (cfg.WIDTH, line_y), cfg.FORMULA_AREA_LINE_THICKNESS)
+
+    def draw_slider_tracks(self, surface):
+        """Draws the tracks and labels of the ENABLED sliders."""
+        for key in self.sliders_enabled:
+            track_rect = self.slider_rects_track.get(key)
+            if not track_rect:
+                 continue
+            pygame.draw.rect(surface, cfg.GRAY, track_rect, border_radius=cfg.SLIDER_TRACK_BORDER_RADIUS)
+            utils.draw_text(self.SLIDER_LABELS.get(key, "??"), self.font_small, cfg.WHITE, surface, track_rect.left, track_rect.bottom + cfg.SLIDER_LABEL_Y_OFFSET)
+
+    def draw_control_buttons(self, surface):
+        """Draws the input box label (text and color from the scene) and the main action buttons."""
+        utils.draw_text(self.scene.input_label, self.font_small, self.scene.input_label_color, surface, self.input_box_rect.left, self.input_box_rect.top + cfg.INPUT_LABEL_Y_OFFSET)
+
+        # Draw Buttons
+        pygame.draw.rect(surface, cfg.LIGHT_GRAY, self.launch_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        utils.draw_text("Fırlat", self.font_medium, cfg.BLACK, surface, self.launch_button_rect.centerx, self.launch_button_rect.centery, center=True)
+
+        pygame.draw.rect(surface, cfg.LIGHT_GRAY, self.restart_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        utils.draw_text("Yeniden Başlat", self.font_medium, cfg.BLACK, surface, self.restart_button_rect.centerx, self.restart_button_rect.centery, center=True)
+
+        pygame.draw.rect(surface, cfg.LIGHT_GRAY, self.toggle_vec_vis_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        vec_vis_text = "Vektör Gizle" if self.show_vectors else "Vektör Göster"
+        utils.draw_text(vec_vis_text, self.font_medium, cfg.BLACK, surface, self.toggle_vec_vis_button_rect.centerx, self.toggle_vec_vis_button_rect.centery, center=True)
+
+        pygame.draw.rect(surface, cfg.LIGHT_GRAY, self.toggle_vec_mode_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        vec_mode_text = "Bileşen Göster" if self.show_velocity_vector else "Toplam Hız Göster"
+        utils.draw_text(vec_mode_text, self.font_medium, cfg.BLACK, surface, self.toggle_vec_mode_button_rect.centerx, self.toggle_vec_mode_button_rect.centery, center=True)
+
+        pygame.draw.rect(surface, cfg.LIGHT_GRAY, self.toggle_vec_type_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        vec_type_text = "Hız Vek. Göster" if self.show_acceleration_vector else "İvme Vek. Göster"
+        utils.draw_text(vec_type_text, self.font_medium, cfg.BLACK, surface, self.toggle_vec_type_button_rect.centerx, self.toggle_vec_type_button_rect.centery, center=True)
+
+    # --- Per-frame (Dynamic) Drawing ---
+
+    def _mark_dirty(self, rect):
+        """Records a rect drawn this frame (draw helpers return None when nothing was drawn)."""
+        if rect:
+            self.dirty_rects.append(rect)
+
+    def draw_formulas(self, game_state):
+        """Draws the live values of the formula display."""
+        line_height = self.font_formula.get_linesize() * cfg.FORMULA_LINE_HEIGHT_MULTIPLIER
+        col2_x = cfg.FORMULA_COL2_X
 
         # Instantaneous Calculations
         current_displacement_x_m = 0.0
@@ -311,46 +427,26 @@ class UIManager:
                 current_displacement_y_m = utils.px_to_m(proj.initial_pos_px[1] - proj.current_pos_px[1])
             except (AttributeError, IndexError): pass # Ignore errors if projectile state isn't ready
 
-        utils.draw_text("Anlık Hesaplamalar:", self.font_medium, cfg.WHITE, self.screen, col2_x, cfg.FORMULA_Y_START)
         elapsed_t = game_state.get('current_t_elapsed_sec', 0.0)
         launch_vx_mps = game_state.get('launch_v0x_mps_display', 0.0)
         launch_vy_mps = game_state.get('launch_v0y_mps_display', 0.0)
         x_calc_text = f"ΔX: {current_displacement_x_m:.2f}m = {launch_vx_mps:.2f}m/s * {elapsed_t:.2f}s"
         y_calc_text = f"ΔY: {current_displacement_y_m:.2f}m = {launch_vy_mps:.2f}m/s * {elapsed_t:.2f}s - 0.5*{cfg.G_METERS_PER_SEC2:.2f}*({elapsed_t:.2f}s)²"
-        utils.draw_text(x_calc_text, self.font_formula, cfg.WHITE, self.screen, col2_x, cfg.FORMULA_Y_START + line_height * 1.2)
-        utils.draw_text(y_calc_text, self.font_formula, cfg.WHITE, self.screen, col2_x, cfg.FORMULA_Y_START + line_height * 2.2)
+        self._mark_dirty(utils.draw_text(x_calc_text, self.font_formula, cfg.WHITE, self.screen, col2_x, cfg.FORMULA_Y_START + line_height * 1.2, volatile=True))
+        self._mark_dirty(utils.draw_text(y_calc_text, self.font_formula, cfg.WHITE, self.screen, col2_x, cfg.FORMULA_Y_START + line_height * 2.2, volatile=True))
 
-        # Display Target Time (adjust label based on scene)
-        active_scene_name = game_state.get('active_scene_name')
-        target_time_label = "Hedef t"
-        if active_scene_name == "Yatay Atış":
-             target_time_label = "Hesap. t"
-        elif active_scene_name == "Dikey Atış":
-             target_time_label = "Toplam t"
-        t_target_str_disp = f"{target_time_label} = {game_state.get('time_to_target_sec', 0.0):.2f} s"
-        utils.draw_text(t_target_str_disp, self.font_formula, cfg.WHITE, self.screen, col2_x, cfg.FORMULA_Y_START + line_height * 3.2)
+        # Display Target Time (label from the scene)
+        t_target_str_disp = f"{self.scene.time_label} = {game_state.get('time_to_target_sec', 0.0):.2f} s"
+        self._mark_dirty(utils.draw_text(t_target_str_disp, self.font_formula, cfg.WHITE, self.screen, col2_x, cfg.FORMULA_Y_START + line_height * 3.2, volatile=True))
 
 
     def draw_formula_controls(self, simulation_paused, simulation_speed_multiplier):
-        """Draws the pause/resume and speed control buttons."""
-        pause_text = "Devam Et" if simulation_paused else "Durdur"
-        pygame.draw.rect(self.screen, cfg.LIGHT_GRAY, self.pause_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        utils.draw_text(pause_text, self.font_medium, cfg.BLACK, self.screen, self.pause_button_rect.centerx, self.pause_button_rect.centery, center=True)
-        pygame.draw.rect(self.screen, cfg.LIGHT_GRAY, self.speed_minus_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        utils.draw_text("-", self.font_large, cfg.BLACK, self.screen, self.speed_minus_button_rect.centerx, self.speed_minus_button_rect.centery, center=True)
-        pygame.draw.rect(self.screen, cfg.LIGHT_GRAY, self.speed_plus_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        utils.draw_text("+", self.font_large, cfg.BLACK, self.screen, self.speed_plus_button_rect.centerx, self.speed_plus_button_rect.centery, center=True)
+        """Draws the speed readout between the speed buttons (the buttons are on the static layer)."""
         speed_text = f"Hız: {simulation_speed_multiplier:.1f}x"
-        utils.draw_text(speed_text, self.font_medium, cfg.WHITE, self.screen, self.speed_minus_button_rect.right + (self.speed_plus_button_rect.left - self.speed_minus_button_rect.right) // 2, self.speed_minus_button_rect.centery, center=True)
-
-    def draw_separator(self):
-        """Draws the line separating formula area from main simulation area."""
-        line_y = cfg.FORMULA_AREA_HEIGHT - cfg.FORMULA_AREA_LINE_Y_OFFSET
-        pygame.draw.line(self.screen, cfg.WHITE, (0, line_y), (cfg.WIDTH, line_y), cfg.FORMULA_AREA_LINE_THICKNESS)
+        self._mark_dirty(utils.draw_text(speed_text, self.font_medium, cfg.WHITE, self.screen, self.speed_minus_button_rect.right + (self.speed_plus_button_rect.left - self.speed_minus_button_rect.right) // 2, self.speed_minus_button_rect.centery, center=True))
 
     def draw_sliders(self, projectile, target):
-        """Draws the sliders with handles, labels, and coordinates for ENABLED sliders."""
-        slider_labels = {"circle_x": "Çember X0", "circle_y": "Çember Y0", "box_x": "Kutu X", "box_y": "Kutu Y"}
+        """Draws the handles and coordinates of ENABLED sliders (tracks and labels are on the static layer)."""
         if not projectile or not target: return
 
         # Iterate ONLY through the sliders enabled for this scene
@@ -361,19 +457,16 @@ class UIManager:
 
             # Skip drawing if rects are missing (shouldn't happen for enabled sliders if defined)
             if not track_rect or not handle_rect:
-                 # print(f"Warning: Missing rect for enabled slider '{key}'") # Optional debug
                  continue
 
-            # Draw Track and Handle
-            pygame.draw.rect(self.screen, cfg.GRAY, track_rect, border_radius=cfg.SLIDER_TRACK_BORDER_RADIUS)
-            pygame.draw.rect(self.screen, cfg.BLACK, handle_rect, border_radius=cfg.SLIDER_HANDLE_BORDER_RADIUS)
+            # Draw Handle
+            self._mark_dirty(pygame.draw.rect(self.screen, cfg.BLACK, handle_rect, border_radius=cfg.SLIDER_HANDLE_BORDER_RADIUS))
 
-            # Draw Label
-            label_text = slider_labels.get(key, "??")
+            # Label position (label itself is drawn on the static layer)
+            label_text = self.SLIDER_LABELS.get(key, "??")
             label_x = track_rect.left
             label_y = track_rect.bottom + cfg.SLIDER_LABEL_Y_OFFSET
-            utils.draw_text(label_text, self.font_small, cfg.WHITE, self.screen, label_x, label_y)
-            label_textobj = self.font_small.render(label_text, True, cfg.WHITE)
+            label_textobj = utils.render_text_cached(self.font_small, label_text, cfg.WHITE)
             label_textrect = label_textobj.get_rect(topleft=(label_x, label_y))
 
             # Draw Coordinate Text
@@ -401,71 +494,51 @@ class UIManager:
                 if coord_text:
                     coord_x = label_textrect.right + cfg.SLIDER_LABEL_COORD_SPACING_X
                     coord_y = label_y
-                    utils.draw_text(coord_text, self.font_small, cfg.LIGHT_GRAY, self.screen, coord_x, coord_y)
+                    self._mark_dirty(utils.draw_text(coord_text, self.font_small, cfg.LIGHT_GRAY, self.screen, coord_x, coord_y, volatile=True))
             except (IndexError, AttributeError, TypeError, NameError) as e:
                  # print(f"Error drawing coordinate for slider {key}: {e}") # Optional debug
                  pass # Don't crash if coordinate calculation fails
 
-    def draw_bottom_controls(self, active_scene_name=None):
-        """Draws the input box and main action buttons, adjusting for scene context."""
+    def draw_bottom_controls(self):
+        """Draws the input box and its error message (label and buttons are on the static layer)."""
         # Determine Input Box Color
         input_box_color = cfg.INPUT_BOX_ACTIVE_COLOR if self.input_active else cfg.INPUT_BOX_INACTIVE_COLOR
         if self.input_error: input_box_color = cfg.ERROR_COLOR
 
         # Draw Input Box and Border
-        pygame.draw.rect(self.screen, input_box_color, self.input_box_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
+        self._mark_dirty(pygame.draw.rect(self.screen, input_box_color, self.input_box_rect, border_radius=cfg.BUTTON_BORDER_RADIUS))
         pygame.draw.rect(self.screen, cfg.BLACK, self.input_box_rect, cfg.INPUT_BOX_BORDER_WIDTH, border_radius=cfg.BUTTON_BORDER_RADIUS)
 
         # Draw Text Inside Input Box
-        utils.draw_text(self.time_to_target_str, self.font_medium, cfg.BLACK, self.screen, self.input_box_rect.x + cfg.INPUT_TEXT_X_OFFSET, self.input_box_rect.y + cfg.INPUT_TEXT_Y_OFFSET)
-
-        # Determine and Draw Input Label Text and Color based on Scene
-        input_label_text = "Hedef Süre (s):" # Default
-        input_label_color = cfg.WHITE
-        if active_scene_name == "Yatay Atış":
-            input_label_text = "Hesaplanan Süre:"
-            input_label_color = cfg.GRAY # Gray out as it's calculated
-        elif active_scene_name == "Dikey Atış":
-             input_label_text = "Toplam Süre (s):" # Indicate round trip time
-             input_label_color = cfg.WHITE # User inputs this
-
-        utils.draw_text(input_label_text, self.font_small, input_label_color, self.screen, self.input_box_rect.left, self.input_box_rect.top + cfg.INPUT_LABEL_Y_OFFSET)
+        self._mark_dirty(utils.draw_text(self.time_to_target_str, self.font_medium, cfg.BLACK, self.screen, self.input_box_rect.x + cfg.INPUT_TEXT_X_OFFSET, self.input_box_rect.y + cfg.INPUT_TEXT_Y_OFFSET, volatile=True))
 
         # Draw Error Message if present
         if self.error_message:
             error_text_y = self.input_box_rect.top + cfg.INPUT_LABEL_Y_OFFSET - self.font_small.get_height() - 2
-            utils.draw_text(self.error_message, self.font_small, cfg.ERROR_COLOR, self.screen, self.input_box_rect.left, error_text_y)
-
-        # Draw Buttons
-        pygame.draw.rect(self.screen, cfg.LIGHT_GRAY, self.launch_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        utils.draw_text("Fırlat", self.font_medium, cfg.BLACK, self.screen, self.launch_button_rect.centerx, self.launch_button_rect.centery, center=True)
-
-        pygame.draw.rect(self.screen, cfg.LIGHT_GRAY, self.restart_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        utils.draw_text("Yeniden Başlat", self.font_medium, cfg.BLACK, self.screen, self.restart_button_rect.centerx, self.restart_button_rect.centery, center=True)
-
-        pygame.draw.rect(self.screen, cfg.LIGHT_GRAY, self.toggle_vec_vis_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        vec_vis_text = "Vektör Gizle" if self.show_vectors else "Vektör Göster"
-        utils.draw_text(vec_vis_text, self.font_medium, cfg.BLACK, self.screen, self.toggle_vec_vis_button_rect.centerx, self.toggle_vec_vis_button_rect.centery, center=True)
-
-        pygame.draw.rect(self.screen, cfg.LIGHT_GRAY, self.toggle_vec_mode_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        vec_mode_text = "Bileşen Göster" if self.show_velocity_vector else "Toplam Hız Göster"
-        utils.draw_text(vec_mode_text, self.font_medium, cfg.BLACK, self.screen, self.toggle_vec_mode_button_rect.centerx, self.toggle_vec_mode_button_rect.centery, center=True)
-
-        pygame.draw.rect(self.screen, cfg.LIGHT_GRAY, self.toggle_vec_type_button_rect, border_radius=cfg.BUTTON_BORDER_RADIUS)
-        vec_type_text = "Hız Vek. Göster" if self.show_acceleration_vector else "İvme Vek. Göster"
-        utils.draw_text(vec_type_text, self.font_medium, cfg.BLACK, self.screen, self.toggle_vec_type_button_rect.centerx, self.toggle_vec_type_button_rect.centery, center=True)
+            self._mark_dirty(utils.draw_text(self.error_message, self.font_small, cfg.ERROR_COLOR, self.screen, self.input_box_rect.left, error_text_y))
 
 
     def draw_vectors(self, game_state):
-        """Draws velocity and/or acceleration vectors."""
+        """
+        Draws velocity and/or acceleration vectors of the projectile (with labels) and, if
+        cfg.SWARM_VECTORS_ENABLED, of every visible swarm projectile. Arrows are collected per
+        color and drawn with one utils.draw_arrows call per color.
+        """
         proj = game_state.get('projectile')
         if not proj: return
+        arrows = {} # color -> ([start arrays], [end arrays])
+        def add_arrows(color, starts, ends):
+            color_starts, color_ends = arrows.setdefault(color, ([], []))
+            color_starts.append(np.asarray(starts, dtype=np.float64).reshape(-1, 2))
+            color_ends.append(np.asarray(ends, dtype=np.float64).reshape(-1, 2))
+
         vx = game_state.get('current_vx_px_s', 0.0)
         vy = game_state.get('current_vy_px_s', 0.0)
         center_x = int(proj.current_pos_px[0])
         center_y = int(proj.current_pos_px[1])
         vx_mps = utils.px_s_to_mps(vx)
         vy_mps = utils.px_s_to_mps(-vy) # Physics coords (up positive)
+        labels = [] # Drawn after the arrows, on top
 
         # Draw Acceleration Vector (always down)
         if self.show_acceleration_vector:
@@ -473,8 +546,8 @@ class UIManager:
             end_x = center_x
             # Scale the visual length for better visibility
             end_y = center_y + accel_y_px * cfg.VECTOR_SCALE * cfg.ACCELERATION_VECTOR_SCALE_MULTIPLIER
-            utils.draw_arrow(self.screen, cfg.GREEN, (center_x, center_y), (end_x, end_y), cfg.VECTOR_ARROW_SIZE)
-            utils.draw_text(f"a: {cfg.G_METERS_PER_SEC2:.2f} m/s²", self.font_small, cfg.GREEN, self.screen, end_x + cfg.VECTOR_TEXT_OFFSET_X, end_y + cfg.VECTOR_TEXT_OFFSET_Y_DOWN)
+            add_arrows(cfg.GREEN, (center_x, center_y), (end_x, end_y))
+            labels.append((f"a: {cfg.G_METERS_PER_SEC2:.2f} m/s²", cfg.GREEN, end_x + cfg.VECTOR_TEXT_OFFSET_X, end_y + cfg.VECTOR_TEXT_OFFSET_Y_DOWN))
         # Draw Velocity Vector(s)
         else:
             # Only draw if there's significant velocity
@@ -484,32 +557,66 @@ class UIManager:
                     mag_px_s = math.hypot(vx, vy)
                     end_x = center_x + vx * cfg.VECTOR_SCALE
                     end_y = center_y + vy * cfg.VECTOR_SCALE
-                    utils.draw_arrow(self.screen, cfg.MAGENTA, (center_x, center_y), (end_x, end_y), cfg.VECTOR_ARROW_SIZE)
+                    add_arrows(cfg.MAGENTA, (center_x, center_y), (end_x, end_y))
                     mag_mps = utils.px_s_to_mps(mag_px_s)
                     # Adjust text position based on vector direction
                     text_x = end_x + cfg.VECTOR_COMBINED_OFFSET * math.copysign(1, vx) if vx != 0 else end_x + cfg.VECTOR_COMBINED_OFFSET
                     text_y = end_y + (cfg.VECTOR_COMBINED_OFFSET * math.copysign(1, vy) if vy != 0 else cfg.VECTOR_COMBINED_OFFSET)
-                    utils.draw_text(f"Hız: {mag_mps:.2f} m/s", self.font_small, cfg.MAGENTA, self.screen, text_x, text_y)
+                    labels.append((f"Hız: {mag_mps:.2f} m/s", cfg.MAGENTA, text_x, text_y))
                 # Velocity Components (Vx and Vy)
                 else:
                     # Draw Vx only if non-zero
                     if abs(vx) > 1e-6:
                         end_x_vx = center_x + vx * cfg.VECTOR_SCALE
                         end_y_vx = center_y
-                        utils.draw_arrow(self.screen, cfg.WHITE, (center_x, center_y), (end_x_vx, end_y_vx), cfg.VECTOR_ARROW_SIZE)
-                        utils.draw_text(f"Vx: {vx_mps:.2f} m/s", self.font_small, cfg.WHITE, self.screen, end_x_vx + cfg.VECTOR_TEXT_OFFSET_X, end_y_vx + cfg.VECTOR_TEXT_OFFSET_Y_UP)
+                        add_arrows(cfg.WHITE, (center_x, center_y), (end_x_vx, end_y_vx))
+                        labels.append((f"Vx: {vx_mps:.2f} m/s", cfg.WHITE, end_x_vx + cfg.VECTOR_TEXT_OFFSET_X, end_y_vx + cfg.VECTOR_TEXT_OFFSET_Y_UP))
                     # Draw Vy only if non-zero
                     if abs(vy) > 1e-6:
                         end_x_vy = center_x
                         end_y_vy = center_y + vy * cfg.VECTOR_SCALE
-                        utils.draw_arrow(self.screen, cfg.BLACK, (center_x, center_y), (end_x_vy, end_y_vy), cfg.VECTOR_ARROW_SIZE)
+                        add_arrows(cfg.BLACK, (center_x, center_y), (end_x_vy, end_y_vy))
                         # Adjust label y position based on vector direction (up/down)
                         label_y = end_y_vy + cfg.VECTOR_TEXT_OFFSET_Y_DOWN if vy >= 0 else end_y_vy + cfg.VECTOR_TEXT_OFFSET_Y_UP
-                        utils.draw_text(f"Vy: {vy_mps:.2f} m/s", self.font_small, cfg.BLACK, self.screen, end_x_vy + cfg.VECTOR_TEXT_OFFSET_X, label_y)
+                        labels.append((f"Vy: {vy_mps:.2f} m/s", cfg.BLACK, end_x_vy + cfg.VECTOR_TEXT_OFFSET_X, label_y))
+
+        swarm = game_state.get('swarm')
+        if swarm is not None and cfg.SWARM_VECTORS_ENABLED:
+            self._add_swarm_vectors(swarm, add_arrows)
+
+        for color, (color_starts, color_ends) in arrows.items():
+            self._mark_dirty(utils.draw_arrows(self.screen, color, np.concatenate(color_starts), np.concatenate(color_ends), cfg.VECTOR_ARROW_SIZE))
+        for text, color, text_x, text_y in labels:
+            self._mark_dirty(utils.draw_text(text, self.font_small, color, self.screen, text_x, text_y, volatile=True))
+
+    def _add_swarm_vectors(self, swarm, add_arrows):
+        """Adds the arrows of every visible swarm projectile in the current vector mode (no labels)."""
+        indices = swarm.visible_indices()
+        if not len(indices):
+            return
+        centers = swarm.pos_px[indices].astype(np.int64).astype(np.float64) # Same rounding as the projectile's center
+        if self.show_acceleration_vector:
+            ends = centers.copy()
+            ends[:, 1] += cfg.GRAVITY_PX_PER_SEC2 * cfg.VECTOR_SCALE * cfg.ACCELERATION_VECTOR_SCALE_MULTIPLIER
+            add_arrows(cfg.GREEN, centers, ends)
+            return
+        v_px_s = swarm.v_px_s[indices]
+        moving_x = np.abs(v_px_s[:, 0]) > 1e-6
+        moving_y = np.abs(v_px_s[:, 1]) > 1e-6
+        if self.show_velocity_vector:
+            moving = moving_x | moving_y
+            add_arrows(cfg.MAGENTA, centers[moving], centers[moving] + v_px_s[moving] * cfg.VECTOR_SCALE)
+        else:
+            ends_vx = centers[moving_x].copy()
+            ends_vx[:, 0] += v_px_s[moving_x, 0] * cfg.VECTOR_SCALE
+            add_arrows(cfg.WHITE, centers[moving_x], ends_vx)
+            ends_vy = centers[moving_y].copy()
+            ends_vy[:, 1] += v_px_s[moving_y, 1] * cfg.VECTOR_SCALE
+            add_arrows(cfg.BLACK, centers[moving_y], ends_vy)
 
     def draw_time(self, elapsed_time_sec):
         """Draws the elapsed simulation time."""
         time_text_x = cfg.TIME_TEXT_X_OFFSET
         # Position time text relative to bottom controls
         time_text_y = cfg.CONTROL_AREA_Y_START - cfg.TIME_TEXT_Y_OFFSET # Place above controls
-        utils.draw_text(f"Geçen Süre: {elapsed_time_sec:.2f} s", self.font_small, cfg.WHITE, self.screen, time_text_x, time_text_y)
\ No newline at end of file
+        self._mark_dirty(utils.draw_text(f"Geçen Süre: {elapsed_time_sec:.2f} s", self.font_small, cfg.WHITE, self.screen, time_text_x, time_text_y, volatile=True))
\ No newline at end of file
@@ -1,6 +1,8 @@
 # utils.py
 import pygame
 import math
+from collections import OrderedDict
+import numpy as np
 import config as cfg
 
 # --- Unit Conversion ---
@@ -22,14 +24,63 @@ def mps_to_px_s(meters_per_second):
     """Converts meters per second to pixels per second."""
     return meters_per_second * cfg.PIXELS_PER_METER
 
+# --- Font Registry ---
+_fonts = {} # Size -> default pygame font of that size, shared by every screen and scene
+
+def get_font(size):
+    """
+    Returns the default font at the given size, loading it only the first time it is asked
+    for (pygame.font is initialized on demand). The same Font object is reused everywhere,
+    so text renders cached for one scene are hits in the next one too.
+    """
+    text_font = _fonts.get(size)
+    if text_font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        text_font = _fonts[size] = pygame.font.Font(None, size)
+    return text_font
+
+# --- Text Rendering Cache ---
+_text_cache = OrderedDict() # (font, text, color) -> rendered surface, least recently used first
+_volatile_text_cache = OrderedDict() # Same for readouts whose text changes from frame to frame
+
+def render_text_cached(text_font, text, color, volatile=False):
+    """
+    Returns an antialiased render of text, reusing the surface from an earlier call with the
+    same (font, text, color). At most TEXT_CACHE_MAX_ENTRIES surfaces are kept (LRU eviction).
+
+    Per-frame numeric readouts (time, position, velocity, ...) pass volatile=True: they go
+    through a separate small cache (TEXT_CACHE_VOLATILE_MAX_ENTRIES) that keeps the current
+    frame's values, so their ever-new strings do not evict the static labels.
+    """
+    cache = _volatile_text_cache if volatile else _text_cache
+    key = (text_font, text, color)
+    surf = cache.get(key)
+    if surf is not None:
+        cache.move_to_end(key) # Mark as recently used
+        return surf
+    surf = text_font.render(text, True, color)
+    cache[key] = surf
+    if len(cache) > (cfg.TEXT_CACHE_VOLATILE_MAX_ENTRIES if volatile else cfg.TEXT_CACHE_MAX_ENTRIES):
+        cache.popitem(last=False) # Evict least recently used
+    return surf
+
+def clear_text_cache():
+    """Drops all cached text surfaces (e.g. after fonts are reloaded)."""
+    _text_cache.clear()
+    _volatile_text_cache.clear()
+
 # --- Drawing Helpers ---
-def draw_text(text, text_font, color, surface, x, y, center=False, topright=False):
-    """Renders and draws text onto a surface."""
+def draw_text(text, text_font, color, surface, x, y, center=False, topright=False, volatile=False):
+    """
+    Renders (through the text cache) and draws text onto a surface. Returns the drawn rect (or None).
+    volatile=True marks a per-frame readout (see render_text_cached).
+    """
     if not text_font:
         print(f"Error: Font not loaded or invalid for text '{text}'")
         return # Cannot render without a valid font
     try:
-        textobj = text_font.render(text, True, color)
+        textobj = render_text_cached(text_font, text, color, volatile)
         textrect = textobj.get_rect()
         if center:
             textrect.center = (int(x), int(y))
@@ -37,25 +88,25 @@ def draw_text(text, text_font, color, surface, x, y, center=False, topright=Fals
             textrect.topright = (int(x), int(y))
         else:
             textrect.topleft = (int(x), int(y))
-        surface.blit(textobj, textrect)
+        return surface.blit(textobj, textrect)
     except Exception as e:
         print(f"Error rendering or blitting text '{text}': {e}")
-        pass # Optionally, draw placeholder text or log differently
+        return None # Optionally, draw placeholder text or log differently
 
 def draw_arrow(surface, color, start, end, arrow_size):
-    """Draws a line with an arrowhead at the end."""
+    """Draws a line with an arrowhead at the end. Returns the bounding rect of what was drawn (or None)."""
     line_thickness = cfg.DRAW_ARROW_LINE_THICKNESS
     try:
         start_int = (int(start[0]), int(start[1]))
         end_int = (int(end[0]), int(end[1]))
-        pygame.draw.line(surface, color, start_int, end_int, line_thickness)
+        line_rect = pygame.draw.line(surface, color, start_int, end_int, line_thickness)
     except Exception as e:
         print(f"Error drawing line from {start} to {end}: {e}")
-        return # Don't proceed if line fails
+        return None # Don't proceed if line fails
 
     try:
         # Calculate angle only if start and end are different
-        if start_int == end_int: return # No arrowhead for zero-length line
+        if start_int == end_int: return line_rect # No arrowhead for zero-length line
         angle = math.atan2(start_int[1] - end_int[1], start_int[0] - end_int[0])
 
         # Calculate arrowhead points
@@ -65,8 +116,77 @@ def draw_arrow(surface, color, start, end, arrow_size):
         p2y = end_int[1] + arrow_size * math.sin(angle - math.pi / 6)
 
         # Draw the arrowhead polygon
-        pygame.draw.polygon(surface, color, (end_int, (int(p1x), int(p1y)), (int(p2x), int(p2y))))
+        head_rect = pygame.draw.polygon(surface, color, (end_int, (int(p1x), int(p1y)), (int(p2x), int(p2y))))
+        return line_rect.union(head_rect)
     except (ValueError, OverflowError, TypeError, ZeroDivisionError) as e:
         # Handle potential math errors or invalid points
         print(f"Could not draw arrowhead for arrow from {start} to {end}: {e}")
-        pass
\ No newline at end of file
+        return line_rect
+
+
+# --- Batched Arrows ---
+_HEAD_COS = math.cos(math.pi / 6)
+_HEAD_SIN = math.sin(math.pi / 6)
+
+def arrow_geometry(starts, ends, arrow_size):
+    """
+    Integer geometry of many arrows in one vectorized pass (same shape as draw_arrow).
+
+    The arrowhead points are the end point plus the unit vector back towards the start,
+    rotated by +-30 degrees and scaled to arrow_size; no per-arrow trigonometry.
+
+    Args:
+        starts (array_like): Arrow start points in pixels, shape (n, 2).
+        ends (array_like): Arrow end points in pixels, shape (n, 2).
+        arrow_size (float): Arrowhead side length in pixels.
+
+    Returns:
+        tuple: (starts_int, ends_int, heads_int, has_head) with shapes (n, 2), (n, 2), (n, 3, 2)
+               and (n,); zero-length arrows (after rounding) have no head.
+    """
+    starts_int = np.asarray(starts, dtype=np.float64).reshape(-1, 2).astype(np.int64) # int() truncation, like draw_arrow
+    ends_int = np.asarray(ends, dtype=np.float64).reshape(-1, 2).astype(np.int64)
+    back = (starts_int - ends_int).astype(np.float64)
+    length = np.hypot(back[:, 0], back[:, 1])
+    has_head = length > 0
+    back /= np.where(has_head, length, 1.0)[:, np.newaxis]
+    back *= arrow_size
+    heads = np.empty((len(ends_int), 3, 2))
+    heads[:, 0] = ends_int
+    heads[:, 1, 0] = ends_int[:, 0] + back[:, 0] * _HEAD_COS - back[:, 1] * _HEAD_SIN
+    heads[:, 1, 1] = ends_int[:, 1] + back[:, 0] * _HEAD_SIN + back[:, 1] * _HEAD_COS
+    heads[:, 2, 0] = ends_int[:, 0] + back[:, 0] * _HEAD_COS + back[:, 1] * _HEAD_SIN
+    heads[:, 2, 1] = ends_int[:, 1] - back[:, 0] * _HEAD_SIN + back[:, 1] * _HEAD_COS
+    return starts_int, ends_int, heads.astype(np.int64), has_head
+
+def _draw_arrow_shapes(surface, color, starts, ends, heads):
+    """Draws precomputed integer arrows (lists of points) with one line + one polygon call each."""
+    line_thickness = cfg.DRAW_ARROW_LINE_THICKNESS
+    draw_line = pygame.draw.line
+    draw_polygon = pygame.draw.polygon
+    for start, end, head in zip(starts, ends, heads):
+        draw_line(surface, color, start, end, line_thickness)
+        if start != end:
+            draw_polygon(surface, color, head)
+
+def draw_arrows(surface, color, starts, ends, arrow_size):
+    """
+    Draws many same-colored arrows (a vector field) with geometry from arrow_geometry.
+
+    Pygame has no multi-line or multi-polygon primitive, so each arrow is still one line
+    and one polygon call, but all arrowheads come from one vectorized pass and the points
+    are converted to plain lists once. Arrows inside the surface get the same pixels as
+    draw_arrow.
+
+    Returns:
+        pygame.Rect: Bounding rect of everything drawn, or None if there were no arrows.
+    """
+    starts_int, ends_int, heads, _ = arrow_geometry(starts, ends, arrow_size)
+    if not len(starts_int):
+        return None
+    _draw_arrow_shapes(surface, color, starts_int.tolist(), ends_int.tolist(), heads.tolist())
+    points = np.concatenate((starts_int, heads.reshape(-1, 2)))
+    pad = cfg.DRAW_ARROW_LINE_THICKNESS + 1
+    left, top = (points.min(axis=0) - pad).tolist()
+    right, bottom = (points.max(axis=0) + pad).tolist()
+    return pygame.Rect(left, top, right - left + 1, bottom - top + 1).clip(surface.get_rect())
@@ -0,0 +1,24 @@
+# vertical_throw.py
+# -*- coding: utf-8 -*-
+from scenes import Scene
+
+
+class VerticalThrowScene(Scene):
+    """Vertical throw ("Dikey Atış"): straight up and back down to the start in the typed total time; no target is drawn."""
+    enter_action = "launch"
+    input_label = "Toplam Süre (s):" # Round trip time
+    time_label = "Toplam t"
+    draws_target = False
+
+    def place_target(self, target, projectile_pos_px, target_pos_px):
+        """The target mirrors the projectile's initial position (centered, it's not drawn)."""
+        target.set_position([projectile_pos_px[0] - target.width / 2, projectile_pos_px[1] - target.height / 2])
+
+    def solve_launch(self, physics_engine, initial_pos_px, target_center_px, time_to_target_sec):
+        """Velocity that returns to the start in time_to_target_sec (total round-trip time): straight up, also with drag."""
+        v0x_px_s, v0y_px_s = physics_engine.solve_launch_velocities(initial_pos_px, initial_pos_px, time_to_target_sec)
+        return time_to_target_sec, v0x_px_s, v0y_px_s
+
+    def flight_end_pos_px(self, physics_engine, initial_pos_px, v0_px_s, flight_end_sec):
+        """Returns exactly to the start: the launch is straight up and down."""
+        return list(initial_pos_px)